@@ -0,0 +1 @@
+"""Benchmarks hors ligne (fixtures DHTMLX synthétiques)"""
@@ -0,0 +1,381 @@
+"""
+Pages de planning DHTMLX synthétiques pour les benchmarks hors ligne
+
+Reproduit la structure DOM lue par le scraper (src/scraper/scraper.py et
+src/scraper/snapshot.py), sans DailyRH ni session SSO :
+
+- `#date_now` ("janvier 2026") et les boutons mois précédent / suivant
+- une ligne `tr.dhx_row_item` par collaborateur, nom dans `td.dhx_matrix_scell`
+  (élément `[data-corp-id]`), cellules jour `td.dhx_matrix_cell`
+- événements positionnés dans `.dhx_matrix_line` (classes validated_vcell /
+  to_validate_vcell / telework, titre), demi-journées comprises
+- jours non ouvrés `div.dhx_marked_timespan.grey_cell_weekend AAAA/MM/JJ`
+- pseudo-lignes "Mes Collègues", "Signataire..." et "Total" avec `td.teamTotal_cell`
+- `window.scheduler.setCurrentView()` pour le saut direct vers un mois
+
+Les données des 12 mois sont embarquées en JSON dans la page ; un petit
+script rend le mois affiché (avec un délai optionnel, pour simuler le rendu
+asynchrone de DailyRH). Les records attendus sont calculés côté Python avec
+la même logique métier (`MonthPlanningGrid`), ce qui permet de vérifier la
+parité des extractions chronométrées.
+
+Exemple:
+    >>> team = generate_team(500, 2026)
+    >>> path = write_fixture(team, "output/benchmarks/planning_500.html")
+    >>> with serve_fixture(path.parent) as base_url:
+    ...     url = f"{base_url}/{path.name}#month=3"
+"""
+
+import json
+import random
+import calendar
+import threading
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, List, Set
+
+from src.config import MOIS_NOMS
+from src.utils import build_detail, extract_uid_from_corp_id
+from src.scraper.planning_grid import MonthPlanningGrid
+
+# Largeur d'une cellule jour (px) : les événements sont placés sur cette grille
+DAY_WIDTH = 40
+NAME_WIDTH = 220
+ROW_HEIGHT = 22
+
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+    "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier",
+]
+FIRST_NAMES = [
+    "Jean", "Marie", "Pierre", "Camille", "Louis", "Léa", "Hugo", "Chloé", "Lucas", "Inès",
+    "Paul", "Manon", "Jules", "Sarah", "Arthur", "Emma", "Nathan", "Zoé", "Théo", "Alice",
+]
+
+# Jours fériés (mois, jour) marqués comme non ouvrés, en plus des week-ends
+HOLIDAYS = [(1, 1), (5, 1), (5, 8), (7, 14), (8, 15), (11, 1), (11, 11), (12, 25)]
+
+# (type, titre, classe CSS de base) des événements générés
+EVENT_KINDS = [
+    ("CONGES", "Congés", "dhx_cal_event_line"),
+    ("CONGES", "RTT", "dhx_cal_event_line"),
+    ("TELETRAVAIL", "Télétravail", "dhx_cal_event_line telework"),
+]
+
+
+def _collaborator_name(i: int) -> str:
+    name = f"{LAST_NAMES[i % len(LAST_NAMES)]} {FIRST_NAMES[(i // len(LAST_NAMES)) % len(FIRST_NAMES)]}"
+    cycle = i // (len(LAST_NAMES) * len(FIRST_NAMES))
+    return f"{name} {cycle + 1}" if cycle else name
+
+
+def non_working_days(year: int, month: int) -> Set[int]:
+    """Week-ends et jours fériés d'un mois (indices 0-based)."""
+    nb_days = calendar.monthrange(year, month)[1]
+    days = {d for d in range(nb_days) if date(year, month, d + 1).weekday() >= 5}
+    days.update(day - 1 for m, day in HOLIDAYS if m == month)
+    return days
+
+
+def _random_events(rng: random.Random, nb_days: int, max_events: int) -> List[Dict]:
+    """Événements d'un collaborateur sur un mois (format de compute_events_from_geometry())."""
+    events = []
+    for order in range(rng.randint(0, max_events)):
+        event_type, title, css_class = rng.choice(EVENT_KINDS)
+        status = rng.choice(["Validé", "Validé", "À valider"])
+        css_class += " validated_vcell" if status == "Validé" else " to_validate_vcell"
+
+        start = rng.randrange(nb_days)
+        half_day = rng.random() < 0.2
+        end = start if half_day else min(nb_days - 1, start + rng.choice([0, 0, 1, 2, 4, 9, 14]))
+
+        events.append({
+            "type": event_type,
+            "detail": build_detail(title, status),
+            "start_idx": start,
+            "end_idx": end,
+            "half_day": half_day,
+            "period": rng.choice(["am", "pm"]) if half_day else None,
+            "order": order,
+            "class": css_class,
+            "title": title,
+        })
+    return events
+
+
+def generate_team(size: int, year: int, seed: int = 0, max_events: int = 5) -> Dict:
+    """
+    Génère le planning annuel d'une équipe synthétique.
+
+    Args:
+        size: Nombre de collaborateurs (lignes du planning)
+        year: Année du planning
+        seed: Graine du générateur (fixtures reproductibles)
+        max_events: Nombre maximal d'événements par collaborateur et par mois
+
+    Returns:
+        {"year", "members": [(nom, data-corp-id)], "months": {mois: {"events", "jno"}}}
+    """
+    rng = random.Random(seed)
+    members = [(_collaborator_name(i), f"HRF{300000 + i}-0_HRF{400000 + i:06d}") for i in range(size)]
+
+    months = {}
+    for month in range(1, 13):
+        nb_days = calendar.monthrange(year, month)[1]
+        months[month] = {
+            "events": [_random_events(rng, nb_days, max_events) for _ in members],
+            "jno": non_working_days(year, month),
+        }
+
+    return {"year": year, "members": members, "months": months}
+
+
+def month_grid(team: Dict, month: int) -> MonthPlanningGrid:
+    """Planning attendu d'un mois, construit comme le ferait le scraper."""
+    grid = MonthPlanningGrid(team["year"], month)
+    for (name, corp_id), events in zip(team["members"], team["months"][month]["events"]):
+        grid.add_collaborator(name, extract_uid_from_corp_id(corp_id), events)
+    grid.set_non_working_days(team["months"][month]["jno"])
+    return grid
+
+
+def expected_records(team: Dict, months: List[int] = None) -> List[Dict]:
+    """Records que doit produire l'extraction des mois demandés (défaut : toute l'année)."""
+    records = []
+    for month in months or range(1, 13):
+        records.extend(month_grid(team, month).to_records())
+    return records
+
+
+def _team_totals(grid: MonthPlanningGrid) -> List[str]:
+    """Textes des cellules teamTotal_cell (demi-journées d'absence par jour, virgule décimale)."""
+    totals = [0.0] * grid.nb_days
+    for record in grid.iter_records():
+        day = int(record["date"].split("/")[2]) - 1
+        for half in ("type_am", "type_pm"):
+            if record[half] not in ("PRESENT", "JOUR_NON_OUVRE"):
+                totals[day] += 0.5
+    return [f"{total:g}".replace(".", ",") for total in totals]
+
+
+def _event_box(event: Dict) -> List[int]:
+    """Position (left, width) d'un événement dans .dhx_matrix_line."""
+    left = event["start_idx"] * DAY_WIDTH
+    if event["half_day"]:
+        half = DAY_WIDTH // 2
+        return [left + (half if event["period"] == "pm" else 0), half]
+    return [left, (event["end_idx"] - event["start_idx"] + 1) * DAY_WIDTH]
+
+
+def _page_data(team: Dict) -> Dict:
+    """Données compactes embarquées dans la page (une entrée par mois)."""
+    months = {}
+    for month, data in team["months"].items():
+        months[month] = {
+            "rows": [
+                [name, corp_id, [[e["class"], e["title"]] + _event_box(e) for e in events]]
+                for (name, corp_id), events in zip(team["members"], data["events"])
+            ],
+            "jno": sorted(data["jno"]),
+            "totals": _team_totals(month_grid(team, month)),
+        }
+    return {"year": team["year"], "months": months, "month_names": [m.lower() for m in MOIS_NOMS]}
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Planning d'équipe (fixture)</title>
+<style>
+  body { margin: 0; font: 12px sans-serif; }
+  .dhx_cal_navline { height: 30px; }
+  .dhx_cal_prev_button, .dhx_cal_next_button { display: inline-block; width: 30px; cursor: pointer; }
+  #date_now { display: inline-block; min-width: 150px; text-align: center; }
+  table.dhx_matrix { border-collapse: collapse; border-spacing: 0; table-layout: fixed; }
+  table.dhx_matrix td { padding: 0; border: 0; height: __ROW_HEIGHT__px; }
+  td.dhx_matrix_scell { width: __NAME_WIDTH__px; overflow: hidden; white-space: nowrap; }
+  .dhx_matrix_line { position: relative; height: __ROW_HEIGHT__px; }
+  .dhx_matrix_line > div { position: absolute; top: 2px; height: 18px; }
+  table.dhx_matrix_cells { border-collapse: collapse; border-spacing: 0; table-layout: fixed; }
+  td.dhx_matrix_cell, td.teamTotal_cell { width: __DAY_WIDTH__px; box-shadow: inset -1px 0 #ddd; }
+  .grey_cell_weekend { background: #eee; }
+  .validated_vcell { background: #6c6; }
+  .to_validate_vcell { background: #cfc; }
+  .telework.validated_vcell { background: #69c; }
+  .telework.to_validate_vcell { background: #cde; }
+</style>
+</head>
+<body>
+<div class="dhx_cal_navline">
+  <div class="dhx_cal_prev_button prev-month">&lsaquo;</div>
+  <div id="date_now"></div>
+  <div class="dhx_cal_next_button next-month">&rsaquo;</div>
+</div>
+<div class="dhx_cal_data"><table class="dhx_matrix"><tbody id="planning"></tbody></table></div>
+<script>
+const PLANNING_DATA = __DATA__;
+const RENDER_DELAY_MS = __RENDER_DELAY_MS__;
+const DAY_WIDTH = __DAY_WIDTH__;
+
+const esc = (s) => String(s).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/"/g, "&quot;");
+const pad = (n) => String(n).padStart(2, "0");
+
+let current = null;
+
+function nameRow(name, body) {
+  return `<tr class="dhx_row_item"><td class="dhx_matrix_scell">${name}</td><td>${body}</td></tr>`;
+}
+
+function renderMonth(year, month) {
+  const data = year === PLANNING_DATA.year ? PLANNING_DATA.months[month] : null;
+  const nbDays = new Date(year, month, 0).getDate();
+  const html = [nameRow("Mes Collègues", ""), nameRow("Signataire : Direction", "")];
+
+  if (data) {
+    const cells = "<td class=\\"dhx_matrix_cell\\"></td>".repeat(nbDays);
+    const jno = data.jno.map((d) =>
+      `<div class="dhx_marked_timespan grey_cell_weekend ${year}/${pad(month)}/${pad(d + 1)}" ` +
+      `style="left:${d * DAY_WIDTH}px;width:${DAY_WIDTH}px"></div>`).join("");
+
+    for (const [name, corpId, events] of data.rows) {
+      const divs = events.map(([cls, title, left, width]) =>
+        `<div class="${cls}" title="${esc(title)}" style="left:${left}px;width:${width}px"></div>`).join("");
+      html.push(
+        `<tr class="dhx_row_item"><td class="dhx_matrix_scell"><div data-corp-id="${corpId}">${esc(name)}</div></td>` +
+        `<td><div class="dhx_matrix_line" style="width:${nbDays * DAY_WIDTH}px">${jno}${divs}` +
+        `<table class="dhx_matrix_cells"><tr>${cells}</tr></table></div></td></tr>`);
+    }
+
+    const totals = data.totals.map((text, d) =>
+      `<td class="teamTotal_cell ${year}-${pad(month)}-${pad(d + 1)}"><div>${text}</div></td>`).join("");
+    html.push(nameRow("Total équipe", `<table class="dhx_matrix_cells"><tr>${totals}</tr></table>`));
+  }
+
+  document.getElementById("planning").innerHTML = html.join("");
+  document.getElementById("date_now").textContent = `${PLANNING_DATA.month_names[month - 1]} ${year}`;
+}
+
+function show(year, month) {
+  if (month < 1) { year -= 1; month = 12; }
+  if (month > 12) { year += 1; month = 1; }
+  current = {year: year, month: month};
+  setTimeout(() => renderMonth(year, month), RENDER_DELAY_MS);
+}
+
+window.scheduler = {
+  setCurrentView: (d) => show(d.getFullYear(), d.getMonth() + 1),
+  getState: () => ({date: new Date(current.year, current.month - 1, 1)}),
+};
+
+document.querySelector(".prev-month").addEventListener("click", () => show(current.year, current.month - 1));
+document.querySelector(".next-month").addEventListener("click", () => show(current.year, current.month + 1));
+
+const initial = /month=(\\d+)/.exec(location.hash);
+show(PLANNING_DATA.year, initial ? parseInt(initial[1], 10) : 1);
+</script>
+</body>
+</html>
+"""
+
+
+def month_snapshot(team: Dict, month: int, scale: float = 1.0) -> Dict:
+    """
+    Instantané du mois tel que SNAPSHOT_JS le lit sur la page rendue, sans navigateur.
+
+    Args:
+        team: Équipe retournée par generate_team()
+        month: Mois (1-12)
+        scale: Facteur appliqué aux positions et largeurs (zoom du navigateur :
+               positions fractionnaires)
+
+    Returns:
+        Instantané du mois (voir src/scraper/snapshot.py), pseudo-lignes comprises
+    """
+    year = team["year"]
+    nb_days = calendar.monthrange(year, month)[1]
+    data = team["months"][month]
+
+    def box(left: float, width: float) -> Dict:
+        return {"x": (NAME_WIDTH + left) * scale, "width": width * scale}
+
+    def pseudo_row(name: str) -> Dict:
+        return {"name": name, "corp_id": None, "cells": [], "events": None}
+
+    cells = [box(d * DAY_WIDTH, DAY_WIDTH) for d in range(nb_days)]
+    rows = [pseudo_row("Mes Collègues"), pseudo_row("Signataire : Direction")]
+    for (name, corp_id), events in zip(team["members"], data["events"]):
+        rows.append({
+            "name": name,
+            "corp_id": corp_id,
+            "cells": list(cells),
+            "events": [{"class": e["class"], "title": e["title"], "box": box(*_event_box(e))} for e in events],
+        })
+    rows.append(pseudo_row("Total équipe"))
+
+    return {
+        "date_text": f"{MOIS_NOMS[month - 1].lower()} {year}",
+        "rows": rows,
+        "jno": [f"dhx_marked_timespan grey_cell_weekend {year}/{month:02d}/{d + 1:02d}" for d in sorted(data["jno"])],
+        "totals": [
+            {"class": f"teamTotal_cell {year}-{month:02d}-{d + 1:02d}", "text": text}
+            for d, text in enumerate(_team_totals(month_grid(team, month)))
+        ],
+    }
+
+
+def render_planning_html(team: Dict, render_delay_ms: int = 0) -> str:
+    """
+    Page HTML autonome du planning d'une équipe.
+
+    Le mois affiché au chargement est lu dans l'ancre (`#month=3`, défaut janvier).
+
+    Args:
+        team: Équipe retournée par generate_team()
+        render_delay_ms: Délai avant chaque rendu de mois (simulation du rendu DailyRH)
+    """
+    replacements = {
+        "__DATA__": json.dumps(_page_data(team), ensure_ascii=False, separators=(",", ":")),
+        "__RENDER_DELAY_MS__": str(render_delay_ms),
+        "__DAY_WIDTH__": str(DAY_WIDTH),
+        "__NAME_WIDTH__": str(NAME_WIDTH),
+        "__ROW_HEIGHT__": str(ROW_HEIGHT),
+    }
+    html = PAGE_TEMPLATE
+    for key, value in replacements.items():
+        html = html.replace(key, value)
+    return html
+
+
+def write_fixture(team: Dict, path, render_delay_ms: int = 0) -> Path:
+    """Écrit la page du planning d'une équipe et retourne son chemin."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_planning_html(team, render_delay_ms), encoding="utf-8")
+    return path
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_fixture(directory):
+    """
+    Sert un répertoire de fixtures via http.server, sur un port libre.
+
+    Yields:
+        URL de base (ex: "http://127.0.0.1:51234")
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Benchmarks hors ligne du scraper et du rapport Excel
+
+Chronomètre, sur des pages de planning synthétiques (benchmarks/fixtures.py)
+de différentes tailles d'équipe, sans DailyRH ni session SSO :
+
+- scrape_month        : extraction d'un mois ("bulk" = snapshot, "element" = élément par élément)
+- scrape_all_months   : scraping complet de bout en bout (lancement du navigateur compris)
+- analyze_leave_data  : statistiques de congés
+- create_excel_report : rapport Excel ("full" = génération complète, "incremental" = régénération
+                        sans changement)
+
+Les extractions sont comparées aux records attendus (parité). Les résultats sont
+écrits en JSON pour suivre les régressions d'une version à l'autre.
+
+Utilisation :
+    python benchmarks/run_benchmarks.py                              # équipes de 10, 100 et 500
+    python benchmarks/run_benchmarks.py --sizes 10,2000 --repeat 5
+    python benchmarks/run_benchmarks.py --stages analyze_leave_data,create_excel_report
+    python benchmarks/run_benchmarks.py --serve --render-delay-ms 200 # via http.server
+    python benchmarks/run_benchmarks.py --stages scrape_month --trace # profil des appels Playwright
+
+Prérequis : navigateur Playwright installé (playwright install chromium) pour les
+étapes de scraping ; les étapes d'analyse et Excel n'en ont pas besoin.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire parent au path pour pouvoir importer src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from playwright.sync_api import sync_playwright
+
+from src.config import OUTPUT_DIR, TARGET_YEAR
+from src.logging import setup_logger
+from src.dataset import PlanningDataset
+from src.excel import analyze_leave_data, create_excel_report
+from src.scraper import scrape_all_months
+from src.scraper.scraper import scrape_month
+from src.scraper.waits import wait_for_planning_ready
+from src.scraper.tracing import enable_tracing, traced, trace_month, write_trace, reset_trace
+from benchmarks.fixtures import generate_team, write_fixture, expected_records, serve_fixture
+
+STAGES = ["scrape_month", "scrape_all_months", "analyze_leave_data", "create_excel_report"]
+SCRAPE_MODES = ["bulk", "element"]
+EXCEL_MODES = ["full", "incremental"]
+
+BENCHMARK_DIR = OUTPUT_DIR / "benchmarks"
+
+
+def parse_args():
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne DailyRH")
+    parser.add_argument("--sizes", default="10,100,500",
+                        help="Tailles d'équipe (lignes du planning), séparées par des virgules (10 à 2000)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Étapes à chronométrer")
+    parser.add_argument("--modes", default=",".join(SCRAPE_MODES), help="Modes de scrape_month (bulk, element)")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de mesures par étape")
+    parser.add_argument("--month", type=int, default=1, help="Mois extrait par scrape_month")
+    parser.add_argument("--months", default="1-12", help="Mois de scrape_all_months (ex: 1-12, 1,2,3)")
+    parser.add_argument("--year", type=int, default=TARGET_YEAR, help="Année du planning synthétique")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des fixtures")
+    parser.add_argument("--render-delay-ms", type=int, default=0, help="Délai de rendu simulé de chaque mois")
+    parser.add_argument("--serve", action="store_true", help="Servir les fixtures via http.server (défaut : file://)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON des résultats")
+    parser.add_argument("--trace", action="store_true",
+                        help="Tracer les appels Playwright (profil .folded à côté des résultats ; "
+                             "les durées mesurées incluent le surcoût du traçage)")
+    return parser.parse_args()
+
+
+def parse_months(text: str) -> List[int]:
+    """'1-12' ou '1,2,3' -> liste de mois"""
+    if "-" in text:
+        first, last = text.split("-")
+        return list(range(int(first), int(last) + 1))
+    return [int(m) for m in text.split(",")]
+
+
+def git_commit() -> str:
+    """Commit courant (None hors dépôt git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(stage: str, size: int, mode: str, runs: List[float], **extra) -> Dict:
+    """Résultat d'une étape : mesures brutes et statistiques"""
+    return {
+        "stage": stage,
+        "mode": mode,
+        "size": size,
+        "runs_s": [round(r, 4) for r in runs],
+        "min_s": round(min(runs), 4),
+        "median_s": round(statistics.median(runs), 4),
+        "mean_s": round(statistics.mean(runs), 4),
+        **extra,
+    }
+
+
+def timed(func, repeat: int):
+    """Exécute func `repeat` fois ; retourne (durées, dernier résultat)"""
+    runs, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - started)
+    return runs, result
+
+
+@contextmanager
+def fixture_url(path: Path, serve: bool):
+    """URL de la page de fixture (file:// ou http.server)"""
+    if not serve:
+        yield path.resolve().as_uri()
+        return
+    with serve_fixture(path.parent) as base_url:
+        yield f"{base_url}/{path.name}"
+
+
+def bench_scrape_month(url: str, team: Dict, args, modes: List[str]) -> List[Dict]:
+    """scrape_month sur une page déjà positionnée sur le mois"""
+    expected = expected_records(team, [args.month])
+    results = []
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = traced(browser.new_page())
+        page.goto(f"{url}#month={args.month}")
+        wait_for_planning_ready(page, label="benchmark")
+
+        for mode in modes:
+            with trace_month(args.month):
+                runs, records = timed(lambda: scrape_month(page, args.year, args.month, bulk=mode == "bulk"),
+                                      args.repeat)
+            results.append(summarize("scrape_month", len(team["members"]), mode, runs,
+                                     records=len(records), parity=records == expected))
+        browser.close()
+
+    return results
+
+
+def bench_scrape_all_months(url: str, team: Dict, args) -> List[Dict]:
+    """scrape_all_months de bout en bout, sans cache ni checkpoints du scraping réel"""
+    months = parse_months(args.months)
+    expected = expected_records(team, months)
+
+    with tempfile.TemporaryDirectory(prefix="bench_checkpoints_") as checkpoint_dir:
+        runs, records = timed(lambda: scrape_all_months(args.year, months, url=url, session_file=None,
+                                                        use_cache=False, checkpoint_dir=Path(checkpoint_dir),
+                                                        headless=True), args.repeat)
+
+    return [summarize("scrape_all_months", len(team["members"]), "dom", runs,
+                      months=len(months), records=len(records), parity=records == expected)]
+
+
+def bench_report(team: Dict, stages: List[str], args) -> List[Dict]:
+    """analyze_leave_data et create_excel_report sur l'extraction attendue de l'année"""
+    dataset = PlanningDataset.from_records(expected_records(team))
+    size = len(team["members"])
+    results = []
+
+    runs, stats = timed(lambda: analyze_leave_data(dataset), args.repeat if "analyze_leave_data" in stages else 1)
+    if "analyze_leave_data" in stages:
+        results.append(summarize("analyze_leave_data", size, "-", runs, records=len(dataset)))
+
+    if "create_excel_report" in stages:
+        with tempfile.TemporaryDirectory(prefix="bench_excel_") as tmp_dir:
+            output_file = str(Path(tmp_dir) / "rapport.xlsx")
+            for mode in EXCEL_MODES:
+                if mode == "incremental":
+                    create_excel_report(stats, dataset, output_file, incremental=True)
+                runs, _ = timed(lambda: create_excel_report(stats, dataset, output_file,
+                                                            incremental=mode == "incremental"), args.repeat)
+                results.append(summarize("create_excel_report", size, mode, runs,
+                                         sheets=1 + len(dataset.months) + len(dataset.collaborators)))
+
+    return results
+
+
+def print_summary(results: List[Dict]):
+    """Tableau récapitulatif des résultats"""
+    print(f"\n{'Étape':<22} {'Mode':<12} {'Taille':>7} {'min (s)':>9} {'médiane (s)':>12}  Parité")
+    print("-" * 72)
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['stage']:<22} {r['mode']:<12} {r['size']:>7} {'ignorée : ' + r['skipped']}")
+            continue
+        parity = {True: "OK", False: "ÉCART"}.get(r.get("parity"), "-")
+        print(f"{r['stage']:<22} {r['mode']:<12} {r['size']:>7} {r['min_s']:>9.3f} {r['median_s']:>12.3f}  {parity}")
+
+
+def main():
+    """Génère les fixtures, chronomètre les étapes et écrit le rapport JSON"""
+    args = parse_args()
+    setup_logger(name="dailyrh_scraper", level="WARNING")
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    stages = [s for s in args.stages.split(",") if s]
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = set(stages) - set(STAGES) | set(modes) - set(SCRAPE_MODES)
+    if unknown:
+        sys.exit(f"Étapes ou modes inconnus : {', '.join(sorted(unknown))}")
+
+    output_file = Path(args.output or BENCHMARK_DIR / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    results = []
+    if args.trace:
+        enable_tracing()
+        reset_trace()
+
+    with tempfile.TemporaryDirectory(prefix="bench_fixtures_") as fixture_dir:
+        for size in sizes:
+            print(f"Équipe de {size} collaborateurs...")
+            team = generate_team(size, args.year, seed=args.seed)
+
+            if "scrape_month" in stages or "scrape_all_months" in stages:
+                path = write_fixture(team, Path(fixture_dir) / f"planning_{size}.html", args.render_delay_ms)
+                with fixture_url(path, args.serve) as url:
+                    try:
+                        if "scrape_month" in stages:
+                            results.extend(bench_scrape_month(url, team, args, modes))
+                        if "scrape_all_months" in stages:
+                            results.extend(bench_scrape_all_months(url, team, args))
+                    except Exception as e:
+                        # Navigateur absent, etc. : les étapes hors navigateur restent mesurées
+                        reason = str(e).splitlines()[0]
+                        print(f"⚠️  Scraping ignoré ({size}) : {reason}")
+                        results.append({"stage": "scraping", "mode": "-", "size": size, "skipped": reason})
+
+            if "analyze_leave_data" in stages or "create_excel_report" in stages:
+                results.extend(bench_report(team, stages, args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "year": args.year,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "server": "http" if args.serve else "file",
+            "render_delay_ms": args.render_delay_ms,
+            "trace": args.trace,
+        },
+        "results": results,
+    }
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_summary(results)
+    print(f"\nRésultats : {output_file}")
+    if args.trace:
+        print(f"Profil des appels Playwright : {write_trace(output_file.with_name(f'{output_file.stem}_trace.folded'))}")
+
+
+if __name__ == "__main__":
+    main()
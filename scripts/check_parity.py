@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Contrôle de parité du noyau vectorisé d'affectation des événements
+
+Vérifie que le noyau NumPy (src/scraper/geometry.py) produit exactement les
+mêmes événements que la version Python `compute_events_from_geometry()` :
+
+- toujours, hors ligne, sur les plannings synthétiques de benchmarks/fixtures.py
+  (plusieurs tailles d'équipe, positions entières et fractionnaires, lignes sans
+  cellule jour), avec en plus l'égalité des records avec ceux attendus par la
+  fixture ;
+- sur les instantanés mensuels enregistrés (RECORD_SNAPSHOTS = True), s'il y en a.
+
+Utilisation :
+    python scripts/check_parity.py                      # Fixtures + instantanés de output/snapshots/
+    python scripts/check_parity.py --fixtures           # Fixtures uniquement
+    python scripts/check_parity.py snapshot_2026_03.json
+
+Code de sortie : 0 si parité partout, 1 sinon.
+"""
+
+import re
+import sys
+import copy
+import calendar
+import argparse
+from pathlib import Path
+from typing import Dict
+
+# Ajouter le répertoire parent au path pour pouvoir importer src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import SNAPSHOT_DIR, TARGET_YEAR
+from src.scraper.snapshot import load_snapshot
+from src.scraper.geometry import check_geometry_parity
+from src.scraper.scraper import scrape_month_snapshot
+from benchmarks.fixtures import generate_team, month_snapshot, month_grid
+
+# Équipes synthétiques (taille, graine) et facteurs de zoom des positions
+FIXTURE_TEAMS = [(50, 0), (200, 1)]
+FIXTURE_SCALES = [1.0, 0.9, 1.1, 1.25]
+
+
+def parse_args():
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Contrôle de parité du noyau vectorisé")
+    parser.add_argument("snapshots", nargs="*", help="Instantanés à contrôler (défaut : output/snapshots/)")
+    parser.add_argument("--fixtures", action="store_true", help="Contrôler uniquement les plannings synthétiques")
+    return parser.parse_args()
+
+
+def print_mismatches(label: str, mismatches) -> bool:
+    """Affiche le résultat d'un contrôle ; retourne True si parité"""
+    if mismatches:
+        print(f"❌ {label} : {len(mismatches)} ligne(s) divergente(s)")
+        for m in mismatches[:5]:
+            print(f"   - {m['name']} : python={m['python']} numpy={m['numpy']}")
+        return False
+    print(f"✅ {label} : parité OK")
+    return True
+
+
+def check_fixtures(year: int = TARGET_YEAR) -> int:
+    """
+    Contrôle les 12 mois des plannings synthétiques, sans navigateur.
+
+    Returns:
+        Nombre de contrôles en échec
+    """
+    nb_failed = 0
+    for size, seed in FIXTURE_TEAMS:
+        team = generate_team(size, year, seed=seed)
+        mismatches = []
+        records_failed = []
+
+        for month in range(1, 13):
+            nb_days = calendar.monthrange(year, month)[1]
+            for scale in FIXTURE_SCALES:
+                mismatches.extend(check_geometry_parity(month_snapshot(team, month, scale), nb_days))
+
+            # Positions entières : les records doivent être exactement ceux de la fixture
+            if scrape_month_snapshot(month_snapshot(team, month), year, month) != month_grid(team, month).to_records():
+                records_failed.append(month)
+
+        nb_failed += not print_mismatches(f"fixture {size} collaborateurs (graine {seed})", mismatches)
+        if records_failed:
+            nb_failed += 1
+            print(f"❌ fixture {size} collaborateurs : records différents des records attendus "
+                  f"(mois {', '.join(str(m) for m in records_failed)})")
+
+    return nb_failed
+
+
+def without_cells(snapshot: Dict, rows=None) -> Dict:
+    """Copie de l'instantané dont les lignes demandées (défaut : toutes) n'ont aucune cellule jour"""
+    snapshot = copy.deepcopy(snapshot)
+    for r, row in enumerate(snapshot["rows"]):
+        if rows is None or r in rows:
+            row["cells"] = []
+    return snapshot
+
+
+def check_edge_cases(year: int = TARGET_YEAR) -> int:
+    """
+    Contrôle les lignes sans cellule jour (événements présents, aucune cellule) :
+    le noyau vectorisé ne doit pas échouer et donne le même résultat que la
+    version Python.
+
+    Returns:
+        Nombre de contrôles en échec
+    """
+    team = generate_team(20, year, seed=2)
+    month = 3
+    nb_days = calendar.monthrange(year, month)[1]
+    snapshot = month_snapshot(team, month)
+
+    nb_failed = 0
+    for label, edge in (("aucune cellule jour", without_cells(snapshot)),
+                        ("une ligne sans cellule jour", without_cells(snapshot, rows={2}))):
+        try:
+            mismatches = check_geometry_parity(edge, nb_days)
+        except Exception as e:
+            nb_failed += 1
+            print(f"❌ cas limite {label} : {type(e).__name__} : {e}")
+            continue
+        nb_failed += not print_mismatches(f"cas limite {label}", mismatches)
+
+    return nb_failed
+
+
+def check_snapshots(paths) -> int:
+    """
+    Contrôle des instantanés enregistrés.
+
+    Returns:
+        Nombre d'instantanés en échec
+    """
+    nb_failed = 0
+    for path in paths:
+        match = re.search(r"(\d{4})_(\d{2})", path.name)
+        if not match:
+            print(f"⚠️  {path.name} : année/mois introuvables dans le nom, ignoré")
+            continue
+
+        year, month = int(match.group(1)), int(match.group(2))
+        nb_days = calendar.monthrange(year, month)[1]
+
+        nb_failed += not print_mismatches(path.name, check_geometry_parity(load_snapshot(path), nb_days))
+
+    return nb_failed
+
+
+def main():
+    """Vérifie la parité sur les fixtures et les instantanés demandés"""
+    args = parse_args()
+
+    nb_failed = 0
+    if not args.snapshots:
+        nb_failed += check_fixtures()
+        nb_failed += check_edge_cases()
+
+    if not args.fixtures:
+        paths = [Path(p) for p in args.snapshots] or sorted(Path(SNAPSHOT_DIR).glob("snapshot_*.json"))
+        if not paths:
+            print(f"Aucun instantané enregistré dans {SNAPSHOT_DIR} (RECORD_SNAPSHOTS)")
+        nb_failed += check_snapshots(paths)
+
+    sys.exit(1 if nb_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Script principal du DailyRH Scraper
 
 Ce script orchestre l'ensemble du processus :
 1. Scraping des données DailyRH via Playwright
-2. Export CSV des données brutes
+2. Export de l'extraction typée (Parquet/Arrow, CSV en option)
 3. Analyse et génération du rapport Excel
 
 Prérequis :
@@ -14,29 +14,108 @@ Prérequis :
 
 Utilisation :
     python scripts/main.py
+    python scripts/main.py --resume   # Reprend un scraping interrompu
+    python scripts/main.py --from-extract --profile summary   # Synthèse seule, sans scraping
+    python scripts/main.py --profile monthly --month 7 --month 8
+    python scripts/main.py --profile collaborator --collaborator "Dupont Jean"
+    python scripts/main.py --trace    # Trace les appels Playwright (profil flame graph)
 
 Fichiers générés :
-- output/leave_planning_2026.csv : Données brutes
+- output/extract_dailyRH.parquet : Extraction typée (lue par l'étape Excel)
+- output/extract_dailyRH.csv : Données brutes (si EXPORT_CSV)
 - output/rapport_conges_2026.xlsx : Rapport Excel formaté
+  (profils "monthly" / "collaborator" : un classeur par mois / par collaborateur)
+- output/roster_dailyRH.json : Registre de l'effectif (ordre canonique des collaborateurs)
+- output/metrics_dailyRH.json : Mesures du pipeline (si METRICS_ENABLED)
+- output/trace_playwright.folded (+ .calls.folded, .json) : Appels Playwright tracés
+  (si --trace ou PLAYWRIGHT_TRACING)
 - dailyrh_scraper.log : Journal d'exécution
 """
 
 import sys
-import pandas as pd
+import argparse
 from pathlib import Path
 
 # Ajouter le répertoire parent au path pour pouvoir importer src
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.config import OUTPUT_DIR, OUTPUT_CSV, OUTPUT_EXCEL, TARGET_YEAR
+from src.config import (
+    OUTPUT_DIR, OUTPUT_CSV, OUTPUT_EXTRACT, OUTPUT_EXCEL, EXPORT_CSV, TARGET_YEAR, DATA_SOURCE, SCRAPING_CONCURRENCY,
+    SCRAPER_ENGINE, REPORT_PROFILE, METRICS_ENABLED, OUTPUT_METRICS, OUTPUT_TRACE, ROSTER_FILE
+)
 from src.logging import setup_logger
-from src.scraper import scrape_all_months
-from src.excel import analyze_leave_data, create_excel_report
+from src.metrics import timer, log_metrics_summary, write_metrics_report
+from src.scraper import (
+    scrape_all_months, scrape_all_months_parallel, scrape_all_months_async, replay_all_months
+)
+from src.scraper.tracing import enable_tracing, is_tracing_enabled, log_trace_summary, write_trace
+from src.scraper.checkpoint import load_completed_months, clear_checkpoints, merge_months
+from src.dataset import PlanningDataset, RosterStore, write_extract, write_csv
+from src.excel import REPORT_PROFILES, generate_report
+
+
+def parse_args():
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="DailyRH Leave Planning Scraper")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Recharge les mois déjà terminés (checkpoints) et ne scrape que les mois manquants"
+    )
+    parser.add_argument(
+        "--from-extract", action="store_true",
+        help="Ne scrape pas : génère le rapport depuis l'extraction existante (OUTPUT_EXTRACT)"
+    )
+    parser.add_argument(
+        "--profile", choices=REPORT_PROFILES, default=REPORT_PROFILE,
+        help="Feuilles à générer : rapport complet, Synthèse seule, un classeur par mois ou par collaborateur"
+    )
+    parser.add_argument(
+        "--month", type=int, action="append", dest="months", metavar="MOIS",
+        help="Mois à générer (1-12, répétable) pour les feuilles mensuelles"
+    )
+    parser.add_argument(
+        "--collaborator", action="append", dest="collaborators", metavar="NOM",
+        help="Collaborateur à générer (répétable) pour les feuilles individuelles"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="Trace les appels Playwright du scraper (profil folded stacks, cf. PLAYWRIGHT_TRACING)"
+    )
+    return parser.parse_args()
+
+
+def run_scraping(months, roster=None):
+    """Scrape les mois demandés avec le moteur configuré"""
+    if SCRAPER_ENGINE == "async":
+        return scrape_all_months_async(TARGET_YEAR, months, roster=roster)
+    if SCRAPING_CONCURRENCY > 1:
+        return scrape_all_months_parallel(TARGET_YEAR, months, roster=roster)
+    return scrape_all_months(TARGET_YEAR, months, roster=roster)
+
+
+def report_metrics(logger):
+    """Affiche le tableau des mesures et écrit le rapport JSON"""
+    if not METRICS_ENABLED:
+        return
+    log_metrics_summary()
+    metrics_path = write_metrics_report(Path(OUTPUT_DIR) / OUTPUT_METRICS)
+    logger.info(f"Mesures : {metrics_path}")
+
+
+def report_trace(logger):
+    """Affiche les sites d'appel Playwright les plus coûteux et écrit le profil"""
+    if not is_tracing_enabled():
+        return
+    log_trace_summary()
+    trace_path = write_trace(Path(OUTPUT_DIR) / OUTPUT_TRACE)
+    logger.info(f"Profil des appels Playwright : {trace_path}")
 
 
 def main():
     """Fonction principale du programme"""
     
+    args = parse_args()
+    
     # Configuration du logging
     logger = setup_logger(
         name="dailyrh_scraper",
@@ -44,6 +123,9 @@ def main():
         level="INFO"  # Changer en "DEBUG" pour plus de détails
     )
     
+    if args.trace:
+        enable_tracing()
+    
     try:
         logger.info("="*60)
         logger.info("DailyRH Leave Planning Scraper - Démarrage")
@@ -54,40 +136,78 @@ def main():
         output_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Répertoire de sortie : {output_path.absolute()}")
         
+        extract_path = output_path / OUTPUT_EXTRACT
+        csv_path = output_path / OUTPUT_CSV
+        excel_path = output_path / OUTPUT_EXCEL
+        
+        if args.from_extract:
+            logger.info(f"Chargement de l'extraction existante : {extract_path}")
+            dataset = PlanningDataset.from_file(extract_path, RosterStore.load(ROSTER_FILE))
+            logger.info("Génération du rapport Excel")
+            with timer("pipeline.stage", stage="excel"):
+                excel_files = generate_report(dataset, excel_path, args.profile, args.months, args.collaborators)
+            for path in excel_files:
+                logger.info(f"  - Excel : {path}")
+            return
+        
         # Étape 1 : Scraping
+        # Effectif : chaque mois extrait est comparé au registre, seules les différences sont journalisées
         logger.info(f"Étape 1/3 : Scraping des données pour l'année {TARGET_YEAR}")
-        all_records = scrape_all_months(TARGET_YEAR)
+        roster = RosterStore.load(ROSTER_FILE)
+        if DATA_SOURCE == "replay":
+            logger.info("Rejeu hors ligne des réponses réseau enregistrées")
+            all_records = replay_all_months(TARGET_YEAR, roster=roster)
+        else:
+            completed = {}
+            if args.resume:
+                completed = load_completed_months(TARGET_YEAR)
+                logger.info(f"Reprise : {len(completed)} mois déjà terminés {sorted(completed)}")
+            else:
+                clear_checkpoints(TARGET_YEAR)
+            for month_num in sorted(completed):
+                roster.observe_records(TARGET_YEAR, month_num, completed[month_num])
+            
+            missing_months = [m for m in range(1, 13) if m not in completed]
+            with timer("pipeline.stage", stage="scraping"):
+                scraped_records = run_scraping(missing_months, roster) if missing_months else []
+            all_records = merge_months(*completed.values(), scraped_records)
         
         if not all_records:
             logger.error("Aucune donnée collectée - Arrêt du programme")
             sys.exit(1)
         
-        # Étape 2 : Export CSV
-        csv_path = output_path / OUTPUT_CSV
-        logger.info(f"Étape 2/3 : Export CSV ({len(all_records)} lignes)")
-        df = pd.DataFrame(all_records)
-        df.to_csv(csv_path, index=False, encoding="utf-8")
-        logger.info(f"CSV créé : {csv_path}")
+        # Étape 2 : Export de l'extraction
+        logger.info(f"Étape 2/3 : Export de l'extraction ({len(all_records)} lignes)")
+        with timer("pipeline.stage", stage="export"):
+            roster.save()
+            dataset = PlanningDataset.from_records(all_records, roster)
+            logger.info(f"Registre de l'effectif : {len(roster)} collaborateurs connus")
+            
+            write_extract(dataset.df, extract_path)
+            logger.info(f"Extraction créée : {extract_path}")
+            if EXPORT_CSV:
+                write_csv(dataset.df, csv_path)
+                logger.info(f"CSV créé : {csv_path}")
         
         # Statistiques de collecte
-        months_scraped = sorted(set(r['date'][:7] for r in all_records))
-        logger.info(f"Mois collectés : {len(months_scraped)}/12")
-        for month_str in months_scraped:
-            month_data = [r for r in all_records if r['date'][:7] == month_str]
-            logger.info(f"  {month_str} : {len(month_data)} lignes")
+        logger.info(f"Mois collectés : {len(dataset.months)}/12")
+        for month_num in dataset.months:
+            logger.info(f"  {TARGET_YEAR}/{month_num:02d} : {len(dataset.for_month(month_num))} lignes")
         
         # Étape 3 : Génération Excel
-        excel_path = output_path / OUTPUT_EXCEL
         logger.info("Étape 3/3 : Génération du rapport Excel")
-        stats = analyze_leave_data(str(csv_path))
-        create_excel_report(stats, str(csv_path), str(excel_path))
+        with timer("pipeline.stage", stage="excel"):
+            excel_files = generate_report(dataset, excel_path, args.profile, args.months, args.collaborators)
         
         logger.info("="*60)
         logger.info("✅ Traitement terminé avec succès")
         logger.info("="*60)
         logger.info(f"Fichiers générés :")
-        logger.info(f"  - CSV : {csv_path}")
-        logger.info(f"  - Excel : {excel_path}")
+        logger.info(f"  - Extraction : {extract_path}")
+        if EXPORT_CSV:
+            logger.info(f"  - CSV : {csv_path}")
+        for path in excel_files:
+            logger.info(f"  - Excel : {path}")
         logger.info(f"  - Log : dailyrh_scraper.log")
         
     except KeyboardInterrupt:
@@ -97,6 +217,10 @@ def main():
     except Exception as e:
         logger.exception(f"❌ Erreur fatale : {e}")
         sys.exit(1)
+    
+    finally:
+        report_metrics(logger)
+        report_trace(logger)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Ce fichier centralise toutes les constantes et paramètres de configuration.
 Modifier ce fichier permet d'adapter le comportement du scraper sans toucher au code.
 """
 
+import os
 from openpyxl.styles import Font, PatternFill, Border, Side
 from datetime import datetime
 from pathlib import Path
@@ -26,9 +27,39 @@ SESSION_FILE = BASE_DIR / "bnpparibas_session.json"
 OUTPUT_DIR = BASE_DIR / "output"
 
 # Noms des fichiers de sortie
+OUTPUT_EXTRACT = "extract_dailyRH.parquet"  # Extraction typée (.parquet ou .arrow), lue par l'étape Excel
 OUTPUT_CSV = "extract_dailyRH.csv"
 OUTPUT_EXCEL = "rapport_dailyRH.xlsx"
 
+# Export CSV optionnel, en plus de l'extraction typée
+EXPORT_CSV = True
+
+# Mesures du pipeline (durées par mois / ligne / attente / feuille, compteurs) :
+# tableau récapitulatif en fin d'exécution et rapport JSON dans OUTPUT_DIR
+METRICS_ENABLED = True
+OUTPUT_METRICS = "metrics_dailyRH.json"
+
+# Traçage des appels Playwright (Page / Locator) du scraper : nombre et
+# durée de chaque appel par site d'appel et par mois, profil "folded stacks"
+# (flamegraph.pl, speedscope) et rapport JSON dans OUTPUT_DIR. Ralentit le
+# scraping : à activer ponctuellement (ou python scripts/main.py --trace)
+PLAYWRIGHT_TRACING = False
+OUTPUT_TRACE = "trace_playwright.folded"
+
+# Cache des mois scrapés : un mois dont l'empreinte (événements, totaux) n'a pas
+# changé depuis le dernier passage est relu depuis le disque au lieu d'être extrait
+MONTH_CACHE_ENABLED = True
+CACHE_DIR = OUTPUT_DIR / "cache"
+CACHE_TEAM_KEY = "teamplanning"  # Une clé par équipe / planning scrapé
+
+# Checkpoints mensuels (reprise avec : python scripts/main.py --resume)
+CHECKPOINT_DIR = OUTPUT_DIR / "checkpoints"
+
+# Registre persistant de l'effectif (par UID : nom, premier / dernier mois vu, ordre
+# des lignes) : différences journalisées à chaque scraping, ordre canonique des
+# collaborateurs dans l'analyse et le rapport Excel
+ROSTER_FILE = OUTPUT_DIR / "roster_dailyRH.json"
+
 # ============================================================
 # CONFIGURATION SCRAPING
 # ============================================================
@@ -44,10 +75,65 @@ HEADLESS_MODE = False
 
 # Délais et timeouts (en secondes)
 PAGE_LOAD_TIMEOUT = 10000  # Timeout de chargement de page (ms)
-NAVIGATION_DELAY = 1.5     # Délai entre chaque changement de mois
-INITIAL_LOAD_DELAY = 10    # Délai d'attente initial après ouverture de DailyRH
+NAVIGATION_TIMEOUT = 15    # Attente maximale d'un changement de mois (le scraping n'attend que le nécessaire)
+INITIAL_LOAD_TIMEOUT = 30  # Attente maximale du chargement initial de DailyRH
+PLANNING_SETTLE_MS = 300   # Durée sans changement des lignes pour considérer le planning stable (ms)
 MAX_NAVIGATION_CLICKS = 50 # Nombre maximum de clics pour atteindre janvier
 
+# Navigation directe vers un mois via scheduler.setCurrentView() (DHTMLX).
+# Les clics mois précédent / suivant ne servent plus que de solution de repli.
+DIRECT_NAVIGATION = True
+
+# Scraping parallèle : nombre maximum de contextes navigateur simultanés
+# (tous créés depuis SESSION_FILE). 1 = scraping séquentiel sur une seule page.
+# À garder bas pour respecter la tolérance du serveur DailyRH.
+SCRAPING_CONCURRENCY = 3
+
+# Moteur de scraping :
+# - "sync"  : playwright.sync_api (un navigateur par worker)
+# - "async" : playwright.async_api, requêtes DOM indépendantes lancées en parallèle
+#             (asyncio.gather) et contextes simultanés dans un seul navigateur
+SCRAPER_ENGINE = "sync"
+
+# Extraction en masse : un seul page.evaluate par mois (snapshot JSON du DOM)
+# au lieu de plusieurs appels Playwright par cellule / événement / collaborateur.
+# Mettre à False pour revenir à l'extraction élément par élément.
+BULK_EXTRACTION = True
+
+# Enregistrement des instantanés mensuels (rejeu, contrôle de parité : scripts/check_parity.py)
+RECORD_SNAPSHOTS = False
+SNAPSHOT_DIR = OUTPUT_DIR / "snapshots"
+
+# Source des données du planning :
+# - "dom"     : lecture de la grille rendue (géométrie des cellules)
+# - "network" : lecture directe des réponses XHR JSON qui alimentent le planning
+# - "replay"  : rejeu hors ligne des réponses enregistrées dans NETWORK_FIXTURES_DIR
+DATA_SOURCE = "dom"
+
+# Sous-chaîne identifiant les URLs des réponses XHR du planning
+PLANNING_API_URL_PATTERN = "teamplanning"
+
+# Noms des champs JSON des réponses du planning (format DHTMLX scheduler)
+PLANNING_API_FIELDS = {
+    'sections': 'sections',          # Liste des collaborateurs (lignes)
+    'section_key': 'key',            # Identifiant de la ligne
+    'section_label': 'label',        # Nom affiché du collaborateur
+    'section_corp_id': 'corpId',     # Équivalent de data-corp-id
+    'events': 'data',                # Liste des événements
+    'event_id': 'id',
+    'event_section': 'section_id',   # Ligne de rattachement de l'événement
+    'event_start': 'start_date',     # "2026-01-05 00:00"
+    'event_end': 'end_date',         # Date de fin exclusive
+    'event_class': 'classname',      # Classes CSS (validated_vcell, telework...)
+    'event_title': 'text',
+    'timespans': 'timespans',        # Jours non ouvrés (grey_cell_weekend)
+}
+
+# Enregistrement des payloads par mois pour un rejeu hors ligne. Désactivé par
+# défaut : les payloads bruts contiennent les données RH de toute l'équipe.
+NETWORK_RECORD_FIXTURES = False
+NETWORK_FIXTURES_DIR = OUTPUT_DIR / "fixtures"
+
 # ============================================================
 # RÈGLES RH (PÉRIODE DE VÉRIFICATION)
 # ============================================================
@@ -159,3 +245,27 @@ EXCEL_ROW_HEIGHTS = {
     'data': None,   # Lignes de données (auto)
     'note': 30      # Lignes de notes
 }
+
+# ============================================================
+# GÉNÉRATION EXCEL
+# ============================================================
+
+# Moteur d'écriture du classeur :
+# - "streaming" : openpyxl write_only, lignes écrites au fil de l'eau (mémoire constante)
+# - "standard"  : classeur entièrement construit en mémoire
+# Les deux produisent le même fichier (valeurs, styles, fusions, volets figés)
+EXCEL_BACKEND = "streaming"
+
+# Profil de rapport par défaut (surchargé par --profile dans scripts/main.py) :
+# "full" (complet), "summary" (Synthèse seule), "monthly" (un classeur par mois),
+# "collaborator" (un classeur par collaborateur)
+REPORT_PROFILE = "full"
+
+# Nombre de processus rendant les feuilles par collaborateur (1 = séquentiel).
+# Utilisé avec le moteur "streaming" uniquement
+EXCEL_CALENDAR_WORKERS = min(4, os.cpu_count() or 1)
+
+# Régénération incrémentale : seules les feuilles dont les données ont changé depuis
+# le rapport précédent sont recalculées, les autres sont recopiées du classeur précédent
+# (empreintes dans <rapport>.xlsx.sheets.json). Moteur "streaming" uniquement
+EXCEL_INCREMENTAL = True
@@ -0,0 +1,7 @@
+"""Module de stockage et de chargement de l'extraction"""
+
+from .storage import records_to_frame, write_extract, write_csv, load_extract
+from .planning_dataset import PlanningDataset
+from .roster_store import RosterStore
+
+__all__ = ['records_to_frame', 'write_extract', 'write_csv', 'load_extract', 'PlanningDataset', 'RosterStore']
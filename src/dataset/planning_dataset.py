@@ -0,0 +1,83 @@
+"""
+Jeu de données du planning, chargé une seule fois pour tout le rapport
+
+`PlanningDataset` enveloppe le DataFrame typé de l'extraction et le
+pré-indexe par collaborateur, par mois et par (mois, collaborateur) : les
+positions des lignes de chaque groupe sont calculées une fois (groupby
+indices), et chaque sélection est ensuite un simple `iloc`, au lieu d'un
+filtre `df[df['collaborateur'] == c]` qui parcourt toute la table.
+
+Le même objet est passé à l'analyse, aux feuilles mensuelles et aux feuilles
+par collaborateur. Il se construit depuis un fichier d'extraction ou
+directement depuis les records du scraper, sans passage par le disque.
+
+`collaborators` est l'index canonique des collaborateurs : l'ordre des lignes
+du planning d'après le registre de l'effectif (RosterStore), ou l'ordre
+alphabétique sans registre.
+"""
+
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.dataset.storage import records_to_frame, load_extract
+from src.dataset.roster_store import RosterStore
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+class PlanningDataset:
+    """
+    Extraction du planning pré-indexée.
+
+    Exemple:
+        >>> dataset = PlanningDataset.from_records(records)
+        >>> for collaborateur in dataset.collaborators:
+        ...     rows = dataset.for_collaborator(collaborateur)
+    """
+
+    def __init__(self, df: pd.DataFrame, roster: Optional[RosterStore] = None):
+        """
+        Args:
+            df: DataFrame typé de l'extraction (voir records_to_frame())
+            roster: Registre de l'effectif donnant l'ordre des collaborateurs
+        """
+        self.df = df.reset_index(drop=True)
+
+        months = self.df["date"].dt.month
+        self._by_collaborator = self.df.groupby("collaborateur", observed=True, sort=False).indices
+        self._by_month = self.df.groupby(months, sort=False).indices
+        self._by_month_collaborator = self.df.groupby([months, "collaborateur"], observed=True, sort=False).indices
+
+        self.collaborators = roster.order(self._by_collaborator) if roster else sorted(self._by_collaborator)
+        self.months = sorted(int(m) for m in self._by_month)
+
+    @classmethod
+    def from_records(cls, records: List[Dict], roster: Optional[RosterStore] = None) -> "PlanningDataset":
+        """Construit le jeu de données directement depuis les records du scraper."""
+        return cls(records_to_frame(records), roster)
+
+    @classmethod
+    def from_file(cls, path, roster: Optional[RosterStore] = None) -> "PlanningDataset":
+        """Charge le jeu de données depuis un fichier d'extraction (Parquet, Arrow ou CSV)."""
+        return cls(load_extract(path), roster)
+
+    def use_roster(self, roster: RosterStore):
+        """Ordonne les collaborateurs selon le registre de l'effectif (après sa mise à jour)."""
+        self.collaborators = roster.order(self._by_collaborator)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def for_collaborator(self, collaborateur: str) -> pd.DataFrame:
+        """Lignes d'un collaborateur (ordre de l'extraction)."""
+        return self.df.iloc[self._by_collaborator.get(collaborateur, _EMPTY)]
+
+    def for_month(self, month: int) -> pd.DataFrame:
+        """Lignes d'un mois (1-12)."""
+        return self.df.iloc[self._by_month.get(month, _EMPTY)]
+
+    def for_month_collaborator(self, month: int, collaborateur: str) -> pd.DataFrame:
+        """Lignes d'un collaborateur pour un mois donné."""
+        return self.df.iloc[self._by_month_collaborator.get((month, collaborateur), _EMPTY)]
@@ -0,0 +1,215 @@
+"""
+Registre persistant de l'effectif (collaborateurs du planning)
+
+Le même effectif était redécouvert à chaque mois et à chaque exécution. Le
+registre (ROSTER_FILE) conserve chaque collaborateur d'une exécution à
+l'autre, sous son UID (`extract_uid_from_corp_id`) :
+
+    "344256": {"name": "Dupont Jean", "first_seen": "2026-01", "last_seen": "2026-12", "row": 3}
+
+- `first_seen` / `last_seen` : premier et dernier mois (AAAA-MM) où il figure
+- `row` : position de sa ligne dans le planning au dernier mois vu
+- une ligne sans UID est enregistrée sous son nom (clé "nom:<nom>")
+
+Pendant le scraping, chaque mois extrait est comparé au registre
+(`observe_records()`, appelé par la boucle des mois de chaque moteur) : seules
+les différences sont journalisées (arrivées, absences, renommages, lignes
+réordonnées), puis le registre est mis à jour. L'ordre des lignes
+du registre est l'index canonique des collaborateurs : `PlanningDataset`
+l'utilise pour `dataset.collaborators`, et donc pour l'analyse et les
+feuilles Excel.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+ROSTER_VERSION = 1
+
+# Au-delà, les noms des arrivées / absences ne sont pas listés dans le journal
+_MAX_LOGGED_NAMES = 10
+
+
+def _roster_key(name: str, uid: str) -> str:
+    return uid if uid else f"nom:{name}"
+
+
+def _format_names(names: List[str]) -> str:
+    shown = ", ".join(names[:_MAX_LOGGED_NAMES])
+    return shown if len(names) <= _MAX_LOGGED_NAMES else f"{shown}... (+{len(names) - _MAX_LOGGED_NAMES})"
+
+
+class RosterStore:
+    """
+    Effectif connu, par UID.
+
+    Exemple:
+        >>> roster = RosterStore.load(ROSTER_FILE)
+        >>> roster.observe_records(2026, 1, records_janvier)
+        >>> roster.save()
+        >>> roster.order(["Martin Paul", "Dupont Jean"])
+        ['Dupont Jean', 'Martin Paul']
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None, path=None):
+        """
+        Args:
+            entries: {clé: {name, first_seen, last_seen, row}}
+            path: Fichier du registre (pour save())
+        """
+        self.entries = entries or {}
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()   # Mois observés depuis plusieurs workers
+
+    @classmethod
+    def load(cls, path) -> "RosterStore":
+        """Charge le registre (vide s'il est absent ou illisible)."""
+        path = Path(path)
+        if not path.exists():
+            return cls(path=path)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != ROSTER_VERSION:
+                logger.info(f"Registre de l'effectif d'une autre version ignoré ({path.name})")
+                return cls(path=path)
+            return cls(payload["collaborators"], path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Registre de l'effectif illisible ignoré ({path.name}) : {e}")
+            return cls(path=path)
+
+    def save(self, path=None) -> Path:
+        """Enregistre atomiquement le registre (fichier temporaire puis renommage)."""
+        path = Path(path or self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        ordered = dict(sorted(self.entries.items(), key=lambda item: (item[1]["row"], item[1]["name"])))
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": ROSTER_VERSION, "collaborators": ordered}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def latest(self) -> Optional[str]:
+        """Dernier mois (AAAA-MM) observé, tous collaborateurs confondus."""
+        return max((e["last_seen"] for e in self.entries.values()), default=None)
+
+    def observe_month(self, year: int, month: int, members: Iterable[Tuple[str, str]]) -> Dict:
+        """
+        Compare l'effectif d'un mois au registre puis met le registre à jour.
+
+        Le nom et la position d'un collaborateur ne sont mis à jour que depuis
+        son mois le plus récent : rescraper un mois plus ancien ne fait pas
+        revenir un ancien nom ou un ancien ordre.
+
+        Args:
+            year: Année
+            month: Mois (1-12)
+            members: Couples (nom, uid) dans l'ordre des lignes du planning
+
+        Returns:
+            {"added": [noms], "missing": [noms], "renamed": [(ancien, nouveau)], "reordered": bool}
+        """
+        seen = {}
+        for name, uid in members:
+            seen.setdefault(_roster_key(name, uid), name)
+
+        with self._lock:
+            return self._observe(f"{year}-{month:02d}", seen)
+
+    def _observe(self, period: str, seen: Dict[str, str]) -> Dict:
+        latest = self.latest
+        diff = {"added": [], "missing": [], "renamed": [], "reordered": False}
+
+        # Collaborateurs attendus ce mois-ci : présents sur la période connue,
+        # ou présents au dernier mois observé quand le mois est nouveau
+        for key, entry in self.entries.items():
+            if key in seen:
+                continue
+            if entry["first_seen"] <= period <= entry["last_seen"] or (period > latest and entry["last_seen"] == latest):
+                diff["missing"].append(entry["name"])
+
+        moved = []
+        for row, (key, name) in enumerate(seen.items()):
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = {"name": name, "first_seen": period, "last_seen": period, "row": row}
+                diff["added"].append(name)
+                continue
+
+            if period >= entry["last_seen"]:
+                if entry["name"] != name:
+                    diff["renamed"].append((entry["name"], name))
+                    entry["name"] = name
+                moved.append((entry["row"], row))
+                entry["row"] = row
+                entry["last_seen"] = period
+            entry["first_seen"] = min(entry["first_seen"], period)
+
+        # Réordonnancement : l'ordre relatif des lignes déjà connues a changé
+        previous_rows = [old for old, _ in sorted(moved, key=lambda m: m[1])]
+        diff["reordered"] = previous_rows != sorted(previous_rows)
+
+        return diff
+
+    def observe_records(self, year: int, month: int, records: List[Dict]) -> Dict:
+        """
+        Compare au registre l'effectif d'un mois qui vient d'être extrait et
+        journalise uniquement les différences.
+
+        Args:
+            year: Année
+            month: Mois (1-12)
+            records: Records du mois (collaborateur par collaborateur, dans l'ordre des lignes)
+
+        Returns:
+            Différences (voir observe_month())
+        """
+        members = list(dict.fromkeys((r["collaborateur"], r["uid"] or "") for r in records))
+        diff = self.observe_month(year, month, members)
+        log_roster_diff(f"{year}-{month:02d}", diff, len(members))
+        return diff
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """
+        Trie des noms selon l'ordre canonique du registre : lignes du dernier mois
+        observé, puis collaborateurs partis (du plus récent au plus ancien, dans
+        l'ordre de leurs lignes) ; les noms inconnus du registre suivent, par ordre
+        alphabétique.
+        """
+        latest = self.latest
+        current = sorted((e for e in self.entries.values() if e["last_seen"] == latest), key=lambda e: e["row"])
+        departed = sorted((e for e in self.entries.values() if e["last_seen"] != latest),
+                          key=lambda e: (-int(e["last_seen"].replace("-", "")), e["row"]))
+
+        rank = {}
+        for entry in current + departed:
+            rank.setdefault(entry["name"], len(rank))
+        return sorted(names, key=lambda name: (rank.get(name, len(rank)), name))
+
+
+def log_roster_diff(label: str, diff: Dict, nb_members: int):
+    """Journalise les différences d'effectif d'un mois (rien si l'effectif est inchangé)."""
+    if not (diff["added"] or diff["missing"] or diff["renamed"] or diff["reordered"]):
+        logger.debug(f"Effectif {label} inchangé ({nb_members} collaborateurs)")
+        return
+
+    if diff["added"]:
+        logger.info(f"Effectif {label} : {len(diff['added'])} nouveau(x) : {_format_names(diff['added'])}")
+    if diff["missing"]:
+        logger.info(f"Effectif {label} : {len(diff['missing'])} absent(s) : {_format_names(diff['missing'])}")
+    for old_name, new_name in diff["renamed"]:
+        logger.info(f"Effectif {label} : {old_name} renommé en {new_name}")
+    if diff["reordered"]:
+        logger.info(f"Effectif {label} : ordre des lignes modifié")
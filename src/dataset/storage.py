@@ -0,0 +1,124 @@
+"""
+Stockage typé de l'extraction (Parquet / Arrow IPC)
+
+Format d'échange principal entre le scraping et la génération Excel :
+
+    collaborateur        : catégorie
+    uid                  : chaîne
+    date                 : date native (date32 sur disque)
+    type_am, type_pm     : catégorie (PRESENT, TELETRAVAIL, CONGES, JOUR_NON_OUVRE)
+    detail_am, detail_pm : catégorie
+
+Le format dépend de l'extension du fichier :
+- `.parquet`          : Parquet (compressé)
+- `.arrow`, `.feather` : Arrow IPC non compressé, chargé en mémoire mappée
+
+Le CSV reste disponible en export optionnel (`write_csv()`), au format
+historique (dates "YYYY/MM/DD"), et peut toujours être relu par `load_extract()`.
+"""
+
+from pathlib import Path
+from typing import List, Dict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# Colonnes de l'extraction, dans l'ordre du CSV
+EXTRACT_COLUMNS = ["collaborateur", "uid", "date", "type_am", "detail_am", "type_pm", "detail_pm"]
+
+# Types de demi-journée (même ordre de priorité que src/scraper/planning_grid.py)
+TYPE_DTYPE = pd.CategoricalDtype(["PRESENT", "TELETRAVAIL", "CONGES", "JOUR_NON_OUVRE"])
+
+# Extensions des fichiers Arrow IPC (les autres sont lus / écrits en Parquet)
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+
+
+def _to_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Applique les types de l'extraction à un DataFrame brut (dates en texte ou natives)."""
+    df = df.reindex(columns=EXTRACT_COLUMNS)
+
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format="%Y/%m/%d")
+
+    df["uid"] = df["uid"].fillna("").astype(str)
+    df["collaborateur"] = df["collaborateur"].astype("category")
+    for period in ["am", "pm"]:
+        df[f"type_{period}"] = df[f"type_{period}"].astype(TYPE_DTYPE)
+        if not isinstance(df[f"detail_{period}"].dtype, pd.CategoricalDtype):
+            df[f"detail_{period}"] = df[f"detail_{period}"].fillna("").astype(str).astype("category")
+
+    return df
+
+
+def records_to_frame(records: List[Dict]) -> pd.DataFrame:
+    """
+    Convertit les records du scraper en DataFrame typé.
+
+    Args:
+        records: Records (dicts) retournés par le scraping
+
+    Returns:
+        DataFrame aux colonnes EXTRACT_COLUMNS, typé
+    """
+    return _to_typed_frame(pd.DataFrame(records, columns=EXTRACT_COLUMNS))
+
+
+def write_extract(df: pd.DataFrame, path) -> Path:
+    """
+    Écrit l'extraction typée (Parquet ou Arrow IPC selon l'extension).
+
+    Args:
+        df: DataFrame typé (voir records_to_frame())
+        path: Fichier de sortie
+
+    Returns:
+        Chemin du fichier écrit
+    """
+    path = Path(path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Dates sans heure : stockées en date32
+    date_idx = table.schema.get_field_index("date")
+    table = table.set_column(date_idx, "date", table.column("date").cast(pa.date32()))
+
+    if path.suffix in ARROW_SUFFIXES:
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        pq.write_table(table, path)
+    return path
+
+
+def write_csv(df: pd.DataFrame, path) -> Path:
+    """Exporte l'extraction en CSV (format historique, dates "YYYY/MM/DD")."""
+    path = Path(path)
+    csv_df = df.copy()
+    csv_df["date"] = csv_df["date"].dt.strftime("%Y/%m/%d")
+    csv_df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+def load_extract(path, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Charge une extraction (Parquet, Arrow IPC ou CSV) en DataFrame typé.
+
+    Args:
+        path: Fichier d'extraction
+        memory_map: Lecture en mémoire mappée (Parquet / Arrow)
+
+    Returns:
+        DataFrame aux colonnes EXTRACT_COLUMNS, "date" en datetime64
+    """
+    path = Path(path)
+
+    if path.suffix == ".csv":
+        df = pd.read_csv(path, dtype={"uid": str}, keep_default_na=False)
+        return _to_typed_frame(df)
+
+    if path.suffix in ARROW_SUFFIXES:
+        table = feather.read_table(path, memory_map=memory_map)
+    else:
+        table = pq.read_table(path, memory_map=memory_map)
+
+    return _to_typed_frame(table.to_pandas(date_as_object=False))
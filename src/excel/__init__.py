@@ -1,5 +1,6 @@
 """Module de génération des rapports Excel"""
 
 from .excel_generator import analyze_leave_data, create_excel_report
+from .report_profiles import REPORT_PROFILES, generate_report
 
-__all__ = ['analyze_leave_data', 'create_excel_report']
+__all__ = ['analyze_leave_data', 'create_excel_report', 'REPORT_PROFILES', 'generate_report']
@@ -1,508 +1,405 @@
 """Module de génération du rapport Excel"""
 
-import pandas as pd
-import openpyxl
 import calendar
-from collections import defaultdict
-from openpyxl.styles import Font, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from typing import Dict
+import json
+import time
+from openpyxl.utils import get_column_letter, column_index_from_string
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from src.config import (
     MOIS_NOMS, JOURS_SEMAINE,TARGET_YEAR,
-    HEADER_FILL, HEADER_FONT, NAME_FILL, TOTAL_FILL, SUBHEADER_FILL,
-    GREEN_FILL, RED_FILL, MONTH_FILL, TV_FILL, TP_FILL, CV_FILL, CP_FILL,
-    RV_FILL, RP_FILL, WE_FILL, MIXED_FILL, INEX_FILL,
-    BORDER, BORDER_DIAG, RULE_START_DATE, RULE_END_DATE,
-    RULE_MIN_CONSECUTIVE_DAYS, RULE_MIN_TOTAL_DAYS, EXCEL_COLUMN_WIDTHS
+    TV_FILL, TP_FILL, CV_FILL, CP_FILL, RV_FILL, RP_FILL, WE_FILL, MIXED_FILL,
+    EXCEL_COLUMN_WIDTHS, EXCEL_BACKEND, EXCEL_CALENDAR_WORKERS, EXCEL_INCREMENTAL
 )
-from src.utils import is_validated, is_rtt, get_status_code, count_event_weight
 from src.utils.calendar_utils import get_days_per_month
+from src.dataset import PlanningDataset
+from src.excel.incremental import SHEET_LAYOUT_VERSION, content_digest
+from src.excel.leave_stats import compute_leave_stats
+from src.excel.status_matrix import StatusMatrix
+from src.excel.sheet_writer import NO_STYLE, SheetSpec, open_workbook_writer, write_sheet_data
+from src.excel.style_registry import (
+    TITLE, LEGEND_LABEL, HEADER, HEADER_EMPTY, HEADER_WEEKDAY, SUMMARY_HEADER,
+    SUMMARY_TEXT, SUMMARY_VALUE, SUMMARY_NUMBER, RULE_OK, RULE_KO,
+    SUMMARY_TOTAL_LABEL, SUMMARY_TOTAL_EMPTY, SUMMARY_TOTAL_SUM, SUMMARY_TOTAL_RULE, NOTE,
+    NAME_EVEN, NAME_ODD, SEPARATOR, EXPLANATION, MONTH, MISSING_DAY,
+    legend_style, status_style, total_label_style, total_day_style
+)
 from src.logging import get_logger
+from src.metrics import timer, record_time, increment
 
 logger = get_logger()
 
+# (ligne, plage fusionnée, texte, style) des éléments de légende
+LEGEND_ITEMS = [
+    (2, "B2:C2", "TV = Télétravail validé", legend_style(TV_FILL, "FFFFFF")),
+    (2, "D2:E2", "TP = Télétravail à valider", legend_style(TP_FILL, "000000")),
+    (2, "F2:G2", "CV = Congés validés", legend_style(CV_FILL, "FFFFFF")),
+    (2, "H2:I2", "CP = Congés à valider", legend_style(CP_FILL, "000000")),
+    (3, "B3:C3", "RV = RTT validés", legend_style(RV_FILL, "FFFFFF")),
+    (3, "D3:E3", "RP = RTT à valider", legend_style(RP_FILL, "000000")),
+    (3, "F3:G3", "W = Week-end/Férié", legend_style(WE_FILL, "000000")),
+    (3, "H3:I3", "AM/PM = Demi-journée", legend_style(MIXED_FILL, "000000")),
+]
+
+# Préfixe des empreintes de feuilles : une mise en page différente invalide les feuilles précédentes
+_LAYOUT_KEY = f"{SHEET_LAYOUT_VERSION}|{json.dumps(EXCEL_COLUMN_WIDTHS, sort_keys=True)}"
 
-def analyze_leave_data(csv_file: str) -> Dict:
+
+def analyze_leave_data(dataset: PlanningDataset) -> Dict:
     """
-    Analyse les données de congés depuis le CSV.
+    Analyse les données de congés du planning.
     
     Args:
-        csv_file: Chemin du fichier CSV
+        dataset: Jeu de données du planning
         
     Returns:
         Dictionnaire de statistiques par collaborateur
     """
     logger.info("Analyse des données de congés...")
     
-    df = pd.read_csv(csv_file)
-    df['date_obj'] = pd.to_datetime(df['date'], format='%Y/%m/%d')
-    
-    stats = defaultdict(lambda: {
-        'teletravail_valide_am': 0, 'teletravail_valide_pm': 0,
-        'teletravail_a_valider_am': 0, 'teletravail_a_valider_pm': 0,
-        'conges_valides_am': 0, 'conges_valides_pm': 0,
-        'conges_a_valider_am': 0, 'conges_a_valider_pm': 0,
-        'rtt_valides_am': 0, 'rtt_valides_pm': 0,
-        'rtt_a_valider_am': 0, 'rtt_a_valider_pm': 0,
-        'regle_10j_consecutifs': False, 'regle_20j_total': False,
-        'jours_consecutifs_max': 0, 'jours_total_periode': 0,
-        'uid': '',
-    })
-    
-    # Comptage des événements
-    for _, row in df.iterrows():
-        c = row['collaborateur']
-        if 'uid' in row and row['uid'] and not stats[c]['uid']:
-            stats[c]['uid'] = str(row['uid'])
-        
-        for period in ['am', 'pm']:
-            t = row[f'type_{period}']
-            d = row[f'detail_{period}']
-            v = is_validated(d)
-            if t == 'TELETRAVAIL':
-                if v == True:
-                    stats[c][f'teletravail_valide_{period}'] += 1
-                elif v == False:
-                    stats[c][f'teletravail_a_valider_{period}'] += 1
-            elif t == 'CONGES':
-                if is_rtt(d):
-                    if v == True:
-                        stats[c][f'rtt_valides_{period}'] += 1
-                    elif v == False:
-                        stats[c][f'rtt_a_valider_{period}'] += 1
-                else:
-                    if v == True:
-                        stats[c][f'conges_valides_{period}'] += 1
-                    elif v == False:
-                        stats[c][f'conges_a_valider_{period}'] += 1
-    
-    # Analyse des règles RH
-    for collaborateur in stats.keys():
-        collab_df = df[df['collaborateur'] == collaborateur].copy()
-        collab_df = collab_df[
-            (collab_df['date_obj'] >= RULE_START_DATE) &
-            (collab_df['date_obj'] <= RULE_END_DATE)
-        ]
-        collab_df = collab_df.sort_values('date_obj')
-        
-        jours_type = {}
-        total_jours = 0
-        for _, row in collab_df.iterrows():
-            dt = row['date_obj']
-            ca = row['type_am'] == 'CONGES'
-            cp = row['type_pm'] == 'CONGES'
-            we = row['type_am'] == 'JOUR_NON_OUVRE' and row['type_pm'] == 'JOUR_NON_OUVRE'
-            if ca or cp:
-                jours_type[dt] = 'CONGES'
-                total_jours += 1 if (ca and cp) else 0.5
-            elif we:
-                jours_type[dt] = 'WEEKEND'
-            else:
-                jours_type[dt] = 'AUTRE'
-        
-        # Calcul des jours consécutifs
-        max_cons = 0
-        cur_cons = 0
-        cur = RULE_START_DATE
-        while cur <= RULE_END_DATE:
-            jt = jours_type.get(cur, 'AUTRE')
-            if jt == 'CONGES':
-                cur_cons += 1
-                max_cons = max(max_cons, cur_cons)
-            elif jt != 'WEEKEND':
-                cur_cons = 0
-            cur += pd.Timedelta(days=1)
-        
-        stats[collaborateur]['jours_consecutifs_max'] = max_cons
-        stats[collaborateur]['jours_total_periode'] = total_jours
-        stats[collaborateur]['regle_10j_consecutifs'] = max_cons >= RULE_MIN_CONSECUTIVE_DAYS
-        stats[collaborateur]['regle_20j_total'] = total_jours >= RULE_MIN_TOTAL_DAYS
+    with timer("excel.analyze"):
+        stats = compute_leave_stats(dataset.df, dataset.collaborators)
     
     logger.info(f"Analyse terminée : {len(stats)} collaborateurs")
     return stats
 
 
-def write_legend(ws, max_col_letter: str):
-    """Écrit la légende sur les lignes 1-3."""
-    ws.merge_cells(f'A1:{max_col_letter}1')
-    ws['A1'].font = Font(bold=True, size=14, color="FFFFFF")
-    ws['A1'].fill = HEADER_FILL
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    ws['A2'] = "LÉGENDE"
-    ws['A2'].font = Font(bold=True, size=10)
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    ws['A3'] = ""
-    
-    items_r2 = [
-        ("B2:C2", "TV = Télétravail validé", TV_FILL, "FFFFFF"),
-        ("D2:E2", "TP = Télétravail à valider", TP_FILL, "000000"),
-        ("F2:G2", "CV = Congés validés", CV_FILL, "FFFFFF"),
-        ("H2:I2", "CP = Congés à valider", CP_FILL, "000000"),
-    ]
-    items_r3 = [
-        ("B3:C3", "RV = RTT validés", RV_FILL, "FFFFFF"),
-        ("D3:E3", "RP = RTT à valider", RP_FILL, "000000"),
-        ("F3:G3", "W = Week-end/Férié", WE_FILL, "000000"),
-        ("H3:I3", "AM/PM = Demi-journée", MIXED_FILL, "000000"),
-    ]
+def legend_rows(title: str, max_col_letter: str):
+    """
+    Titre et légende des lignes 1-3.
+
+    Returns:
+        (lignes {1: [...], 2: [...], 3: [...]}, plages fusionnées, hauteurs de lignes)
+    """
+    rows = {
+        1: [(1, title, TITLE)],
+        2: [(1, "LÉGENDE", LEGEND_LABEL)],
+        3: [(1, "", NO_STYLE)],
+    }
+    merges = [f'A1:{max_col_letter}1']
     
-    for items in [items_r2, items_r3]:
-        for cell_range, text, fill, fc in items:
-            start = cell_range.split(':')[0]
-            cell = ws[start]
-            cell.value = text
-            cell.fill = fill
-            cell.font = Font(bold=True, size=8, color=fc)
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = BORDER
-            ws.merge_cells(cell_range)
+    for row_num, cell_range, text, style in LEGEND_ITEMS:
+        col = column_index_from_string(cell_range.split(':')[0][0])
+        rows[row_num].append((col, text, style))
+        merges.append(cell_range)
     
-    ws.row_dimensions[1].height = 25
-    ws.row_dimensions[2].height = 22
-    ws.row_dimensions[3].height = 22
+    return rows, merges, {1: 25, 2: 22, 3: 22}
 
 
-def apply_cell_style(cell, code: str, is_even_row: bool = False):
-    """Applique le style visuel à une cellule selon le code."""
-    cell.border = BORDER
-    cell.alignment = Alignment(horizontal='center', vertical='center')
-    cell.font = Font(size=7, bold=True)
-    cell.value = code
+def create_summary_sheet(writer, stats: Dict, collaborators: Optional[List[str]] = None):
+    """
+    Crée la feuille de synthèse.
     
-    if code == 'W':
-        cell.fill = WE_FILL
-        cell.font = Font(size=7, color="999999")
-    elif '/' in code and 'W' not in code:
-        cell.fill = MIXED_FILL
-    elif code.startswith('TV'):
-        cell.fill = TV_FILL
-    elif code.startswith('TP'):
-        cell.fill = TP_FILL
-    elif code.startswith('CV'):
-        cell.fill = CV_FILL
-    elif code.startswith('CP'):
-        cell.fill = CP_FILL
-    elif code.startswith('RV'):
-        cell.fill = RV_FILL
-    elif code.startswith('RP'):
-        cell.fill = RP_FILL
-    elif code == '' and is_even_row:
-        cell.fill = NAME_FILL
-
-
-def create_summary_sheet(wb, stats: Dict):
-    """Crée la feuille de synthèse."""
+    Args:
+        collaborators: Ordre des lignes (index canonique dataset.collaborators) ;
+                       défaut : ordre alphabétique
+    """
     logger.info("Création de la feuille Synthèse...")
     
-    ws = wb.active
-    ws.title = "Synthèse"
+    if collaborators is None:
+        sorted_collabs = sorted(stats.keys())
+    else:
+        sorted_collabs = [c for c in collaborators if c in stats]
+    total_row = 2 + len(sorted_collabs)
     
-    headers = [
-        "Collaborateur", "UID",
-        "Télétravail\nValidé (j)", "Télétravail\nÀ valider (j)",
-        "Congés\nValidés (j)", "Congés\nÀ valider (j)",
-        "RTT\nValidés (j)", "RTT\nÀ valider (j)",
-        "Règle 10j\nconsécutifs", "Règle 20j\ntotal"
-    ]
-    for col, h in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=h)
-        cell.fill = HEADER_FILL
-        cell.font = Font(bold=True, color="FFFFFF", size=11)
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        cell.border = BORDER
-    ws.row_dimensions[1].height = 30
-    
-    sorted_collabs = sorted(stats.keys())
-    row = 2
-    for collaborateur in sorted_collabs:
-        s = stats[collaborateur]
-        data = [
-            collaborateur, s['uid'],
-            (s['teletravail_valide_am'] + s['teletravail_valide_pm']) / 2,
-            (s['teletravail_a_valider_am'] + s['teletravail_a_valider_pm']) / 2,
-            (s['conges_valides_am'] + s['conges_valides_pm']) / 2,
-            (s['conges_a_valider_am'] + s['conges_a_valider_pm']) / 2,
-            (s['rtt_valides_am'] + s['rtt_valides_pm']) / 2,
-            (s['rtt_a_valider_am'] + s['rtt_a_valider_pm']) / 2,
-            "✓" if s['regle_10j_consecutifs'] else "✗",
-            "✓" if s['regle_20j_total'] else "✗"
+    def rows():
+        headers = [
+            "Collaborateur", "UID",
+            "Télétravail\nValidé (j)", "Télétravail\nÀ valider (j)",
+            "Congés\nValidés (j)", "Congés\nÀ valider (j)",
+            "RTT\nValidés (j)", "RTT\nÀ valider (j)",
+            "Règle 10j\nconsécutifs", "Règle 20j\ntotal"
         ]
-        for col, value in enumerate(data, 1):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.border = BORDER
-            if col == 2:
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-            elif 3 <= col <= 8:
-                cell.alignment = Alignment(horizontal='right', vertical='center')
-                if isinstance(value, (int, float)):
-                    cell.number_format = '0.0'
-            elif col > 8:
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.font = Font(bold=True, size=14)
-                cell.fill = GREEN_FILL if value == "✓" else RED_FILL
-            else:
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-        row += 1
-    
-    # Ligne TOTAL
-    ws.cell(row=row, column=1, value="TOTAL").font = Font(bold=True)
-    ws.cell(row=row, column=1).fill = SUBHEADER_FILL
-    ws.cell(row=row, column=1).border = BORDER
-    ws.cell(row=row, column=2, value="").fill = SUBHEADER_FILL
-    ws.cell(row=row, column=2).border = BORDER
-    
-    for col in range(3, 9):
-        cl = get_column_letter(col)
-        cell = ws.cell(row=row, column=col, value=f"=SUM({cl}2:{cl}{row - 1})")
-        cell.font = Font(bold=True)
-        cell.fill = SUBHEADER_FILL
-        cell.border = BORDER
-        cell.alignment = Alignment(horizontal='right', vertical='center')
-        cell.number_format = '0.0'
-    
-    nb_ok_10j = sum(1 for s in stats.values() if s['regle_10j_consecutifs'])
-    nb_ok_20j = sum(1 for s in stats.values() if s['regle_20j_total'])
-    for col, val in [(9, f"{nb_ok_10j}/{len(stats)}"), (10, f"{nb_ok_20j}/{len(stats)}")]:
-        cell = ws.cell(row=row, column=col, value=val)
-        cell.font = Font(bold=True)
-        cell.fill = SUBHEADER_FILL
-        cell.border = BORDER
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        yield 1, [(col, h, SUMMARY_HEADER) for col, h in enumerate(headers, 1)]
+        
+        for row, collaborateur in enumerate(sorted_collabs, 2):
+            s = stats[collaborateur]
+            data = [
+                collaborateur, s['uid'],
+                (s['teletravail_valide_am'] + s['teletravail_valide_pm']) / 2,
+                (s['teletravail_a_valider_am'] + s['teletravail_a_valider_pm']) / 2,
+                (s['conges_valides_am'] + s['conges_valides_pm']) / 2,
+                (s['conges_a_valider_am'] + s['conges_a_valider_pm']) / 2,
+                (s['rtt_valides_am'] + s['rtt_valides_pm']) / 2,
+                (s['rtt_a_valider_am'] + s['rtt_a_valider_pm']) / 2,
+                "✓" if s['regle_10j_consecutifs'] else "✗",
+                "✓" if s['regle_20j_total'] else "✗"
+            ]
+            cells = []
+            for col, value in enumerate(data, 1):
+                if 3 <= col <= 8:
+                    style = SUMMARY_NUMBER if isinstance(value, (int, float)) else SUMMARY_VALUE
+                elif col > 8:
+                    style = RULE_OK if value == "✓" else RULE_KO
+                else:
+                    style = SUMMARY_TEXT
+                cells.append((col, value, style))
+            yield row, cells
+        
+        # Ligne TOTAL
+        cells = [(1, "TOTAL", SUMMARY_TOTAL_LABEL), (2, "", SUMMARY_TOTAL_EMPTY)]
+        for col in range(3, 9):
+            cl = get_column_letter(col)
+            cells.append((col, f"=SUM({cl}2:{cl}{total_row - 1})", SUMMARY_TOTAL_SUM))
+        
+        nb_ok_10j = sum(1 for s in stats.values() if s['regle_10j_consecutifs'])
+        nb_ok_20j = sum(1 for s in stats.values() if s['regle_20j_total'])
+        for col, val in [(9, f"{nb_ok_10j}/{len(stats)}"), (10, f"{nb_ok_20j}/{len(stats)}")]:
+            cells.append((col, val, SUMMARY_TOTAL_RULE))
+        yield total_row, cells
+        
+        # Note
+        note = "📋 Règles RH (période 15/05 - 15/10) : 10j consécutifs = au moins 10 jours d'affilée | 20j total = au moins 20 jours (consécutifs ou non)"
+        yield total_row + 2, [(1, note, NOTE)]
     
     # Largeurs de colonnes
-    ws.column_dimensions['A'].width = EXCEL_COLUMN_WIDTHS['collaborateur']
-    ws.column_dimensions['B'].width = EXCEL_COLUMN_WIDTHS['uid']
+    column_widths = {'A': EXCEL_COLUMN_WIDTHS['collaborateur'], 'B': EXCEL_COLUMN_WIDTHS['uid']}
     for col in range(3, 9):
-        ws.column_dimensions[get_column_letter(col)].width = EXCEL_COLUMN_WIDTHS['metrics']
-    ws.column_dimensions['I'].width = EXCEL_COLUMN_WIDTHS['rules']
-    ws.column_dimensions['J'].width = EXCEL_COLUMN_WIDTHS['rules']
+        column_widths[get_column_letter(col)] = EXCEL_COLUMN_WIDTHS['metrics']
+    column_widths['I'] = EXCEL_COLUMN_WIDTHS['rules']
+    column_widths['J'] = EXCEL_COLUMN_WIDTHS['rules']
     
-    # Note
-    ws.merge_cells(f'A{row + 2}:J{row + 2}')
-    note = ws[f'A{row + 2}']
-    note.value = "📋 Règles RH (période 15/05 - 15/10) : 10j consécutifs = au moins 10 jours d'affilée | 20j total = au moins 20 jours (consécutifs ou non)"
-    note.font = Font(size=9, italic=True)
-    note.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-    ws.row_dimensions[row + 2].height = 30
-    ws.freeze_panes = 'A2'
+    writer.add_sheet(SheetSpec(
+        "Synthèse", rows(),
+        column_widths=column_widths,
+        row_heights={1: 30, total_row + 2: 30},
+        merges=[f'A{total_row + 2}:J{total_row + 2}'],
+        freeze_panes='A2',
+        content_hash=content_digest(_LAYOUT_KEY, "Synthèse", sorted_collabs,
+                                    json.dumps(stats, sort_keys=True, default=str)),
+    ))
 
 
-def create_monthly_sheets(wb, csv_file: str):
-    """Crée les feuilles mensuelles."""
+def create_monthly_sheets(writer, dataset: PlanningDataset, status: StatusMatrix, months: Optional[List[int]] = None):
+    """
+    Crée les feuilles mensuelles.
+    
+    Args:
+        months: Mois à générer (défaut : tous les mois du planning)
+    """
     logger.info("Création des feuilles mensuelles...")
     
-    df = pd.read_csv(csv_file)
-    df['date_obj'] = pd.to_datetime(df['date'], format='%Y/%m/%d')
-    collaborateurs = sorted(df['collaborateur'].unique())
-    months_in_data = sorted(df['date_obj'].dt.month.unique())
+    collaborateurs = dataset.collaborators
+    rows_order = [status.index[c] for c in collaborateurs]
     
-    for month_num in months_in_data:
+    total_labels = [
+        ("TOTAL événements (j)", None),
+        ("  dont Télétravail (j)", ["TV", "TP"]),
+        ("  dont Congés (j)", ["CV", "CP"]),
+        ("  dont RTT (j)", ["RV", "RP"]),
+    ]
+    
+    for month_num in (dataset.months if months is None else [m for m in dataset.months if m in months]):
         month_name = MOIS_NOMS[month_num - 1]
         nb_days = calendar.monthrange(2026, month_num)[1]
-        
-        ws = wb.create_sheet(month_name)
         logger.debug(f"Feuille {month_name}")
         
         # Titre + légende
-        ws['A1'].value = f"PLANNING {month_name.upper()} 2026"
-        write_legend(ws, get_column_letter(nb_days + 1))
+        legend, merges, row_heights = legend_rows(f"PLANNING {month_name.upper()} 2026", get_column_letter(nb_days + 1))
+        row_heights.update({5: 15, 6: 18})
         
-        # En-têtes
-        ws.cell(row=5, column=1, value="").fill = HEADER_FILL
-        ws.cell(row=5, column=1).border = BORDER
-        ws.cell(row=6, column=1, value="Collaborateur").fill = HEADER_FILL
-        ws.cell(row=6, column=1).font = HEADER_FONT
-        ws.cell(row=6, column=1).alignment = Alignment(horizontal='center', vertical='center')
-        ws.cell(row=6, column=1).border = BORDER
-        
-        for day in range(1, nb_days + 1):
-            col = day + 1
-            dow = calendar.weekday(2026, month_num, day)
+        def rows(month_num=month_num, nb_days=nb_days, legend=legend):
+            yield from legend.items()
             
-            cell_dow = ws.cell(row=5, column=col, value=JOURS_SEMAINE[dow])
-            cell_dow.alignment = Alignment(horizontal='center', vertical='center')
-            cell_dow.font = Font(size=8, bold=True, color="FFFFFF")
-            cell_dow.fill = HEADER_FILL
-            cell_dow.border = BORDER
+            # En-têtes
+            header_dow = [(1, "", HEADER_EMPTY)]
+            header_day = [(1, "Collaborateur", HEADER)]
+            for day in range(1, nb_days + 1):
+                col = day + 1
+                dow = calendar.weekday(2026, month_num, day)
+                header_dow.append((col, JOURS_SEMAINE[dow], HEADER_WEEKDAY))
+                header_day.append((col, day, HEADER))
+            yield 5, header_dow
+            yield 6, header_day
             
-            cell_day = ws.cell(row=6, column=col, value=day)
-            cell_day.alignment = Alignment(horizontal='center', vertical='center')
-            cell_day.font = HEADER_FONT
-            cell_day.fill = HEADER_FILL
-            cell_day.border = BORDER
-        
-        ws.row_dimensions[5].height = 15
-        ws.row_dimensions[6].height = 18
-        
-        # Données
-        month_df = df[df['date_obj'].dt.month == month_num]
-        data_start_row = 7
-        
-        for idx, collaborateur in enumerate(collaborateurs):
-            row_num = data_start_row + idx
-            collab_month = month_df[month_df['collaborateur'] == collaborateur]
+            # Données
+            data_start_row = 7
             
-            cell = ws.cell(row=row_num, column=1, value=collaborateur)
-            cell.fill = NAME_FILL if idx % 2 == 0 else openpyxl.styles.PatternFill()
-            cell.font = Font(size=9, bold=True)
-            cell.alignment = Alignment(horizontal='left', vertical='center')
-            cell.border = BORDER
+            for idx, collaborateur in enumerate(collaborateurs):
+                is_even_row = idx % 2 == 0
+                cells = [(1, collaborateur, NAME_EVEN if is_even_row else NAME_ODD)]
+                
+                day_codes = status.labels[status.index[collaborateur], month_num]
+                for day in range(1, nb_days + 1):
+                    code = day_codes[day]
+                    cells.append((day + 1, code, status_style(code, is_even_row)))
+                yield data_start_row + idx, cells
             
-            day_codes = {}
-            for _, r in collab_month.iterrows():
-                d = r['date_obj'].day
-                day_codes[d] = get_status_code(r['type_am'], r['type_pm'], r['detail_am'], r['detail_pm'])
+            # Totaux
+            separator_row = data_start_row + len(collaborateurs)
+            total_row = separator_row + 1
             
-            for day in range(1, nb_days + 1):
-                col = day + 1
-                cell = ws.cell(row=row_num, column=col)
-                code = day_codes.get(day, '')
-                apply_cell_style(cell, code, is_even_row=(idx % 2 == 0))
-        
-        # Totaux
-        separator_row = data_start_row + len(collaborateurs)
-        total_row = separator_row + 1
-        
-        for col in range(1, nb_days + 2):
-            ws.cell(row=separator_row, column=col).border = Border(bottom=Side(style='medium'))
-        
-        total_labels = [
-            ("TOTAL événements (j)", None),
-            ("  dont Télétravail (j)", ["TV", "TP"]),
-            ("  dont Congés (j)", ["CV", "CP"]),
-            ("  dont RTT (j)", ["RV", "RP"]),
-        ]
-        
-        for offset, (label, prefixes) in enumerate(total_labels):
-            r = total_row + offset
+            yield separator_row, [(col, None, SEPARATOR) for col in range(1, nb_days + 2)]
             
-            cell = ws.cell(row=r, column=1, value=label)
-            cell.font = Font(bold=(offset == 0), size=9, italic=(offset > 0))
-            cell.fill = TOTAL_FILL
-            cell.border = BORDER
-            cell.alignment = Alignment(horizontal='left', vertical='center')
+            day_totals = status.month_totals(month_num, [prefixes for _, prefixes in total_labels]).tolist()
             
-            for day in range(1, nb_days + 1):
-                col = day + 1
-                total = 0
-                
-                for c_idx in range(len(collaborateurs)):
-                    code_val = ws.cell(row=data_start_row + c_idx, column=col).value or ''
-                    total += count_event_weight(code_val, prefixes)
+            for offset, (label, prefixes) in enumerate(total_labels):
+                cells = [(1, label, total_label_style(offset == 0))]
                 
-                cell = ws.cell(row=r, column=col)
-                if total > 0:
-                    cell.value = int(total) if total == int(total) else total
-                    cell.number_format = '0.0' if total != int(total) else '0'
-                else:
-                    cell.value = ""
-                cell.font = Font(bold=(offset == 0), size=9)
-                cell.fill = TOTAL_FILL
-                cell.border = BORDER
-                cell.alignment = Alignment(horizontal='center', vertical='center')
+                for day in range(1, nb_days + 1):
+                    total = day_totals[offset][day]
+                    if total > 0:
+                        value = int(total) if total == int(total) else total
+                        number_format = '0.0' if total != int(total) else '0'
+                    else:
+                        value, number_format = "", None
+                    cells.append((day + 1, value, total_day_style(offset == 0, number_format)))
+                yield total_row + offset, cells
         
         # Mise en forme
-        ws.column_dimensions['A'].width = EXCEL_COLUMN_WIDTHS['month_name']
+        column_widths = {'A': EXCEL_COLUMN_WIDTHS['month_name']}
         for col in range(2, nb_days + 2):
-            ws.column_dimensions[get_column_letter(col)].width = EXCEL_COLUMN_WIDTHS['day']
-        ws.freeze_panes = 'B7'
+            column_widths[get_column_letter(col)] = EXCEL_COLUMN_WIDTHS['day']
+        
+        writer.add_sheet(SheetSpec(
+            month_name, rows(),
+            column_widths=column_widths,
+            row_heights=row_heights,
+            merges=merges,
+            freeze_panes='B7',
+            content_hash=content_digest(_LAYOUT_KEY, month_name, collaborateurs, status.labels[rows_order, month_num]),
+        ))
 
 
-def create_calendar_sheets(wb, csv_file: str):
-    """Crée les feuilles par collaborateur."""
-    logger.info("Création des feuilles par collaborateur...")
-    days_per_month = get_days_per_month(TARGET_YEAR)
-    df = pd.read_csv(csv_file)
-    df['date_obj'] = pd.to_datetime(df['date'], format='%Y/%m/%d')
-    collaborateurs = sorted(df['collaborateur'].unique())
+def calendar_sheet_spec(collaborateur: str, collab_data, days_per_month: List[int]) -> SheetSpec:
+    """
+    Feuille individuelle d'un collaborateur.
     
-    for collaborateur in collaborateurs:
-        ws = wb.create_sheet(collaborateur[:31])
-        logger.debug(f"Feuille {collaborateur}")
-        
-        # Titre + légende
-        ws['A1'].value = f"PLANNING 2026 - {collaborateur}"
-        write_legend(ws, 'AF')
+    Args:
+        collaborateur: Nom du collaborateur
+        collab_data: Codes de statut du collaborateur (mois 1-12 × jours 1-31, voir StatusMatrix.labels)
+        days_per_month: Nombre de jours de chaque mois
+    """
+    # Titre + légende
+    legend, merges, row_heights = legend_rows(f"PLANNING 2026 - {collaborateur}", 'AF')
+    merges.append('A4:I4')
+    row_heights.update({4: 20, 6: 20})
+    
+    def rows():
+        yield from legend.items()
         
         # Explication
-        ws.merge_cells('A4:I4')
-        ws['A4'].value = "💡 Code-AM/PM = demi-journée | Code1/Code2 = matin≠après-midi"
-        ws['A4'].font = Font(size=9, italic=True)
-        ws['A4'].alignment = Alignment(horizontal='left', vertical='center')
-        ws['A4'].fill = openpyxl.styles.PatternFill(start_color="FFF9E6", end_color="FFF9E6", fill_type="solid")
-        ws.row_dimensions[4].height = 20
+        yield 4, [(1, "💡 Code-AM/PM = demi-journée | Code1/Code2 = matin≠après-midi", EXPLANATION)]
         
         # En-têtes
-        ws.cell(row=6, column=1, value="Mois").fill = HEADER_FILL
-        ws.cell(row=6, column=1).font = HEADER_FONT
-        ws.cell(row=6, column=1).alignment = Alignment(horizontal='center', vertical='center')
-        ws.cell(row=6, column=1).border = BORDER
-        
-        for day in range(1, 32):
-            col = day + 1
-            cell = ws.cell(row=6, column=col, value=day)
-            cell.fill = HEADER_FILL
-            cell.font = HEADER_FONT
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = BORDER
-        ws.row_dimensions[6].height = 20
-        
-        ws.column_dimensions['A'].width = EXCEL_COLUMN_WIDTHS['calendar_month']
-        for col in range(2, 33):
-            ws.column_dimensions[get_column_letter(col)].width = EXCEL_COLUMN_WIDTHS['calendar_day']
+        yield 6, [(1, "Mois", HEADER)] + [(day + 1, day, HEADER) for day in range(1, 32)]
         
         # Données
-        collab_df = df[df['collaborateur'] == collaborateur].copy()
-        collab_data = {}
-        for _, row in collab_df.iterrows():
-            m = row['date_obj'].month
-            d = row['date_obj'].day
-            if m not in collab_data:
-                collab_data[m] = {}
-            collab_data[m][d] = get_status_code(row['type_am'], row['type_pm'], row['detail_am'], row['detail_pm'])
-        
         for month_num, month_name in enumerate(MOIS_NOMS, 1):
-            row_num = 7 + month_num - 1
             max_days = days_per_month[month_num - 1]
             
-            cell = ws.cell(row=row_num, column=1, value=month_name)
-            cell.fill = MONTH_FILL
-            cell.font = Font(bold=True, size=10)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = BORDER
-            
+            cells = [(1, month_name, MONTH)]
             for day in range(1, 32):
-                col = day + 1
-                cell = ws.cell(row=row_num, column=col)
-                
                 if day <= max_days:
-                    code = collab_data.get(month_num, {}).get(day, '')
-                    apply_cell_style(cell, code)
+                    code = collab_data[month_num, day]
+                    cells.append((day + 1, code, status_style(code)))
                 else:
-                    cell.border = BORDER_DIAG
-                    cell.fill = INEX_FILL
-        
-        ws.freeze_panes = 'B7'
+                    cells.append((day + 1, None, MISSING_DAY))
+            yield 7 + month_num - 1, cells
+    
+    column_widths = {'A': EXCEL_COLUMN_WIDTHS['calendar_month']}
+    for col in range(2, 33):
+        column_widths[get_column_letter(col)] = EXCEL_COLUMN_WIDTHS['calendar_day']
+    
+    return SheetSpec(
+        collaborateur[:31], rows(),
+        column_widths=column_widths,
+        row_heights=row_heights,
+        merges=merges,
+        freeze_panes='B7',
+        content_hash=content_digest(_LAYOUT_KEY, "calendrier", collaborateur, days_per_month, collab_data),
+    )
+
+
+def _render_calendar_fragment(task) -> Tuple[List, int, float]:
+    """
+    Processus de rendu : sérialise les lignes d'une feuille individuelle dans un fichier.
+
+    Returns:
+        (styles utilisés, nombre de cellules, durée du rendu en secondes)
+    """
+    collaborateur, collab_data, days_per_month, fragment_path = task
+    started = time.perf_counter()
+    styles, nb_cells = write_sheet_data(calendar_sheet_spec(collaborateur, collab_data, days_per_month), fragment_path)
+    return styles, nb_cells, time.perf_counter() - started
+
+
+def create_calendar_sheets(writer, dataset: PlanningDataset, status: StatusMatrix,
+                           collaborators: Optional[List[str]] = None, workers: int = EXCEL_CALENDAR_WORKERS):
+    """
+    Crée les feuilles par collaborateur.
+    
+    Avec le moteur streaming et plusieurs processus, les lignes de chaque
+    feuille sont sérialisées en parallèle puis assemblées dans le classeur,
+    dans l'ordre des collaborateurs. En régénération incrémentale, seules
+    les feuilles modifiées sont confiées aux processus.
+    
+    Args:
+        collaborators: Collaborateurs à générer (défaut : tous)
+    """
+    logger.info("Création des feuilles par collaborateur...")
+    days_per_month = get_days_per_month(TARGET_YEAR)
+    collaborateurs = dataset.collaborators
+    if collaborators is not None:
+        wanted = set(collaborators)
+        collaborateurs = [c for c in collaborateurs if c in wanted]
+    
+    if workers <= 1 or len(collaborateurs) <= workers or not hasattr(writer, 'add_sheet_fragment'):
+        for collaborateur in collaborateurs:
+            logger.debug(f"Feuille {collaborateur}")
+            collab_data = status.labels[status.index[collaborateur]]
+            writer.add_sheet(calendar_sheet_spec(collaborateur, collab_data, days_per_month))
+        return
+    
+    specs = [calendar_sheet_spec(c, status.labels[status.index[c]], days_per_month) for c in collaborateurs]
+    tasks = {}
+    for collaborateur, spec in zip(collaborateurs, specs):
+        if not writer.can_reuse(spec.title, spec.content_hash):
+            tasks[collaborateur] = (collaborateur, status.labels[status.index[collaborateur]], days_per_month,
+                                    writer.new_fragment_path())
+    
+    logger.info(f"Rendu parallèle : {workers} processus, {len(tasks)} feuilles à régénérer")
+    chunksize = max(1, len(tasks) // (workers * 4))
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rendered = pool.map(_render_calendar_fragment, tasks.values(), chunksize=chunksize)
+        for collaborateur, spec in zip(collaborateurs, specs):
+            logger.debug(f"Feuille {collaborateur}")
+            if collaborateur in tasks:
+                styles, nb_cells, seconds = next(rendered)
+                writer.add_sheet_fragment(spec, tasks[collaborateur][3], styles)
+                record_time("excel.sheet", seconds, sheet=spec.title)
+                increment("excel.cells", nb_cells)
+            else:
+                writer.add_sheet(spec)
 
 
-def create_excel_report(stats: Dict, csv_file: str, output_file: str):
+def create_excel_report(stats: Dict, dataset: PlanningDataset, output_file: str, backend: str = EXCEL_BACKEND,
+                        months: Optional[List[int]] = None, collaborators: Optional[List[str]] = None,
+                        incremental: bool = EXCEL_INCREMENTAL):
     """
     Crée le rapport Excel complet.
     
     Args:
         stats: Statistiques par collaborateur
-        csv_file: Chemin du CSV source
+        dataset: Jeu de données du planning (chargé une seule fois)
         output_file: Chemin du fichier Excel de sortie
+        backend: "streaming" (write_only, mémoire constante) ou "standard"
+        months: Mois des feuilles mensuelles (défaut : tous)
+        collaborators: Collaborateurs des feuilles individuelles (défaut : tous)
+        incremental: Ne régénérer que les feuilles modifiées depuis le précédent output_file
+                     (moteur streaming)
     """
     logger.info("Génération du fichier Excel...")
     
-    wb = openpyxl.Workbook()
+    writer = open_workbook_writer(backend, previous_file=output_file if incremental else None)
+    
+    status = StatusMatrix(dataset)
     
-    create_summary_sheet(wb, stats)
-    create_monthly_sheets(wb, csv_file)
-    create_calendar_sheets(wb, csv_file)
+    create_summary_sheet(writer, stats, dataset.collaborators)
+    create_monthly_sheets(writer, dataset, status, months=months)
+    create_calendar_sheets(writer, dataset, status, collaborators=collaborators)
     
-    wb.save(output_file)
+    writer.save(output_file)
     logger.info(f"Fichier Excel créé : {output_file}")
@@ -0,0 +1,138 @@
+"""
+Régénération incrémentale du rapport Excel
+
+À chaque génération, l'empreinte du contenu de chaque feuille est enregistrée
+à côté du classeur (`rapport.xlsx.sheets.json`) :
+
+- feuille mensuelle : collaborateurs + tranche (mois) de la matrice des codes
+- feuille individuelle : collaborateur + tranche (collaborateur) de la matrice
+- Synthèse : statistiques de congés
+
+À la génération suivante, une feuille dont l'empreinte n'a pas changé n'est
+pas recalculée : sa partie XML est recopiée telle quelle depuis le classeur
+précédent. Le nouveau classeur reprend la table de styles du précédent, de
+sorte que les indices de style des parties recopiées restent valides.
+
+Le classeur précédent n'est réutilisé que s'il est identique à celui décrit
+par le fichier d'empreintes (empreinte du fichier .xlsx), sinon tout est
+régénéré.
+"""
+
+import hashlib
+import json
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+SIDECAR_SUFFIX = ".sheets.json"
+
+# À incrémenter à chaque changement de mise en page des feuilles (invalide toutes les empreintes)
+SHEET_LAYOUT_VERSION = 1
+
+
+def sidecar_path(xlsx_file) -> Path:
+    """Fichier d'empreintes associé à un classeur."""
+    return Path(f"{xlsx_file}{SIDECAR_SUFFIX}")
+
+
+def file_digest(path) -> str:
+    """Empreinte SHA-1 d'un fichier."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(*parts) -> str:
+    """
+    Empreinte SHA-1 du contenu d'une feuille.
+
+    Args:
+        parts: Chaînes, listes de chaînes ou tableaux numpy de codes (objets str)
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = part.ravel().tolist()
+        if isinstance(part, (list, tuple)):
+            part = "\x1f".join(str(p) for p in part)
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def write_sidecar(xlsx_file, sheets: Dict[str, Tuple[str, str]]):
+    """
+    Enregistre les empreintes des feuilles d'un classeur.
+
+    Args:
+        xlsx_file: Classeur généré
+        sheets: {titre de feuille: (empreinte du contenu, partie XML)}
+    """
+    payload = {
+        "workbook": file_digest(xlsx_file),
+        "sheets": {title: {"hash": content_hash, "part": part} for title, (content_hash, part) in sheets.items()},
+    }
+    with open(sidecar_path(xlsx_file), 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+
+
+class PreviousWorkbook:
+    """
+    Classeur de la génération précédente et empreintes de ses feuilles.
+
+    Le classeur est copié dans un répertoire temporaire : il reste lisible
+    même si le nouveau rapport est enregistré au même emplacement.
+    """
+
+    def __init__(self, xlsx_copy: Path, sheets: Dict[str, Dict], tmp_dir: tempfile.TemporaryDirectory):
+        self.archive = zipfile.ZipFile(xlsx_copy)
+        self.sheets = sheets
+        self._tmp_dir = tmp_dir
+
+    @classmethod
+    def load(cls, xlsx_file) -> Optional["PreviousWorkbook"]:
+        """Charge le classeur précédent, ou None s'il est absent ou ne correspond plus à ses empreintes."""
+        xlsx_file = Path(xlsx_file)
+        sidecar = sidecar_path(xlsx_file)
+        if not xlsx_file.exists() or not sidecar.exists():
+            return None
+
+        try:
+            with open(sidecar, encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload["workbook"] != file_digest(xlsx_file):
+                logger.info("Classeur précédent modifié depuis sa génération : régénération complète")
+                return None
+            sheets = payload["sheets"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Empreintes illisibles ({sidecar}) : {e}")
+            return None
+
+        tmp_dir = tempfile.TemporaryDirectory(prefix="excel_previous_")
+        xlsx_copy = Path(tmp_dir.name) / xlsx_file.name
+        shutil.copyfile(xlsx_file, xlsx_copy)
+        return cls(xlsx_copy, sheets, tmp_dir)
+
+    def reusable_part(self, title: str, content_hash: Optional[str]) -> Optional[str]:
+        """Partie XML de la feuille précédente si son contenu est inchangé."""
+        previous = self.sheets.get(title)
+        if content_hash is None or previous is None or previous["hash"] != content_hash:
+            return None
+        return previous["part"]
+
+    def read_part(self, part: str) -> bytes:
+        return self.archive.read(part)
+
+    def close(self):
+        self.archive.close()
+        self._tmp_dir.cleanup()
@@ -0,0 +1,167 @@
+"""
+Calcul vectorisé des statistiques de congés
+
+Remplace la boucle `iterrows()` d'`analyze_leave_data()` :
+
+1. Les indicateurs validé / à valider / RTT sont calculés une seule fois par
+   libellé de détail distinct (quelques dizaines), puis diffusés aux lignes.
+2. Les compteurs par collaborateur et par demi-journée sont agrégés en un passage
+   (np.bincount sur le code du collaborateur).
+3. Les règles RH travaillent sur une matrice (collaborateurs × jours de la
+   période) : jours de congés, week-ends / fériés (neutres) et autres jours
+   (qui coupent une série). La plus longue série de congés est obtenue par
+   run-length encoding vectorisé (sommes cumulées remises à zéro aux coupures).
+
+Le résultat est identique à l'ancienne version ligne par ligne.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Callable
+
+import numpy as np
+import pandas as pd
+
+from src.config import RULE_START_DATE, RULE_END_DATE, RULE_MIN_CONSECUTIVE_DAYS, RULE_MIN_TOTAL_DAYS
+from src.utils import is_validated, is_rtt
+
+# Types de jour pour les règles RH
+DAY_OTHER = 0     # Coupe une série de congés
+DAY_WEEKEND = 1   # Neutre (ni compté, ni coupure)
+DAY_CONGES = 2    # Compté dans la série
+
+
+def empty_leave_stats() -> Dict:
+    """Statistiques initiales d'un collaborateur."""
+    return {
+        'teletravail_valide_am': 0, 'teletravail_valide_pm': 0,
+        'teletravail_a_valider_am': 0, 'teletravail_a_valider_pm': 0,
+        'conges_valides_am': 0, 'conges_valides_pm': 0,
+        'conges_a_valider_am': 0, 'conges_a_valider_pm': 0,
+        'rtt_valides_am': 0, 'rtt_valides_pm': 0,
+        'rtt_a_valider_am': 0, 'rtt_a_valider_pm': 0,
+        'regle_10j_consecutifs': False, 'regle_20j_total': False,
+        'jours_consecutifs_max': 0, 'jours_total_periode': 0,
+        'uid': '',
+    }
+
+
+def _factorize(values: pd.Series):
+    """Codes entiers et valeurs distinctes d'une colonne (codes de catégorie si déjà catégorielle)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), list(values.cat.categories) + [np.nan]
+    return pd.factorize(values, use_na_sentinel=False)
+
+
+def _flags_per_distinct(values: pd.Series, func: Callable, dtype=object) -> np.ndarray:
+    """Applique `func` une seule fois par valeur distincte et diffuse le résultat aux lignes."""
+    codes, uniques = _factorize(values)
+    return np.array([func(u) for u in uniques], dtype=dtype)[codes]
+
+
+def _event_flags(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Indicateurs par ligne : un tableau booléen par compteur (validé / à valider, am / pm)."""
+    flags = {}
+    for period in ['am', 'pm']:
+        tt = _flags_per_distinct(df[f'type_{period}'], lambda t: t == 'TELETRAVAIL', bool)
+        conges = _flags_per_distinct(df[f'type_{period}'], lambda t: t == 'CONGES', bool)
+        rtt = _flags_per_distinct(df[f'detail_{period}'], is_rtt, bool)
+
+        # is_validated() retourne True, False ou None (indéterminé : non compté)
+        validated = _flags_per_distinct(df[f'detail_{period}'], is_validated)
+        v_true = validated == True
+        v_false = validated == False
+
+        flags[f'teletravail_valide_{period}'] = tt & v_true
+        flags[f'teletravail_a_valider_{period}'] = tt & v_false
+        flags[f'conges_valides_{period}'] = conges & ~rtt & v_true
+        flags[f'conges_a_valider_{period}'] = conges & ~rtt & v_false
+        flags[f'rtt_valides_{period}'] = conges & rtt & v_true
+        flags[f'rtt_a_valider_{period}'] = conges & rtt & v_false
+
+    return flags
+
+
+def _leave_rules(df: pd.DataFrame, collab_codes: np.ndarray, nb_collabs: int):
+    """
+    Série de congés la plus longue et total de jours de congés sur la période des règles RH.
+
+    Returns:
+        (jours_consecutifs_max, nb_jours_complets, nb_demi_journees) par collaborateur
+    """
+    start = pd.Timestamp(RULE_START_DATE)
+    end = pd.Timestamp(RULE_END_DATE)
+    nb_days = max((end.normalize() - start.normalize()).days + 1, 0)
+
+    in_period = ((df['date'] >= start) & (df['date'] <= end)).to_numpy()
+    rows = collab_codes[in_period]
+    days = (df['date'][in_period].dt.normalize() - start.normalize()).dt.days.to_numpy()
+
+    ca = _flags_per_distinct(df['type_am'], lambda t: t == 'CONGES', bool)[in_period]
+    cp = _flags_per_distinct(df['type_pm'], lambda t: t == 'CONGES', bool)[in_period]
+    we = (_flags_per_distinct(df['type_am'], lambda t: t == 'JOUR_NON_OUVRE', bool)[in_period]
+          & _flags_per_distinct(df['type_pm'], lambda t: t == 'JOUR_NON_OUVRE', bool)[in_period])
+
+    # Total de la période : 1 par journée de congés, 0,5 par demi-journée
+    full_days = np.bincount(rows[ca & cp], minlength=nb_collabs)
+    half_days = np.bincount(rows[ca ^ cp], minlength=nb_collabs)
+
+    # Matrice des types de jour (jour absent = autre jour)
+    day_types = np.full((nb_collabs, nb_days), DAY_OTHER, dtype=np.int8)
+    day_types[rows, days] = np.where(ca | cp, DAY_CONGES, np.where(we, DAY_WEEKEND, DAY_OTHER))
+
+    # Run-length : jours de congés cumulés, remis à zéro à chaque autre jour
+    cumul = np.cumsum(day_types == DAY_CONGES, axis=1)
+    reset = np.maximum.accumulate(np.where(day_types == DAY_OTHER, cumul, 0), axis=1)
+    max_cons = (cumul - reset).max(axis=1) if nb_days else np.zeros(nb_collabs, dtype=int)
+
+    return max_cons, full_days, half_days
+
+
+def compute_leave_stats(df: pd.DataFrame, collaborators: Optional[List[str]] = None) -> Dict:
+    """
+    Calcule les statistiques de congés de tous les collaborateurs.
+
+    Args:
+        df: DataFrame typé de l'extraction (voir src/dataset)
+        collaborators: Index canonique des collaborateurs (dataset.collaborators),
+                       qui fixe l'ordre du résultat
+
+    Returns:
+        Dictionnaire de statistiques de chaque collaborateur de l'index (ordre de
+        l'index canonique, ou ordre d'apparition sans index)
+    """
+    stats = defaultdict(empty_leave_stats)
+    if df.empty:
+        return stats
+
+    if collaborators is None:
+        collaborators = list(pd.unique(df['collaborateur']))
+    collab_codes = pd.Categorical(df['collaborateur'], categories=collaborators).codes.astype(np.intp)
+    nb_collabs = len(collaborators)
+
+    # Lignes hors de l'index (collaborateur manquant) : ignorées
+    known = collab_codes >= 0
+    if not known.all():
+        df, collab_codes = df[known], collab_codes[known]
+
+    flags = _event_flags(df)
+    counts = {key: np.bincount(collab_codes, weights=flag, minlength=nb_collabs) for key, flag in flags.items()}
+    max_cons, full_days, half_days = _leave_rules(df, collab_codes, nb_collabs)
+
+    has_uid = (df['uid'].fillna('').astype(str) != '').to_numpy()
+    uids = df['uid'][has_uid].groupby(collab_codes[has_uid], sort=False).first()
+
+    # Une entrée par collaborateur de l'index, même sans UID ni événement compté
+    for i, collaborateur in enumerate(collaborators):
+        s = stats[collaborateur]
+        s.update({key: int(counts[key][i]) for key in counts})
+        if i in uids.index:
+            s['uid'] = str(uids[i])
+
+        total = int(full_days[i]) + 0.5 * int(half_days[i]) if half_days[i] else int(full_days[i])
+        s['jours_consecutifs_max'] = int(max_cons[i])
+        s['jours_total_periode'] = total
+        s['regle_10j_consecutifs'] = s['jours_consecutifs_max'] >= RULE_MIN_CONSECUTIVE_DAYS
+        s['regle_20j_total'] = total >= RULE_MIN_TOTAL_DAYS
+
+    return stats
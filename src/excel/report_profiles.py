@@ -0,0 +1,128 @@
+"""
+Profils de rapport Excel
+
+Le rapport complet (Synthèse + feuilles mensuelles + une feuille par
+collaborateur) est long à produire et à ouvrir. Un profil ne génère que les
+feuilles demandées :
+
+- "full"         : rapport complet, un seul classeur
+- "summary"      : feuille Synthèse seule
+- "monthly"      : un classeur par mois (feuille mensuelle)
+- "collaborator" : un classeur par collaborateur (feuille individuelle)
+
+Les packs mensuel et par collaborateur peuvent être restreints à certains mois
+ou collaborateurs. Seules les étapes nécessaires sont calculées : la Synthèse
+seule ne construit pas la matrice des codes de statut, les packs ne calculent
+pas les statistiques de congés.
+"""
+
+import re
+from pathlib import Path
+from typing import List, Optional, Set
+
+from src.config import MOIS_NOMS, EXCEL_BACKEND, EXCEL_INCREMENTAL
+from src.dataset import PlanningDataset
+from src.excel.excel_generator import (
+    analyze_leave_data, create_excel_report, create_summary_sheet, create_monthly_sheets, create_calendar_sheets
+)
+from src.excel.sheet_writer import open_workbook_writer
+from src.excel.status_matrix import StatusMatrix
+from src.logging import get_logger
+
+logger = get_logger()
+
+REPORT_PROFILES = ["full", "summary", "monthly", "collaborator"]
+
+
+def _safe_name(text: str) -> str:
+    """Texte réduit aux caractères sûrs dans un nom de fichier."""
+    return re.sub(r'[^\w\-]+', '_', text).strip('_')
+
+
+def _pack_path(output_file: Path, suffix: str, taken: Optional[Set[str]] = None, uid: str = "") -> Path:
+    """
+    Chemin d'un classeur d'un pack : <rapport>_<suffixe>.xlsx (caractères sûrs uniquement).
+
+    Deux suffixes distincts peuvent donner le même nom une fois nettoyés
+    ("Dupont J." et "Dupont J") : si le nom est déjà pris (`taken`, complété
+    au passage), il est suffixé par l'UID, puis par un compteur.
+    """
+    name = _safe_name(suffix)
+    if taken is not None:
+        candidates = [name] + ([f"{name}_{_safe_name(uid)}"] if _safe_name(uid) else [])
+        name = next((c for c in candidates if c.lower() not in taken), None)
+        counter = 2
+        while name is None:
+            candidate = f"{candidates[-1]}_{counter}"
+            name = candidate if candidate.lower() not in taken else None
+            counter += 1
+        taken.add(name.lower())   # Comparaison sans casse : systèmes de fichiers insensibles à la casse
+    return output_file.with_name(f"{output_file.stem}_{name}{output_file.suffix}")
+
+
+def generate_report(dataset: PlanningDataset, output_file, profile: str = "full",
+                    months: Optional[List[int]] = None, collaborators: Optional[List[str]] = None,
+                    backend: str = EXCEL_BACKEND, incremental: bool = EXCEL_INCREMENTAL) -> List[Path]:
+    """
+    Génère le rapport Excel selon un profil.
+
+    Args:
+        dataset: Jeu de données du planning
+        output_file: Chemin du rapport (base du nom des classeurs des packs)
+        profile: "full", "summary", "monthly" ou "collaborator"
+        months: Mois à générer (feuilles mensuelles, défaut : tous)
+        collaborators: Collaborateurs à générer (feuilles individuelles, défaut : tous)
+        backend: Moteur d'écriture ("streaming" ou "standard")
+        incremental: Ne régénérer que les feuilles modifiées de chaque classeur
+
+    Returns:
+        Chemins des classeurs créés
+    """
+    if profile not in REPORT_PROFILES:
+        raise ValueError(f"Profil de rapport inconnu : {profile} (attendu : {', '.join(REPORT_PROFILES)})")
+
+    output_file = Path(output_file)
+    logger.info(f"Profil de rapport : {profile}")
+
+    if profile == "full":
+        stats = analyze_leave_data(dataset)
+        create_excel_report(stats, dataset, str(output_file), backend, months=months, collaborators=collaborators,
+                            incremental=incremental)
+        return [output_file]
+
+    if profile == "summary":
+        stats = analyze_leave_data(dataset)
+        writer = open_workbook_writer(backend, previous_file=output_file if incremental else None)
+        create_summary_sheet(writer, stats, dataset.collaborators)
+        writer.save(str(output_file))
+        logger.info(f"Fichier Excel créé : {output_file}")
+        return [output_file]
+
+    status = StatusMatrix(dataset)
+    created = []
+
+    if profile == "monthly":
+        for month_num in dataset.months:
+            if months is not None and month_num not in months:
+                continue
+            path = _pack_path(output_file, f"{month_num:02d}_{MOIS_NOMS[month_num - 1]}")
+            writer = open_workbook_writer(backend, previous_file=path if incremental else None)
+            create_monthly_sheets(writer, dataset, status, months=[month_num])
+            writer.save(str(path))
+            created.append(path)
+
+    else:
+        wanted = None if collaborators is None else set(collaborators)
+        taken = set()   # Noms de classeurs déjà attribués : deux collaborateurs n'écrasent jamais le même
+        for collaborateur in dataset.collaborators:
+            if wanted is not None and collaborateur not in wanted:
+                continue
+            uids = dataset.for_collaborator(collaborateur)["uid"]
+            path = _pack_path(output_file, collaborateur, taken, uid=next((u for u in uids if u), ""))
+            writer = open_workbook_writer(backend, previous_file=path if incremental else None)
+            create_calendar_sheets(writer, dataset, status, collaborators=[collaborateur], workers=1)
+            writer.save(str(path))
+            created.append(path)
+
+    logger.info(f"{len(created)} fichiers Excel créés ({profile})")
+    return created
@@ -0,0 +1,457 @@
+"""
+Description des feuilles et moteurs d'écriture du classeur Excel
+
+Les feuilles du rapport ne sont plus construites directement dans un classeur
+openpyxl : chaque feuille est décrite par un `SheetSpec`
+
+- mise en page connue à l'avance : largeurs de colonnes, hauteurs de lignes,
+  fusions, volets figés
+- lignes produites dans l'ordre, à la demande (générateur) :
+  (numéro de ligne, [(colonne, valeur, CellStyle), ...])
+
+puis rendue par l'un des deux moteurs, qui produisent le même fichier :
+
+- `StandardWorkbookWriter` : classeur openpyxl classique, entièrement en mémoire
+- `StreamingWorkbookWriter` : classeur openpyxl `write_only`, chaque ligne est
+  écrite sur disque dès qu'elle est produite (mémoire constante quel que soit
+  le nombre de collaborateurs)
+
+Avec le moteur streaming, une feuille peut aussi être rendue dans un autre
+processus : `write_sheet_data()` y sérialise ses lignes dans un fichier
+temporaire, et `add_sheet_fragment()` l'insère dans le classeur final.
+"""
+
+import os
+import re
+import tempfile
+import zipfile
+from copy import copy
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple, Any, NamedTuple
+from xml.sax.saxutils import escape
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.compat import safe_string
+from openpyxl.styles import Border, Font, PatternFill, Alignment
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.stylesheet import apply_stylesheet
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from src.excel.incremental import PreviousWorkbook, write_sidecar
+from src.logging import get_logger
+from src.metrics import timer, increment
+
+logger = get_logger()
+
+
+class CellStyle(NamedTuple):
+    """
+    Style d'une cellule (None = valeur par défaut d'openpyxl).
+
+    Un style nommé (voir style_registry) n'est résolu qu'une fois par classeur.
+    """
+    font: Optional[Font] = None
+    fill: Optional[PatternFill] = None
+    alignment: Optional[Alignment] = None
+    border: Optional[Border] = None
+    number_format: Optional[str] = None
+    name: Optional[str] = None
+
+
+NO_STYLE = CellStyle()
+
+_STYLE_REF = re.compile(r's="#(\d+)"')
+
+# (colonne, valeur, style) ; valeur None = cellule sans valeur (style seul)
+CellSpec = Tuple[int, Any, CellStyle]
+RowSpec = Tuple[int, List[CellSpec]]
+
+
+class SheetSpec:
+    """
+    Description complète d'une feuille.
+
+    Attributes:
+        title: Nom de la feuille
+        column_widths: {lettre de colonne: largeur}
+        row_heights: {numéro de ligne: hauteur}
+        merges: Plages fusionnées ("A1:AF1")
+        freeze_panes: Cellule des volets figés ("B7")
+        rows: Lignes dans l'ordre croissant (itérable, éventuellement paresseux)
+        content_hash: Empreinte des données de la feuille (régénération incrémentale)
+    """
+
+    def __init__(self, title: str, rows: Iterable[RowSpec] = (), column_widths: Optional[Dict[str, float]] = None,
+                 row_heights: Optional[Dict[int, float]] = None, merges: Optional[List[str]] = None,
+                 freeze_panes: Optional[str] = None, content_hash: Optional[str] = None):
+        self.title = title
+        self.content_hash = content_hash
+        self.rows = rows
+        self.column_widths = column_widths or {}
+        self.row_heights = row_heights or {}
+        self.merges = merges or []
+        self.freeze_panes = freeze_panes
+
+
+def _apply_style(cell, style: CellStyle, resolved: Dict[str, Any]):
+    """
+    Applique un CellStyle à une cellule openpyxl (classique ou write-only).
+
+    `resolved` garde, par nom de style, les indices de style déjà calculés pour
+    ce classeur : les cellules suivantes les reprennent sans re-dédupliquer
+    les objets Font / Fill / Alignment / Border.
+    """
+    if style.name is not None:
+        style_array = resolved.get(style.name)
+        if style_array is not None:
+            cell._style = copy(style_array)
+            return
+
+    if style.font is not None:
+        cell.font = style.font
+    if style.fill is not None:
+        cell.fill = style.fill
+    if style.alignment is not None:
+        cell.alignment = style.alignment
+    if style.border is not None:
+        cell.border = style.border
+    if style.number_format is not None:
+        cell.number_format = style.number_format
+
+    if style.name is not None:
+        resolved[style.name] = copy(cell._style)
+
+
+def _merged_cell_borders(merge: str, start_border: Border) -> Dict[Tuple[int, int], Border]:
+    """
+    Bordures des cellules fusionnées (hors cellule de départ), comme
+    `MergedCellRange.format()` d'openpyxl : chaque côté défini de la cellule de
+    départ est reporté sur le bord correspondant de la plage.
+    """
+    min_col, min_row, max_col, max_row = range_boundaries(merge)
+    borders = {}
+
+    for row in range(min_row, max_row + 1):
+        for col in range(min_col, max_col + 1):
+            if (row, col) == (min_row, min_col):
+                continue
+            border = None
+            for name, on_edge in [('top', row == min_row), ('left', col == min_col),
+                                  ('right', col == max_col), ('bottom', row == max_row)]:
+                side = getattr(start_border, name)
+                if on_edge and side is not None and side.style is not None:
+                    border = (border or DEFAULT_BORDER) + Border(**{name: side})
+            if border is not None:
+                borders[(row, col)] = border
+
+    return borders
+
+
+def _with_merged_cells(spec: SheetSpec) -> Iterator[RowSpec]:
+    """
+    Lignes de la feuille, complétées des cellules fusionnées qui portent une
+    bordure (un classeur write_only ne les crée pas lui-même).
+    """
+    merges_by_start = {}
+    for merge in spec.merges:
+        min_col, min_row, _, _ = range_boundaries(merge)
+        merges_by_start[(min_row, min_col)] = merge
+    merged_borders = {}
+
+    for row_idx, cells in spec.rows:
+        for col, _, style in cells:
+            merge = merges_by_start.get((row_idx, col))
+            if merge and style.border is not None:
+                merged_borders.update(_merged_cell_borders(merge, style.border))
+
+        extra = [(col, None, CellStyle(border=border))
+                 for (r, col), border in merged_borders.items() if r == row_idx]
+        if extra:
+            cells = sorted(cells + extra, key=lambda c: c[0])
+        yield row_idx, cells
+
+
+def _cell_xml(row_idx: int, col: int, value, style_ref: int) -> str:
+    """Élément <c> d'une cellule, tel qu'écrit par openpyxl (chaînes en ligne)."""
+    attrs = f'r="{get_column_letter(col)}{row_idx}" s="#{style_ref}"'
+
+    if value is None:
+        return f'<c {attrs} t="n" />'
+    if isinstance(value, str):
+        if value.startswith('=') and len(value) > 1:
+            return f'<c {attrs}><f>{escape(value[1:])}</f><v /></c>'
+        if value == "":
+            return f'<c {attrs} t="inlineStr" />'
+        space = ' xml:space="preserve"' if value != value.strip() else ''
+        return f'<c {attrs} t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+    if isinstance(value, bool):
+        return f'<c {attrs} t="b"><v>{int(value)}</v></c>'
+    return f'<c {attrs} t="n"><v>{safe_string(value)}</v></c>'
+
+
+def _row_xml(row_idx: int, row_heights: Dict[int, float]) -> str:
+    """Balise ouvrante <row>, avec la hauteur de ligne éventuelle."""
+    height = row_heights.get(row_idx)
+    if height is None:
+        return f'<row r="{row_idx}">'
+    return f'<row r="{row_idx}" ht="{safe_string(height)}" customHeight="1">'
+
+
+def write_sheet_data(spec: SheetSpec, path) -> Tuple[List[CellStyle], int]:
+    """
+    Sérialise les lignes d'une feuille (élément <sheetData>) dans un fichier.
+
+    Utilisé pour rendre des feuilles dans d'autres processus : les styles y
+    sont référencés par un indice local (s="#k"), remplacé par l'indice du
+    classeur final lors de l'assemblage (`StreamingWorkbookWriter.add_sheet_fragment`).
+
+    Returns:
+        (styles utilisés dans l'ordre des indices locaux, nombre de cellules écrites)
+    """
+    styles: List[CellStyle] = []
+    style_refs: Dict[Any, int] = {}
+    nb_cells = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<sheetData>')
+        next_row = 1
+        for row_idx, cells in _with_merged_cells(spec):
+            while next_row < row_idx:
+                f.write(_row_xml(next_row, spec.row_heights) + '</row>')
+                next_row += 1
+            next_row = row_idx + 1
+
+            f.write(_row_xml(row_idx, spec.row_heights))
+            for col, value, style in cells:
+                key = style.name if style.name is not None else style
+                if key not in style_refs:
+                    style_refs[key] = len(styles)
+                    styles.append(style)
+                f.write(_cell_xml(row_idx, col, value, style_refs[key]))
+            nb_cells += len(cells)
+            f.write('</row>')
+        f.write('</sheetData>')
+
+    return styles, nb_cells
+
+
+class StandardWorkbookWriter:
+    """Rendu des SheetSpec dans un classeur openpyxl classique."""
+
+    def __init__(self):
+        self.wb = openpyxl.Workbook()
+        self._first_sheet = True
+        self._resolved_styles = {}
+
+    def _new_sheet(self, title: str):
+        # La première feuille réutilise la feuille active créée avec le classeur
+        if self._first_sheet:
+            self._first_sheet = False
+            ws = self.wb.active
+            ws.title = title
+            return ws
+        return self.wb.create_sheet(title)
+
+    def add_sheet(self, spec: SheetSpec):
+        """Écrit une feuille complète."""
+        with timer("excel.sheet", sheet=spec.title):
+            self._write_sheet(spec)
+
+    def _write_sheet(self, spec: SheetSpec):
+        ws = self._new_sheet(spec.title)
+
+        nb_cells = 0
+        for row_idx, cells in spec.rows:
+            for col, value, style in cells:
+                cell = ws.cell(row=row_idx, column=col, value=value)
+                _apply_style(cell, style, self._resolved_styles)
+            nb_cells += len(cells)
+        increment("excel.cells", nb_cells)
+
+        for merge in spec.merges:
+            ws.merge_cells(merge)
+        for row_idx, height in spec.row_heights.items():
+            ws.row_dimensions[row_idx].height = height
+        for letter, width in spec.column_widths.items():
+            ws.column_dimensions[letter].width = width
+        ws.freeze_panes = spec.freeze_panes
+
+    def save(self, output_file: str):
+        self.wb.save(output_file)
+
+
+class StreamingWorkbookWriter:
+    """
+    Rendu des SheetSpec dans un classeur openpyxl `write_only`.
+
+    La mise en page est posée avant la première ligne, puis chaque ligne est
+    envoyée au flux XML de la feuille dès qu'elle est produite.
+
+    En mode incrémental (`previous_file`), une feuille dont l'empreinte
+    (`SheetSpec.content_hash`) est inchangée est recopiée depuis le classeur
+    précédent au lieu d'être rendue (voir src/excel/incremental.py).
+    """
+
+    def __init__(self, previous_file=None):
+        self.wb = openpyxl.Workbook(write_only=True)
+        self._resolved_styles = {}
+        self._fragments = {}
+        self._fragment_dir = None
+        self._fragment_count = 0
+
+        self._incremental = previous_file is not None
+        self._previous = PreviousWorkbook.load(previous_file) if self._incremental else None
+        self._hashes = {}
+        self._copies = {}
+        if self._previous is not None:
+            # Même table de styles que le classeur précédent : les parties recopiées restent valides
+            apply_stylesheet(self._previous.archive, self.wb)
+
+    def can_reuse(self, title: str, content_hash: Optional[str]) -> bool:
+        """Indique si la feuille peut être recopiée telle quelle depuis le classeur précédent."""
+        return self._previous is not None and self._previous.reusable_part(title, content_hash) is not None
+
+    def _create_sheet(self, spec: SheetSpec, layout: bool = True):
+        ws = self.wb.create_sheet(spec.title)
+        if self._incremental and spec.content_hash is not None:
+            self._hashes[id(ws)] = (ws, spec.content_hash)
+
+        if layout:
+            for letter, width in spec.column_widths.items():
+                ws.column_dimensions[letter].width = width
+            ws.freeze_panes = spec.freeze_panes
+            for merge in spec.merges:
+                ws.merged_cells.add(merge)
+        return ws
+
+    def new_fragment_path(self) -> str:
+        """Chemin d'un fichier temporaire pour le <sheetData> d'une feuille rendue à part."""
+        if self._fragment_dir is None:
+            self._fragment_dir = tempfile.TemporaryDirectory(prefix="excel_fragments_")
+        self._fragment_count += 1
+        return os.path.join(self._fragment_dir.name, f"sheet{self._fragment_count}.xml")
+
+    def add_sheet_fragment(self, spec: SheetSpec, fragment_path: str, styles: List[CellStyle]):
+        """
+        Ajoute une feuille dont les lignes ont été sérialisées par `write_sheet_data()`.
+
+        La mise en page est posée ici ; les lignes sont insérées dans le fichier
+        final à l'enregistrement, avec les indices de style de ce classeur.
+        """
+        ws = self._create_sheet(spec)
+
+        style_ids = []
+        for style in styles:
+            cell = WriteOnlyCell(ws)
+            _apply_style(cell, style, self._resolved_styles)
+            style_ids.append(cell.style_id)
+
+        self._fragments[id(ws)] = (ws, fragment_path, style_ids)
+
+    def add_sheet(self, spec: SheetSpec):
+        """Écrit une feuille complète, ligne par ligne (ou la recopie si elle est inchangée)."""
+        with timer("excel.sheet", sheet=spec.title):
+            self._write_sheet(spec)
+
+    def _write_sheet(self, spec: SheetSpec):
+        if self.can_reuse(spec.title, spec.content_hash):
+            ws = self._create_sheet(spec, layout=False)
+            if ws.title == spec.title:
+                self._copies[id(ws)] = (ws, self._previous.reusable_part(spec.title, spec.content_hash))
+                increment("excel.sheets_reused")
+                return
+            # Titre déjà pris dans ce classeur (renommé par openpyxl) : rendu normal
+            self.wb.remove(ws)
+            self._hashes.pop(id(ws), None)
+
+        ws = self._create_sheet(spec)
+
+        next_row = 1
+        nb_cells = 0
+        for row_idx, cells in _with_merged_cells(spec):
+            while next_row < row_idx:
+                self._append(ws, next_row, [], spec.row_heights)
+                next_row += 1
+            self._append(ws, row_idx, cells, spec.row_heights, self._resolved_styles)
+            nb_cells += len(cells)
+            next_row = row_idx + 1
+        increment("excel.cells", nb_cells)
+
+    @staticmethod
+    def _append(ws, row_idx: int, cells: List[CellSpec], row_heights: Dict[int, float], resolved: Dict = None):
+        if row_idx in row_heights:
+            ws.row_dimensions[row_idx].height = row_heights[row_idx]
+
+        row = []
+        for col, value, style in cells:
+            row.extend([None] * (col - 1 - len(row)))
+            cell = WriteOnlyCell(ws, value=value)
+            _apply_style(cell, style, resolved)
+            row.append(cell)
+        ws.append(row)
+
+    def save(self, output_file: str):
+        self.wb.save(output_file)
+
+        if self._fragments or self._copies:
+            self._splice_parts(output_file)
+        if self._incremental:
+            if self._previous is not None:
+                logger.info(f"Régénération incrémentale : {len(self._copies)} feuilles recopiées, "
+                            f"{len(self.wb.worksheets) - len(self._copies)} régénérées")
+            write_sidecar(output_file, {ws.title: (content_hash, ws.path[1:])
+                                        for ws, content_hash in self._hashes.values()})
+
+        self._fragments = {}
+        self._copies = {}
+        if self._fragment_dir is not None:
+            self._fragment_dir.cleanup()
+            self._fragment_dir = None
+        if self._previous is not None:
+            self._previous.close()
+            self._previous = None
+
+    def _splice_parts(self, output_file: str):
+        """
+        Complète les parties des feuilles rendues à part (<sheetData> vide remplacé
+        par leurs lignes) et des feuilles recopiées depuis le classeur précédent.
+        """
+        fragments = {ws.path[1:]: (path, style_ids) for ws, path, style_ids in self._fragments.values()}
+        copies = {ws.path[1:]: part for ws, part in self._copies.values()}
+        tmp_file = f"{output_file}.tmp"
+
+        with zipfile.ZipFile(output_file) as zin, \
+                zipfile.ZipFile(tmp_file, 'w', compression=zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                if item.filename in copies:
+                    zout.writestr(item.filename, self._previous.read_part(copies[item.filename]))
+                    continue
+                if item.filename not in fragments:
+                    zout.writestr(item, zin.read(item.filename))
+                    continue
+
+                fragment_path, style_ids = fragments[item.filename]
+                head, tail = re.split(r'<sheetData\s*/>|<sheetData>\s*</sheetData>',
+                                      zin.read(item.filename).decode('utf-8'), maxsplit=1)
+
+                with open(fragment_path, encoding='utf-8') as src:
+                    sheet_data = _STYLE_REF.sub(lambda m: f's="{style_ids[int(m.group(1))]}"', src.read())
+                zout.writestr(item.filename, head + sheet_data + tail)
+
+        os.replace(tmp_file, output_file)
+
+
+def open_workbook_writer(backend: str = "standard", previous_file=None):
+    """
+    Crée le moteur d'écriture du classeur.
+
+    Args:
+        backend: "standard" (classeur en mémoire) ou "streaming" (write_only)
+        previous_file: Classeur précédent, pour une régénération incrémentale
+                       (moteur streaming uniquement, ignoré sinon)
+    """
+    if backend == "streaming":
+        return StreamingWorkbookWriter(previous_file)
+    if backend == "standard":
+        return StandardWorkbookWriter()
+    raise ValueError(f"Moteur Excel inconnu : {backend}")
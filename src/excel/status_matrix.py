@@ -0,0 +1,77 @@
+"""
+Matrice des codes de statut (CV, TV-AM, CV/TP, W...) de tout le planning
+
+`get_status_code()` ne dépend que du tuple (type_am, type_pm, detail_am,
+detail_pm), dont il n'existe que quelques dizaines de valeurs distinctes :
+le code est calculé une fois par tuple distinct, puis rangé dans une matrice
+dense
+
+    codes : (collaborateurs × mois 1-12 × jours 1-31)  indice dans `code_table`
+
+que les feuilles mensuelles et les feuilles par collaborateur indexent
+directement. L'indice 0 est le code vide (présent, ou jour sans donnée).
+
+Les totaux journaliers des feuilles mensuelles en découlent en un seul passage :
+poids de chaque code distinct (`count_event_weight()`) × matrice des codes.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.dataset import PlanningDataset
+from src.utils import get_status_code, count_event_weight
+
+STATUS_COLUMNS = ['type_am', 'type_pm', 'detail_am', 'detail_pm']
+
+
+class StatusMatrix:
+    """
+    Codes de statut de chaque (collaborateur, date), calculés une seule fois.
+
+    Exemple:
+        >>> status = StatusMatrix(dataset)
+        >>> status.labels[status.index["Dupont Jean"], 3, 15]
+        'CV'
+    """
+
+    def __init__(self, dataset: PlanningDataset):
+        df = dataset.df
+        self.collaborators = list(dataset.collaborators)
+        self.index = {c: i for i, c in enumerate(self.collaborators)}
+
+        # Un appel à get_status_code() par tuple distinct
+        tuple_ids, distinct = pd.MultiIndex.from_frame(df[STATUS_COLUMNS]).factorize()
+        tuple_codes = [get_status_code(*t) for t in distinct]
+
+        self.code_table: List[str] = [''] + sorted(set(tuple_codes) - {''})
+        code_ids = {code: i for i, code in enumerate(self.code_table)}
+        tuple_to_code = np.array([code_ids[code] for code in tuple_codes], dtype=np.int16)
+
+        collab_idx = df['collaborateur'].map(self.index).to_numpy(dtype=np.intp)
+        months = df['date'].dt.month.to_numpy()
+        days = df['date'].dt.day.to_numpy()
+
+        self.codes = np.zeros((len(self.collaborators), 13, 32), dtype=np.int16)
+        self.codes[collab_idx, months, days] = tuple_to_code[tuple_ids]
+
+        self.labels = np.array(self.code_table, dtype=object)[self.codes]
+
+    def month_totals(self, month: int, prefix_groups: List[Optional[List[str]]]) -> np.ndarray:
+        """
+        Totaux journaliers d'un mois, tous collaborateurs confondus.
+
+        Args:
+            month: Mois (1-12)
+            prefix_groups: Groupes de préfixes à compter (None = tous les événements),
+                           ex: [None, ["TV", "TP"], ["CV", "CP"], ["RV", "RP"]]
+
+        Returns:
+            Tableau (groupes × jours 0-31) des totaux en jours (colonne 0 inutilisée)
+        """
+        weights = np.array([
+            [count_event_weight(code, prefixes) for code in self.code_table]
+            for prefixes in prefix_groups
+        ], dtype=float)
+        return weights[:, self.codes[:, month, :]].sum(axis=1)
@@ -0,0 +1,140 @@
+"""
+Registre des styles de cellule du rapport Excel
+
+Chaque style est défini une seule fois, avec des objets Font / PatternFill /
+Alignment / Border partagés, et porte un nom. Les moteurs d'écriture
+(`sheet_writer`) résolvent un style nommé une seule fois par classeur, puis
+le réutilisent tel quel pour toutes les cellules qui le portent, au lieu de
+recréer et re-dédupliquer les mêmes objets à chaque cellule.
+
+Les styles de statut sont indexés par (code, ligne paire).
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+
+from src.config import (
+    HEADER_FILL, HEADER_FONT, NAME_FILL, TOTAL_FILL, SUBHEADER_FILL,
+    GREEN_FILL, RED_FILL, MONTH_FILL, TV_FILL, TP_FILL, CV_FILL, CP_FILL,
+    RV_FILL, RP_FILL, WE_FILL, MIXED_FILL, INEX_FILL,
+    BORDER, BORDER_DIAG
+)
+from src.excel.sheet_writer import CellStyle
+
+# ============================================================
+# ALIGNEMENTS
+# ============================================================
+
+CENTER = Alignment(horizontal='center', vertical='center')
+CENTER_WRAP = Alignment(horizontal='center', vertical='center', wrap_text=True)
+LEFT = Alignment(horizontal='left', vertical='center')
+LEFT_WRAP = Alignment(horizontal='left', vertical='center', wrap_text=True)
+RIGHT = Alignment(horizontal='right', vertical='center')
+
+# ============================================================
+# TITRE ET LÉGENDE
+# ============================================================
+
+TITLE = CellStyle(font=Font(bold=True, size=14, color="FFFFFF"), fill=HEADER_FILL, alignment=CENTER, name="titre")
+LEGEND_LABEL = CellStyle(font=Font(bold=True, size=10), alignment=CENTER, name="légende")
+
+# ============================================================
+# EN-TÊTES
+# ============================================================
+
+HEADER = CellStyle(font=HEADER_FONT, fill=HEADER_FILL, alignment=CENTER, border=BORDER, name="en-tête")
+HEADER_EMPTY = CellStyle(fill=HEADER_FILL, border=BORDER, name="en-tête vide")
+HEADER_WEEKDAY = CellStyle(font=Font(size=8, bold=True, color="FFFFFF"), fill=HEADER_FILL, alignment=CENTER,
+                           border=BORDER, name="en-tête jour semaine")
+SUMMARY_HEADER = CellStyle(font=Font(bold=True, color="FFFFFF", size=11), fill=HEADER_FILL, alignment=CENTER_WRAP,
+                           border=BORDER, name="en-tête synthèse")
+
+# ============================================================
+# FEUILLE SYNTHÈSE
+# ============================================================
+
+SUMMARY_TEXT = CellStyle(alignment=LEFT, border=BORDER, name="synthèse texte")
+SUMMARY_VALUE = CellStyle(alignment=RIGHT, border=BORDER, name="synthèse valeur")
+SUMMARY_NUMBER = CellStyle(alignment=RIGHT, border=BORDER, number_format='0.0', name="synthèse nombre")
+RULE_OK = CellStyle(font=Font(bold=True, size=14), fill=GREEN_FILL, alignment=CENTER, border=BORDER, name="règle ok")
+RULE_KO = CellStyle(font=Font(bold=True, size=14), fill=RED_FILL, alignment=CENTER, border=BORDER, name="règle ko")
+SUMMARY_TOTAL_LABEL = CellStyle(font=Font(bold=True), fill=SUBHEADER_FILL, border=BORDER, name="synthèse total libellé")
+SUMMARY_TOTAL_EMPTY = CellStyle(fill=SUBHEADER_FILL, border=BORDER, name="synthèse total vide")
+SUMMARY_TOTAL_SUM = CellStyle(font=Font(bold=True), fill=SUBHEADER_FILL, alignment=RIGHT, border=BORDER,
+                              number_format='0.0', name="synthèse total somme")
+SUMMARY_TOTAL_RULE = CellStyle(font=Font(bold=True), fill=SUBHEADER_FILL, alignment=CENTER, border=BORDER,
+                               name="synthèse total règle")
+NOTE = CellStyle(font=Font(size=9, italic=True), alignment=LEFT_WRAP, name="note")
+
+# ============================================================
+# FEUILLES MENSUELLES ET INDIVIDUELLES
+# ============================================================
+
+NAME_EVEN = CellStyle(font=Font(size=9, bold=True), fill=NAME_FILL, alignment=LEFT, border=BORDER, name="nom pair")
+NAME_ODD = CellStyle(font=Font(size=9, bold=True), fill=PatternFill(), alignment=LEFT, border=BORDER, name="nom impair")
+SEPARATOR = CellStyle(border=Border(bottom=Side(style='medium')), name="séparateur")
+EXPLANATION = CellStyle(font=Font(size=9, italic=True), alignment=LEFT,
+                        fill=PatternFill(start_color="FFF9E6", end_color="FFF9E6", fill_type="solid"),
+                        name="explication")
+MONTH = CellStyle(font=Font(bold=True, size=10), fill=MONTH_FILL, alignment=CENTER, border=BORDER, name="mois")
+MISSING_DAY = CellStyle(fill=INEX_FILL, border=BORDER_DIAG, name="jour inexistant")
+
+_STATUS_FONT = Font(size=7, bold=True)
+_WEEKEND_FONT = Font(size=7, color="999999")
+
+
+@lru_cache(maxsize=None)
+def legend_style(fill: PatternFill, font_color: str) -> CellStyle:
+    """Style d'un élément de légende (couleur du code, texte blanc ou noir)."""
+    return CellStyle(font=Font(bold=True, size=8, color=font_color), fill=fill, alignment=CENTER_WRAP,
+                     border=BORDER, name=f"légende {fill.fgColor.rgb} {font_color}")
+
+
+@lru_cache(maxsize=None)
+def status_style(code: str, is_even_row: bool = False) -> CellStyle:
+    """Style d'une cellule de statut, selon le code et la parité de la ligne."""
+    font = _STATUS_FONT
+    fill = None
+
+    if code == 'W':
+        fill = WE_FILL
+        font = _WEEKEND_FONT
+    elif '/' in code and 'W' not in code:
+        fill = MIXED_FILL
+    elif code.startswith('TV'):
+        fill = TV_FILL
+    elif code.startswith('TP'):
+        fill = TP_FILL
+    elif code.startswith('CV'):
+        fill = CV_FILL
+    elif code.startswith('CP'):
+        fill = CP_FILL
+    elif code.startswith('RV'):
+        fill = RV_FILL
+    elif code.startswith('RP'):
+        fill = RP_FILL
+    elif code == '' and is_even_row:
+        return _EMPTY_STATUS_EVEN
+
+    return CellStyle(font=font, fill=fill, alignment=CENTER, border=BORDER, name=f"statut {code or 'vide'}")
+
+
+_EMPTY_STATUS_EVEN = CellStyle(font=_STATUS_FONT, fill=NAME_FILL, alignment=CENTER, border=BORDER,
+                               name="statut vide pair")
+
+
+@lru_cache(maxsize=None)
+def total_label_style(is_main: bool) -> CellStyle:
+    """Libellé d'une ligne de totaux (TOTAL en gras, sous-totaux en italique)."""
+    return CellStyle(font=Font(bold=is_main, size=9, italic=not is_main), fill=TOTAL_FILL, alignment=LEFT,
+                     border=BORDER, name="total libellé" if is_main else "sous-total libellé")
+
+
+@lru_cache(maxsize=None)
+def total_day_style(is_main: bool, number_format: Optional[str]) -> CellStyle:
+    """Total journalier d'une ligne de totaux (format '0', '0.0' ou aucun si vide)."""
+    return CellStyle(font=Font(bold=is_main, size=9), fill=TOTAL_FILL, alignment=CENTER, border=BORDER,
+                     number_format=number_format,
+                     name=f"{'total' if is_main else 'sous-total'} jour {number_format or 'vide'}")
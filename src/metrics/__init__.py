@@ -0,0 +1,11 @@
+"""Module de mesures du pipeline (durées et compteurs)"""
+
+from .metrics import (
+    timer, record_time, increment, reset_metrics, get_metrics,
+    format_metrics_summary, log_metrics_summary, write_metrics_report
+)
+
+__all__ = [
+    'timer', 'record_time', 'increment', 'reset_metrics', 'get_metrics',
+    'format_metrics_summary', 'log_metrics_summary', 'write_metrics_report',
+]
@@ -0,0 +1,180 @@
+"""
+Module de mesures du pipeline (durées et compteurs)
+
+Les étapes du scraping et de la génération Excel rapportent ici leurs durées
+(par mois, par ligne collaborateur, par attente de navigation, par feuille
+Excel) et leurs compteurs (appels Playwright, événements lus, écarts de
+validation, cellules écrites). Chaque mesure porte un nom et des étiquettes
+optionnelles (mois, feuille...) ; seules des agrégats sont conservés
+(nombre, total, minimum, maximum), la mémoire reste donc constante.
+
+En fin d'exécution, `scripts/main.py` affiche un tableau récapitulatif et
+écrit le rapport complet en JSON (OUTPUT_METRICS).
+
+Utilisation :
+    from src.metrics import timer, increment
+
+    with timer("scrape.month", month=3):
+        ...
+    increment("scrape.events", len(events))
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.config import METRICS_ENABLED
+from src.logging import get_logger
+
+logger = get_logger()
+
+_lock = threading.Lock()
+_timers: Dict[Tuple[str, Tuple], List[float]] = {}   # (nom, étiquettes) -> [nombre, total, min, max]
+_counters: Dict[Tuple[str, Tuple], float] = {}
+
+
+def _key(name: str, labels: Dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def record_time(name: str, seconds: float, **labels):
+    """
+    Enregistre une durée.
+
+    Args:
+        name: Nom de la mesure (ex: "excel.sheet")
+        seconds: Durée en secondes
+        labels: Étiquettes (ex: sheet="Janvier")
+    """
+    if not METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        agg = _timers.get(key)
+        if agg is None:
+            _timers[key] = [1, seconds, seconds, seconds]
+        else:
+            agg[0] += 1
+            agg[1] += seconds
+            agg[2] = min(agg[2], seconds)
+            agg[3] = max(agg[3], seconds)
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Mesure la durée du bloc (enregistrée même si le bloc lève une exception)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(name, time.perf_counter() - started, **labels)
+
+
+def increment(name: str, amount: float = 1, **labels):
+    """
+    Incrémente un compteur.
+
+    Args:
+        name: Nom du compteur (ex: "playwright.calls")
+        amount: Valeur ajoutée
+        labels: Étiquettes (ex: month=3)
+    """
+    if not METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def reset_metrics():
+    """Efface toutes les mesures."""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def get_metrics() -> Dict:
+    """
+    Retourne toutes les mesures.
+
+    Returns:
+        {"timers": [{name, labels, count, total_s, min_s, max_s}], "counters": [{name, labels, value}]}
+    """
+    with _lock:
+        timers = [
+            {"name": name, "labels": dict(labels), "count": count,
+             "total_s": round(total, 4), "min_s": round(low, 4), "max_s": round(high, 4)}
+            for (name, labels), (count, total, low, high) in sorted(_timers.items())
+        ]
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+    return {"timers": timers, "counters": counters}
+
+
+def _format_labels(labels: Dict) -> str:
+    return ", ".join(f"{k}={v}" for k, v in labels.items())
+
+
+def format_metrics_summary() -> List[str]:
+    """
+    Tableau récapitulatif : une ligne par mesure, toutes étiquettes confondues.
+
+    Pour les durées, l'étiquette de la série la plus lente est indiquée.
+    """
+    metrics = get_metrics()
+
+    by_name = {}
+    for t in metrics["timers"]:
+        agg = by_name.setdefault(t["name"], {"count": 0, "total_s": 0.0, "max_s": 0.0, "slowest": {}})
+        agg["count"] += t["count"]
+        agg["total_s"] += t["total_s"]
+        if t["max_s"] >= agg["max_s"]:
+            agg["max_s"], agg["slowest"] = t["max_s"], t["labels"]
+
+    lines = [f"{'Durées':<28} {'nombre':>8} {'total (s)':>10} {'moy. (ms)':>10} {'max (ms)':>10}  série la plus lente"]
+    for name, agg in by_name.items():
+        mean_ms = agg["total_s"] / agg["count"] * 1000
+        lines.append(f"{name:<28} {agg['count']:>8} {agg['total_s']:>10.2f} {mean_ms:>10.1f} "
+                     f"{agg['max_s'] * 1000:>10.1f}  {_format_labels(agg['slowest'])}")
+
+    counters = {}
+    for c in metrics["counters"]:
+        counters[c["name"]] = counters.get(c["name"], 0) + c["value"]
+
+    lines.append(f"{'Compteurs':<28} {'valeur':>8}")
+    for name, value in counters.items():
+        lines.append(f"{name:<28} {value:>8g}")
+    return lines
+
+
+def log_metrics_summary():
+    """Journalise le tableau récapitulatif des mesures."""
+    if not METRICS_ENABLED:
+        return
+    logger.info("Mesures du pipeline :")
+    for line in format_metrics_summary():
+        logger.info(f"  {line}")
+
+
+def write_metrics_report(path) -> Path:
+    """
+    Écrit le rapport JSON complet des mesures (toutes séries, avec étiquettes).
+
+    Args:
+        path: Chemin du fichier JSON
+
+    Returns:
+        Chemin du fichier écrit
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"generated_at": datetime.now().isoformat(timespec="seconds"), **get_metrics()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    return path
@@ -1,5 +1,13 @@
 """Module de scraping des données DailyRH"""
 
 from .scraper import scrape_all_months
+from .network_source import replay_all_months
+from .parallel import scrape_all_months_parallel
+from .async_scraper import scrape_all_months_async
 
-__all__ = ['scrape_all_months']
+__all__ = [
+    'scrape_all_months',
+    'replay_all_months',
+    'scrape_all_months_parallel',
+    'scrape_all_months_async',
+]
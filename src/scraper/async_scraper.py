@@ -0,0 +1,395 @@
+"""
+Moteur de scraping asynchrone (playwright.async_api)
+
+Variante asynchrone de `scrape_month` / `scrape_all_months`. Les requêtes
+indépendantes sur le DOM (noms, data-corp-id, listes d'événements, totaux,
+jours non ouvrés) sont lancées simultanément avec `asyncio.gather` au lieu
+d'être attendues une par une.
+
+Les records produits sont identiques à ceux du moteur synchrone : toute la
+logique métier (chevauchements, demi-journées, priorités) est réutilisée
+depuis `src/scraper/scraper.py`, de même que la boucle des mois (`MonthLoop` :
+navigation, mesures, checkpoints, registre de l'effectif), le cache des mois et
+l'enregistrement des instantanés (RECORD_SNAPSHOTS). Seule la source "dom" est
+prise en charge : toute autre DATA_SOURCE est refusée (`check_async_config()`).
+
+`scrape_all_months_async()` est un point d'entrée synchrone utilisable
+directement depuis `scripts/main.py`.
+"""
+
+import asyncio
+import calendar
+from datetime import date
+from typing import List, Dict, Optional, Set, Tuple
+
+from playwright.async_api import Page, async_playwright
+
+from src.config import (
+    SESSION_FILE, DAILYRH_URL, HEADLESS_MODE, INITIAL_LOAD_TIMEOUT,
+    MAX_NAVIGATION_CLICKS, BULK_EXTRACTION, SCRAPING_CONCURRENCY, MOIS_NOMS, DIRECT_NAVIGATION,
+    MONTH_CACHE_ENABLED, DATA_SOURCE, CHECKPOINT_DIR
+)
+from src.utils import parse_month_year_text
+from src.logging import get_logger
+from src.metrics import increment
+from src.scraper.snapshot import SNAPSHOT_JS
+from src.scraper.scraper import (
+    compute_events_from_geometry, non_working_days_from_classes, totals_from_cells,
+    log_totals_validation, records_from_snapshot, read_cached_month, MonthLoop, merge_month_results,
+    JUMP_TO_MONTH_JS
+)
+from src.scraper.roster import ROSTER_JS, RosterEntry, parse_roster
+from src.scraper.planning_grid import MonthPlanningGrid
+from src.scraper.parallel import split_months
+from src.scraper.cache import MonthCache, FINGERPRINT_JS
+from src.scraper.waits import (
+    watch_planning_requests, async_wait_for_planning_ready, log_wait_summary, reset_wait_timings
+)
+from src.scraper.tracing import traced
+
+logger = get_logger()
+
+
+async def async_extract_non_working_days(page: Page, year: int, month: int) -> Set[int]:
+    """Version asynchrone de extract_non_working_days()."""
+    timespans = page.locator("div.dhx_marked_timespan.grey_cell_weekend")
+    count = await timespans.count()
+    css_classes = await asyncio.gather(*[
+        timespans.nth(i).get_attribute("class") for i in range(count)
+    ])
+    return non_working_days_from_classes([c or "" for c in css_classes], year, month)
+
+
+async def async_extract_dailyrh_totals(page: Page, year: int, month: int) -> Dict[str, float]:
+    """Version asynchrone de extract_dailyrh_totals()."""
+    total_cells = page.locator("td.teamTotal_cell")
+    count = await total_cells.count()
+
+    async def read_cell(cell):
+        css_class = await cell.get_attribute("class") or ""
+        if f"{year}-{month:02d}-" not in css_class:
+            return {"class": css_class, "text": None}
+        try:
+            text = await cell.inner_text()
+        except:
+            text = None
+        return {"class": css_class, "text": text}
+
+    cells = await asyncio.gather(*[read_cell(total_cells.nth(i)) for i in range(count)])
+    return totals_from_cells(list(cells), year, month)
+
+
+async def async_extract_collaborator_events(row, nb_days: int) -> List[Dict]:
+    """Version asynchrone de extract_collaborator_events()."""
+    matrix_div = row.locator(".dhx_matrix_line").first
+    cells = row.locator("td.dhx_matrix_cell")
+    events_normal = matrix_div.locator(
+        "div[class*='cell']:not(.dhx_marked_timespan), "
+        "div[class*='event']:not(.dhx_marked_timespan)"
+    )
+
+    cell_count, event_count = await asyncio.gather(cells.count(), events_normal.count())
+
+    async def read_event(ev):
+        css_class, title, box = await asyncio.gather(
+            ev.get_attribute("class"), ev.get_attribute("title"), ev.bounding_box()
+        )
+        return {"class": css_class or "", "title": title or "", "box": box}
+
+    day_boxes, raw_events = await asyncio.gather(
+        asyncio.gather(*[cells.nth(i).bounding_box() for i in range(min(nb_days, cell_count))]),
+        asyncio.gather(*[read_event(events_normal.nth(i)) for i in range(event_count)]),
+    )
+
+    return compute_events_from_geometry(list(day_boxes), list(raw_events))
+
+
+async def _scrape_row(row, entry: RosterEntry, nb_days: int) -> Optional[Tuple[str, str, List[Dict]]]:
+    """Extrait (nom, uid, événements) d'une ligne collaborateur (None en cas d'erreur)."""
+    try:
+        await row.locator(".dhx_matrix_line").first.wait_for(state="attached", timeout=10000)
+        events = await async_extract_collaborator_events(row, nb_days)
+    except Exception as e:
+        logger.error(f"Erreur extraction événements pour {entry.name}: {e}")
+        return None
+
+    return entry.name, entry.uid, events
+
+
+async def async_scrape_month(page: Page, year: int, month: int, bulk: bool = BULK_EXTRACTION) -> List[Dict]:
+    """
+    Version asynchrone de scrape_month().
+
+    Args:
+        page: Page Playwright (async) positionnée sur le mois
+        year: Année
+        month: Mois (1-12)
+        bulk: True = un seul page.evaluate par mois (snapshot)
+
+    Returns:
+        Liste des records du mois
+    """
+    await page.wait_for_selector("tr.dhx_row_item", timeout=15000)
+
+    if bulk:
+        return records_from_snapshot(await page.evaluate(SNAPSHOT_JS), year, month)
+
+    month_start = date(year, month, 1)
+    nb_days = calendar.monthrange(year, month)[1]
+
+    logger.info(f"Traitement du mois : {month_start.strftime('%B %Y')}")
+
+    # Effectif (index de ligne, nom, UID) en une seule requête, pseudo-lignes écartées
+    roster = parse_roster(await page.evaluate(ROSTER_JS))
+
+    if not roster:
+        logger.warning(f"Aucune ligne détectée pour {month_start.strftime('%B %Y')}")
+        return []
+
+    logger.info(f"Nombre de collaborateurs : {len(roster)}")
+
+    # Jours non ouvrés et totaux sont indépendants des lignes : lancés ensemble
+    jno_task = asyncio.ensure_future(async_extract_non_working_days(page, year, month))
+    totals_task = asyncio.ensure_future(async_extract_dailyrh_totals(page, year, month))
+
+    try:
+        jno_day_indices = await jno_task
+        logger.info(f"Jours non ouvrés : {len(jno_day_indices)} jours")
+
+        rows = page.locator("tr.dhx_row_item")
+        rows_events = await asyncio.gather(*[_scrape_row(rows.nth(entry.index), entry, nb_days) for entry in roster])
+
+        grid = MonthPlanningGrid(year, month)
+        for row_events in rows_events:
+            if row_events is None:
+                continue
+            name, uid, events = row_events
+            try:
+                grid.add_collaborator(name, uid, events)
+            except Exception as e:
+                logger.error(f"Erreur application planning pour {name}: {e}")
+                continue
+            increment("scrape.events", len(events), month=month)
+            logger.debug(f"Traité : {name} ({uid})")
+
+        grid.set_non_working_days(jno_day_indices)
+
+        logger.info(f"Lignes extraites : {len(grid)}")
+
+        try:
+            dailyrh_totals = await totals_task
+            log_totals_validation(dailyrh_totals, grid.iter_records(), jno_day_indices, year, month)
+        except Exception as e:
+            logger.error(f"Erreur lors de la validation des totaux : {e}")
+
+        return grid.to_records()
+    finally:
+        # Une erreur avant la validation ne doit pas laisser la lecture des totaux en suspens
+        totals_task.cancel()
+        await asyncio.gather(jno_task, totals_task, return_exceptions=True)
+
+
+async def async_scrape_month_cached(page: Page, year: int, month: int, cache: Optional[MonthCache]) -> List[Dict]:
+    """Version asynchrone de scrape_month_cached()."""
+    if cache is None:
+        return await async_scrape_month(page, year, month)
+
+    await page.wait_for_selector("tr.dhx_row_item", timeout=15000)
+    fingerprint = await page.evaluate(FINGERPRINT_JS)
+    records = read_cached_month(cache, year, month, fingerprint)
+    if records is not None:
+        return records
+
+    records = await async_scrape_month(page, year, month)
+    if records:
+        cache.save(year, month, fingerprint, records)
+    return records
+
+
+async def async_get_current_month_text(page: Page) -> str:
+    """Version asynchrone de get_current_month_text()."""
+    try:
+        date_elem = page.locator("#date_now")
+        await date_elem.wait_for(state="attached", timeout=15000)
+        text = await date_elem.text_content(timeout=5000)
+
+        if text and text.strip():
+            return text.strip()
+
+        raise RuntimeError("Le texte de #date_now est vide")
+
+    except Exception as e:
+        raise RuntimeError(f"Impossible de trouver le texte du mois (#date_now) : {e}")
+
+
+async def async_navigate_to_month(page: Page, year: int, month: int):
+    """Version asynchrone de navigate_to_month()."""
+    current_text = await async_get_current_month_text(page)
+    current_month, current_year = parse_month_year_text(current_text)
+
+    logger.info(f"Navigation vers {MOIS_NOMS[month - 1].lower()} {year}")
+
+    if current_month is None or current_year is None:
+        raise RuntimeError(f"Impossible de parser le mois actuel : {current_text}")
+
+    if (current_month, current_year) == (month, year):
+        return
+
+    if DIRECT_NAVIGATION:
+        try:
+            if await page.evaluate(JUMP_TO_MONTH_JS, [year, month]):
+                await async_wait_for_planning_ready(page, current_text, label="saut direct")
+                current_text = await async_get_current_month_text(page)
+                current_month, current_year = parse_month_year_text(current_text)
+                if (current_month, current_year) == (month, year):
+                    logger.info("Navigation réussie par saut direct")
+                    return
+        except Exception as e:
+            logger.warning(f"Échec du saut direct vers {month:02d}/{year} : {e}")
+            current_text = await async_get_current_month_text(page)
+            current_month, current_year = parse_month_year_text(current_text)
+
+    clicks = 0
+    while (current_month != month or current_year != year) and clicks < MAX_NAVIGATION_CLICKS:
+        if current_year > year or (current_year == year and current_month > month):
+            await page.locator("div.dhx_cal_prev_button.prev-month").first.click()
+        else:
+            await page.locator("div.dhx_cal_next_button.next-month").first.click()
+
+        await async_wait_for_planning_ready(page, current_text)
+
+        current_text = await async_get_current_month_text(page)
+        current_month, current_year = parse_month_year_text(current_text)
+        clicks += 1
+
+    if clicks >= MAX_NAVIGATION_CLICKS:
+        raise RuntimeError(f"Impossible d'atteindre {MOIS_NOMS[month - 1].lower()} {year} après {clicks} clics")
+
+    logger.info(f"Navigation réussie en {clicks} clics")
+
+
+async def async_go_to_next_month(page: Page):
+    """Version asynchrone de go_to_next_month()."""
+    previous_text = await async_get_current_month_text(page)
+    await page.locator("div.dhx_cal_next_button.next-month").first.click()
+    await async_wait_for_planning_ready(page, previous_text)
+
+
+async def _async_scrape_block(browser, year: int, months: List[int], use_cache: bool = MONTH_CACHE_ENABLED,
+                              checkpoint_dir=CHECKPOINT_DIR, roster=None) -> Dict[int, List[Dict]]:
+    """
+    Scrape un bloc de mois consécutifs dans un contexte dédié du navigateur.
+
+    Même boucle que scrape_months_on_page() (MonthLoop) ; les mois déjà extraits
+    sont conservés si le bloc s'interrompt.
+    """
+    loop = MonthLoop(year, months, checkpoint_dir, roster=roster)
+    cache = MonthCache() if use_cache else None
+    context = await browser.new_context(storage_state=str(SESSION_FILE))
+    try:
+        page = traced(await context.new_page())
+        watch_planning_requests(page)
+        await page.goto(DAILYRH_URL)
+        await page.wait_for_load_state("networkidle")
+        await async_wait_for_planning_ready(page, label="chargement initial", timeout=INITIAL_LOAD_TIMEOUT)
+
+        for month in months:
+            with loop.month(month):
+                step = loop.navigation(month)
+                try:
+                    if step == "next":
+                        await async_go_to_next_month(page)
+                    elif step == "jump":
+                        await async_navigate_to_month(page, year, month)
+                except Exception as e:
+                    loop.navigation_failed(month, e)
+                    break
+
+                try:
+                    records = await async_scrape_month_cached(page, year, month, cache)
+                except Exception as e:
+                    loop.month_failed(month, e)
+                    continue
+
+                loop.month_done(month, records)
+    except Exception as e:
+        logger.error(f"Arrêt du bloc {MOIS_NOMS[months[0] - 1]}-{MOIS_NOMS[months[-1] - 1]} : {e}")
+    finally:
+        await context.close()
+
+    return loop.results
+
+
+def check_async_config():
+    """
+    Vérifie que la configuration est prise en charge par le moteur asynchrone.
+
+    Raises:
+        ValueError: Source de données autre que "dom" (la capture des réponses
+                    réseau n'existe que sur le moteur synchrone)
+    """
+    if DATA_SOURCE != "dom":
+        raise ValueError(f"Moteur asynchrone incompatible avec DATA_SOURCE = \"{DATA_SOURCE}\" "
+                         f"(utiliser SCRAPER_ENGINE = \"sync\")")
+
+
+async def async_scrape_all_months(year: int, months: Optional[List[int]] = None,
+                                  max_contexts: int = SCRAPING_CONCURRENCY, use_cache: bool = MONTH_CACHE_ENABLED,
+                                  checkpoint_dir=CHECKPOINT_DIR, roster=None) -> List[Dict]:
+    """
+    Version asynchrone de scrape_all_months().
+
+    Un seul navigateur est lancé ; les mois sont répartis en blocs consécutifs
+    sur `max_contexts` contextes (même SESSION_FILE) scrapés simultanément.
+
+    Args:
+        year: Année à scraper
+        months: Mois à scraper (par défaut janvier à décembre)
+        max_contexts: Nombre maximum de contextes simultanés
+        use_cache: Relire les mois inchangés depuis le cache
+        checkpoint_dir: Répertoire des checkpoints mensuels
+        roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel)
+
+    Returns:
+        Liste de tous les records, dans l'ordre des mois
+
+    Raises:
+        ValueError: Configuration non prise en charge (voir check_async_config())
+        RuntimeError: Si un mois n'a pas pu être extrait (bloc en échec)
+    """
+    check_async_config()
+    months = sorted(months or range(1, 13))
+    results = {}
+    reset_wait_timings()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=HEADLESS_MODE)
+        try:
+            blocks_results = await asyncio.gather(*[
+                _async_scrape_block(browser, year, block, use_cache, checkpoint_dir, roster)
+                for block in split_months(months, max_contexts)
+            ])
+        finally:
+            await browser.close()
+
+    for block_results in blocks_results:
+        results.update(block_results)
+
+    all_records = merge_month_results(year, months, results)
+    log_wait_summary()
+    return all_records
+
+
+def scrape_all_months_async(year: int, months: Optional[List[int]] = None, roster=None) -> List[Dict]:
+    """
+    Point d'entrée synchrone du moteur asynchrone (pour scripts/main.py).
+
+    Args:
+        year: Année à scraper
+        months: Mois à scraper (par défaut janvier à décembre)
+        roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel)
+
+    Returns:
+        Liste de tous les records
+    """
+    return asyncio.run(async_scrape_all_months(year, months, roster=roster))
@@ -0,0 +1,147 @@
+"""
+Cache disque des mois scrapés, invalidé par empreinte de contenu
+
+Les mois passés ne changent presque jamais : chaque mois scrapé est stocké
+dans CACHE_DIR avec une empreinte du planning affiché, calculée dans la page
+en un seul `page.evaluate` (noms, data-corp-id, classes / titres / positions
+des événements, jours non ouvrés, totaux teamTotal_cell).
+
+Au scraping suivant, si l'empreinte du mois affiché est identique, les records
+sont relus depuis le cache et l'extraction ligne par ligne est sautée.
+
+Clé du cache : (année, mois, équipe) -> CACHE_DIR/<équipe>_<année>_<mois>.json
+
+Une entrée n'est relue que si elle a été écrite avec la même version du code
+d'extraction (CACHE_VERSION) : une empreinte identique ne suffit pas quand le
+parseur ou le format des records a changé depuis.
+"""
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from src.config import CACHE_DIR, CACHE_TEAM_KEY
+from src.logging import get_logger
+
+logger = get_logger()
+
+# À incrémenter à chaque changement de l'extraction (parseur, géométrie, format
+# des records) : invalide toutes les entrées du cache
+CACHE_VERSION = 1
+
+
+# Empreinte du planning affiché : chaîne compacte hachée côté page (cyrb53)
+FINGERPRINT_JS = """
+() => {
+    const parts = [];
+    const dateElem = document.querySelector("#date_now");
+    parts.push(dateElem ? dateElem.textContent : "");
+
+    document.querySelectorAll("tr.dhx_row_item").forEach((row) => {
+        const nameCell = row.querySelector("td.dhx_matrix_scell");
+        const corpElem = row.querySelector("[data-corp-id]");
+        parts.push(
+            "R", nameCell ? nameCell.innerText : "",
+            corpElem ? corpElem.getAttribute("data-corp-id") : "",
+            row.querySelectorAll("td.dhx_matrix_cell").length
+        );
+        row.querySelectorAll(".dhx_matrix_line div[class*='cell'], .dhx_matrix_line div[class*='event']")
+            .forEach((ev) => {
+                parts.push(ev.getAttribute("class"), ev.getAttribute("title"), ev.offsetLeft, ev.offsetWidth);
+            });
+    });
+    document.querySelectorAll("div.dhx_marked_timespan.grey_cell_weekend")
+        .forEach((el) => parts.push(el.getAttribute("class")));
+    document.querySelectorAll("td.teamTotal_cell")
+        .forEach((cell) => parts.push(cell.getAttribute("class"), cell.innerText));
+
+    const str = parts.join("\\u001f");
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < str.length; i++) {
+        const ch = str.charCodeAt(i);
+        h1 = Math.imul(h1 ^ ch, 2654435761);
+        h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (h2 >>> 0).toString(16).padStart(8, "0") + (h1 >>> 0).toString(16).padStart(8, "0")
+        + "-" + str.length.toString(16);
+}
+"""
+
+
+def take_month_fingerprint(page) -> str:
+    """
+    Calcule l'empreinte du mois affiché (un seul aller-retour Playwright).
+
+    Args:
+        page: Page Playwright positionnée sur le mois
+
+    Returns:
+        Empreinte hexadécimale du contenu du planning
+    """
+    page.wait_for_selector("tr.dhx_row_item", timeout=15000)
+    return page.evaluate(FINGERPRINT_JS)
+
+
+class MonthCache:
+    """
+    Cache disque des records par (année, mois, équipe).
+
+    Exemple:
+        >>> cache = MonthCache()
+        >>> records = cache.load(2026, 3, fingerprint)
+        >>> if records is None:
+        ...     records = scrape_month(page, 2026, 3)
+        ...     cache.save(2026, 3, fingerprint, records)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, team: str = CACHE_TEAM_KEY):
+        self.cache_dir = Path(cache_dir)
+        self.team = team
+
+    def path(self, year: int, month: int) -> Path:
+        """Chemin du fichier de cache d'un mois."""
+        return self.cache_dir / f"{self.team}_{year}_{month:02d}.json"
+
+    def load(self, year: int, month: int, fingerprint: str) -> Optional[List[Dict]]:
+        """
+        Retourne les records en cache si l'empreinte est identique.
+
+        Returns:
+            Records du mois, ou None si absent / autre version / empreinte différente / illisible
+        """
+        path = self.path(year, month)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache illisible ignoré ({path.name}) : {e}")
+            return None
+
+        if entry.get("version") != CACHE_VERSION or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("records")
+
+    def save(self, year: int, month: int, fingerprint: str, records: List[Dict]):
+        """Enregistre les records d'un mois avec leur empreinte (écriture atomique)."""
+        path = self.path(year, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        entry = {
+            "version": CACHE_VERSION,
+            "year": year,
+            "month": month,
+            "team": self.team,
+            "fingerprint": fingerprint,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "records": records,
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,103 @@
+"""
+Points de reprise (checkpoints) mensuels du scraping
+
+Chaque mois est écrit sur disque dès que son extraction est terminée
+(écriture atomique : fichier temporaire puis renommage), dans
+CHECKPOINT_DIR/<année>/month_<mois>.json.
+
+Si le scraping s'interrompt (plantage, session expirée, Ctrl+C), les mois déjà
+extraits ne sont pas perdus : `scripts/main.py --resume` recharge les mois
+terminés et ne scrape que les mois manquants.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import List, Dict
+
+from src.config import CHECKPOINT_DIR
+from src.logging import get_logger
+
+logger = get_logger()
+
+
+def _checkpoint_path(year: int, month: int, checkpoint_dir=CHECKPOINT_DIR) -> Path:
+    return Path(checkpoint_dir) / str(year) / f"month_{month:02d}.json"
+
+
+def save_month_checkpoint(year: int, month: int, records: List[Dict], checkpoint_dir=CHECKPOINT_DIR) -> Path:
+    """
+    Enregistre atomiquement les records d'un mois terminé.
+
+    Args:
+        year: Année
+        month: Mois (1-12)
+        records: Records du mois
+        checkpoint_dir: Dossier des checkpoints
+
+    Returns:
+        Chemin du checkpoint écrit
+    """
+    path = _checkpoint_path(year, month, checkpoint_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"year": year, "month": month, "records": records}, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    logger.debug(f"Checkpoint écrit : {path}")
+    return path
+
+
+def load_completed_months(year: int, checkpoint_dir=CHECKPOINT_DIR) -> Dict[int, List[Dict]]:
+    """
+    Charge les mois déjà terminés d'une année.
+
+    Returns:
+        Dictionnaire {mois: records} des checkpoints lisibles
+    """
+    completed = {}
+
+    for month in range(1, 13):
+        path = _checkpoint_path(year, month, checkpoint_dir)
+        if not path.exists():
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                completed[month] = json.load(f)["records"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Checkpoint illisible ignoré ({path.name}) : {e}")
+
+    return completed
+
+
+def clear_checkpoints(year: int, checkpoint_dir=CHECKPOINT_DIR):
+    """Supprime les checkpoints d'une année (nouvelle exécution complète)."""
+    year_dir = Path(checkpoint_dir) / str(year)
+    if not year_dir.exists():
+        return
+    for path in year_dir.glob("month_*.json*"):
+        path.unlink()
+
+
+def merge_months(*record_lists: List[Dict]) -> List[Dict]:
+    """
+    Fusionne des listes de records dans l'ordre des mois.
+
+    L'ordre des records est conservé à l'intérieur d'un même mois.
+
+    Returns:
+        Liste unique de records triée par mois
+    """
+    by_month = {}
+    for records in record_lists:
+        for record in records:
+            by_month.setdefault(record["date"][:7], []).append(record)
+
+    merged = []
+    for month_key in sorted(by_month):
+        merged.extend(by_month[month_key])
+    return merged
@@ -0,0 +1,209 @@
+"""
+Noyau vectorisé d'affectation des événements aux jours (NumPy)
+
+Version « tableaux » de `compute_events_from_geometry()` : au lieu de tester,
+événement par événement, le chevauchement avec chaque cellule jour, la
+géométrie d'un mois entier (tous les collaborateurs) est rangée dans des
+tableaux et traitée par broadcasting :
+
+    cell_x, cell_w : (lignes × jours)  positions / largeurs des cellules (NaN si absente)
+    ev_row         : (événements,)     ligne de rattachement de chaque événement
+    ev_x, ev_w     : (événements,)     position / largeur de chaque événement
+
+    chevauchement (événements × jours) -> start_idx, end_idx, half_day, period
+
+Le résultat est strictement identique à la version Python (mêmes opérations
+flottantes, mêmes comparaisons) ; `check_geometry_parity()` le vérifie sur
+des instantanés enregistrés (voir scripts/check_parity.py).
+"""
+
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.utils import build_detail
+
+# Seuil de détection d'une demi-journée (largeur événement / largeur cellule)
+HALF_DAY_RATIO = 0.65
+
+
+def assign_events_to_days(cell_x: np.ndarray, cell_w: np.ndarray, ev_row: np.ndarray,
+                          ev_x: np.ndarray, ev_w: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calcule jours de début / fin, demi-journée et période pour tous les événements.
+
+    Args:
+        cell_x: Positions x des cellules, forme (lignes, jours), NaN si absente
+        cell_w: Largeurs des cellules, forme (lignes, jours), NaN si absente
+        ev_row: Indice de ligne de chaque événement, forme (événements,)
+        ev_x: Position x de chaque événement
+        ev_w: Largeur de chaque événement
+
+    Returns:
+        Dictionnaire de tableaux (forme (événements,)) :
+        - matched : au moins un jour chevauché
+        - start_idx, end_idx : premier / dernier jour chevauché (0-based)
+        - half_day : demi-journée détectée
+        - is_am : demi-journée du matin (sinon après-midi)
+        - zero_width : largeur nulle de la première cellule (division impossible)
+    """
+    cx = cell_x[ev_row]                       # (E, D)
+    cw = cell_w[ev_row]
+    ex = ev_x[:, None]                        # (E, 1)
+    ew = ev_w[:, None]
+
+    valid = ~np.isnan(cx)
+    overlap = valid & ~((ex + ew <= cx) | (ex >= cx + cw))
+
+    nb_days = overlap.shape[1]
+    if nb_days == 0:
+        # Aucune cellule jour : aucun événement n'est rattaché (argmax impossible)
+        none = np.zeros(len(ev_row), dtype=bool)
+        zeros = np.zeros(len(ev_row), dtype=np.intp)
+        return {"matched": none, "start_idx": zeros, "end_idx": zeros,
+                "half_day": none, "is_am": none, "zero_width": none}
+
+    matched = overlap.any(axis=1)
+    start_idx = overlap.argmax(axis=1)
+    end_idx = nb_days - 1 - overlap[:, ::-1].argmax(axis=1)
+
+    rows = np.arange(len(ev_row))
+    first_x = cx[rows, start_idx]
+    first_w = cw[rows, start_idx]
+
+    zero_width = matched & (first_w == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = ev_w / first_w
+    half_day = ratio < HALF_DAY_RATIO
+    is_am = ev_x + ev_w / 2 < first_x + first_w / 2
+
+    return {
+        "matched": matched,
+        "start_idx": start_idx,
+        "end_idx": end_idx,
+        "half_day": half_day,
+        "is_am": is_am,
+        "zero_width": zero_width,
+    }
+
+
+def _cells_to_arrays(rows_cells: List[List[Optional[Dict]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Range les boîtes des cellules de chaque ligne dans deux tableaux (lignes, jours)."""
+    nb_days = max((len(cells) for cells in rows_cells), default=0)
+    cell_x = np.full((len(rows_cells), nb_days), np.nan)
+    cell_w = np.full((len(rows_cells), nb_days), np.nan)
+
+    for r, cells in enumerate(rows_cells):
+        for d, box in enumerate(cells):
+            if box:
+                cell_x[r, d] = box["x"]
+                cell_w[r, d] = box["width"]
+
+    return cell_x, cell_w
+
+
+def compute_month_events(rows_geometry: List[Tuple[List[Optional[Dict]], List[Dict]]]) -> List[Optional[List[Dict]]]:
+    """
+    Calcule les événements de toutes les lignes d'un mois en un seul passage vectorisé.
+
+    Équivalent de `[compute_events_from_geometry(cells, events) for cells, events in rows_geometry]`.
+
+    Args:
+        rows_geometry: Pour chaque ligne, (boîtes des cellules jour, événements bruts)
+
+    Returns:
+        Pour chaque ligne, la liste de ses événements, ou None si la ligne est
+        en erreur (cellule de largeur nulle, comme la version Python)
+    """
+    from src.scraper.scraper import determine_event_type_and_status
+
+    type_cache = {}
+    candidates = []  # (ligne, type, détail, x, largeur)
+
+    for r, (_, raw_events) in enumerate(rows_geometry):
+        for raw in raw_events:
+            css_class = raw["class"]
+            if "grey_cell_weekend" in css_class or not raw["box"]:
+                continue
+
+            if css_class not in type_cache:
+                type_cache[css_class] = determine_event_type_and_status(css_class)
+            event_type, status = type_cache[css_class]
+            if not event_type or event_type == "JOUR_NON_OUVRE":
+                continue
+
+            candidates.append((r, event_type, build_detail(raw["title"], status),
+                               raw["box"]["x"], raw["box"]["width"]))
+
+    results = [[] for _ in rows_geometry]
+    if not candidates:
+        return results
+
+    cell_x, cell_w = _cells_to_arrays([cells for cells, _ in rows_geometry])
+    ev_row = np.array([c[0] for c in candidates], dtype=np.intp)
+    ev_x = np.array([c[3] for c in candidates], dtype=float)
+    ev_w = np.array([c[4] for c in candidates], dtype=float)
+
+    assigned = assign_events_to_days(cell_x, cell_w, ev_row, ev_x, ev_w)
+
+    failed_rows = set(ev_row[assigned["zero_width"]].tolist())
+
+    matched = assigned["matched"].tolist()
+    start_idx = assigned["start_idx"].tolist()
+    end_idx = assigned["end_idx"].tolist()
+    half_day = assigned["half_day"].tolist()
+    is_am = assigned["is_am"].tolist()
+
+    for i, (r, event_type, detail, _, _) in enumerate(candidates):
+        if not matched[i] or r in failed_rows:
+            continue
+        row_events = results[r]
+        row_events.append({
+            "type": event_type,
+            "detail": detail,
+            "start_idx": start_idx[i],
+            "end_idx": end_idx[i],
+            "half_day": half_day[i],
+            "period": ("am" if is_am[i] else "pm") if half_day[i] else None,
+            "order": len(row_events),
+        })
+
+    for r in failed_rows:
+        results[r] = None
+
+    return results
+
+
+def check_geometry_parity(snapshot: Dict, nb_days: int) -> List[Dict]:
+    """
+    Compare le noyau vectorisé à la version Python sur un instantané.
+
+    Args:
+        snapshot: Instantané du mois (voir src/scraper/snapshot.py)
+        nb_days: Nombre de jours du mois
+
+    Returns:
+        Liste des écarts ({"row", "name", "python", "numpy"}), vide si parité
+    """
+    from src.scraper.scraper import compute_events_from_geometry
+
+    rows = [row for row in snapshot.get("rows") or [] if row.get("events") is not None]
+    rows_geometry = [(row["cells"][:nb_days], row["events"]) for row in rows]
+
+    vectorized = compute_month_events(rows_geometry)
+
+    mismatches = []
+    for r, (cells, raw_events) in enumerate(rows_geometry):
+        try:
+            expected = compute_events_from_geometry(cells, raw_events)
+        except ZeroDivisionError:
+            expected = None
+        if expected != vectorized[r]:
+            mismatches.append({
+                "row": r,
+                "name": rows[r].get("name"),
+                "python": expected,
+                "numpy": vectorized[r],
+            })
+
+    return mismatches
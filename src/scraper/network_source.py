@@ -0,0 +1,314 @@
+"""
+Source de données réseau : lecture directe des réponses XHR du planning
+
+Le planning DHTMLX de DailyRH est alimenté par des réponses JSON. Plutôt que
+d'attendre le rendu de la grille puis de reconstituer les jours à partir de
+la géométrie en pixels, ce module enregistre ces réponses (`page.on("response")`)
+et les convertit directement au format de records produit par `scrape_month()`.
+
+Deux modes :
+- Enregistrement : les payloads capturés pendant un scraping réel sont
+  sauvegardés par mois dans NETWORK_FIXTURES_DIR (si NETWORK_RECORD_FIXTURES)
+- Rejeu : `replay_all_months()` relit ces fixtures sans navigateur ni réseau
+
+Les noms des champs JSON sont centralisés dans PLANNING_API_FIELDS
+(src/config/config.py) pour pouvoir suivre une évolution de l'API.
+"""
+
+import json
+import calendar
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional, Set
+
+from playwright.sync_api import Page
+
+from src.config import (
+    PLANNING_API_URL_PATTERN, PLANNING_API_FIELDS,
+    NETWORK_FIXTURES_DIR, NETWORK_RECORD_FIXTURES
+)
+from src.utils import build_detail, extract_uid_from_corp_id
+from src.logging import get_logger
+from src.scraper.scraper import determine_event_type_and_status
+from src.scraper.roster import is_pseudo_row
+from src.scraper.planning_grid import MonthPlanningGrid
+
+logger = get_logger()
+
+
+class PlanningResponseRecorder:
+    """
+    Enregistre les réponses XHR du planning reçues par une page.
+
+    Les réponses sont conservées telles quelles dans le gestionnaire
+    d'événement ; leur corps n'est lu qu'au moment de `collect()`, depuis
+    le flux principal (les appels synchrones sont interdits dans les handlers).
+
+    Exemple:
+        >>> recorder = PlanningResponseRecorder(page)
+        >>> page.goto(DAILYRH_URL)
+        >>> payloads = recorder.collect()
+    """
+
+    def __init__(self, page: Page, url_pattern: str = PLANNING_API_URL_PATTERN):
+        self.url_pattern = url_pattern
+        self._responses = []
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if self.url_pattern not in response.url:
+            return
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        self._responses.append(response)
+
+    def reset(self):
+        """Oublie les réponses reçues (à appeler avant de changer de mois)."""
+        self._responses = []
+
+    def collect(self) -> List[Dict]:
+        """
+        Lit le corps JSON des réponses reçues depuis le dernier reset().
+
+        Returns:
+            Liste de payloads {"url": ..., "body": ...}
+        """
+        payloads = []
+        for response in self._responses:
+            try:
+                body = response.json()
+            except Exception as e:
+                logger.debug(f"Réponse ignorée (non JSON) : {response.url} ({e})")
+                continue
+            payloads.append({"url": response.url, "body": body})
+        return payloads
+
+
+def _fixture_path(year: int, month: int, fixtures_dir) -> Path:
+    return Path(fixtures_dir) / f"planning_{year}_{month:02d}.json"
+
+
+def save_payloads(payloads: List[Dict], year: int, month: int, fixtures_dir=NETWORK_FIXTURES_DIR) -> Path:
+    """
+    Sauvegarde les payloads d'un mois pour un rejeu hors ligne.
+
+    Returns:
+        Chemin du fichier créé
+    """
+    path = _fixture_path(year, month, fixtures_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payloads, f, ensure_ascii=False)
+    return path
+
+
+def load_payloads(year: int, month: int, fixtures_dir=NETWORK_FIXTURES_DIR) -> Optional[List[Dict]]:
+    """
+    Charge les payloads enregistrés d'un mois.
+
+    Returns:
+        Liste de payloads, ou None si aucune fixture n'existe pour ce mois
+    """
+    path = _fixture_path(year, month, fixtures_dir)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _parse_api_datetime(value) -> Optional[datetime]:
+    """Parse une date de l'API ("2026-01-05 00:00" ou ISO 8601)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def _event_to_planning_event(raw: Dict, month_start: date, nb_days: int, order: int) -> Optional[Dict]:
+    """
+    Convertit un événement brut de l'API vers le format des événements du scraper.
+
+    Les dates de fin DHTMLX sont exclusives : un congé du 5 au 6 inclus
+    a pour fin "2026-01-07 00:00". Une durée de 12h ou moins est une
+    demi-journée, le matin si elle commence avant midi.
+    """
+    f = PLANNING_API_FIELDS
+    event_type, status = determine_event_type_and_status(raw.get(f["event_class"]) or "")
+    if not event_type or event_type == "JOUR_NON_OUVRE":
+        return None
+
+    start = _parse_api_datetime(raw.get(f["event_start"]))
+    end = _parse_api_datetime(raw.get(f["event_end"]))
+    if not start or not end or end <= start:
+        return None
+
+    last_day = (end - timedelta(microseconds=1)).date()
+    start_idx = (start.date() - month_start).days
+    end_idx = (last_day - month_start).days
+    if end_idx < 0 or start_idx >= nb_days:
+        return None
+
+    half_day = (end - start) <= timedelta(hours=12)
+    period = ("am" if start.hour < 12 else "pm") if half_day else None
+
+    return {
+        "type": event_type,
+        "detail": build_detail(raw.get(f["event_title"]) or "", status),
+        "start_idx": max(0, start_idx),
+        "end_idx": min(nb_days - 1, end_idx),
+        "half_day": half_day,
+        "period": period,
+        "order": order,
+    }
+
+
+def _non_working_days_from_payloads(bodies: List[Dict], month_start: date, nb_days: int) -> Set[int]:
+    """Indices (0-based) des jours non ouvrés du mois, toutes sections confondues."""
+    f = PLANNING_API_FIELDS
+    jno_indices = set()
+
+    spans = []
+    for body in bodies:
+        spans.extend(body.get(f["timespans"]) or [])
+        spans.extend(
+            ev for ev in (body.get(f["events"]) or [])
+            if "grey_cell_weekend" in (ev.get(f["event_class"]) or "")
+        )
+
+    for span in spans:
+        start = _parse_api_datetime(span.get(f["event_start"]))
+        end = _parse_api_datetime(span.get(f["event_end"]))
+        if not start:
+            continue
+        if not end or end <= start:
+            end = start + timedelta(days=1)
+        d = start.date()
+        while d <= (end - timedelta(microseconds=1)).date():
+            idx = (d - month_start).days
+            if 0 <= idx < nb_days:
+                jno_indices.add(idx)
+            d += timedelta(days=1)
+
+    return jno_indices
+
+
+def parse_planning_payloads(payloads: List[Dict], year: int, month: int) -> List[Dict]:
+    """
+    Convertit les payloads XHR d'un mois en records, sans aucune géométrie.
+
+    Les collaborateurs proviennent du dernier payload listant des sections
+    (celui du mois affiché), les événements de tous les payloads reçus.
+
+    Args:
+        payloads: Payloads {"url", "body"} enregistrés pour le mois
+        year: Année
+        month: Mois (1-12)
+
+    Returns:
+        Liste des records du mois (même schéma que scrape_month())
+    """
+    f = PLANNING_API_FIELDS
+    month_start = date(year, month, 1)
+    nb_days = calendar.monthrange(year, month)[1]
+
+    logger.info(f"Traitement du mois (réseau) : {month_start.strftime('%B %Y')}")
+
+    bodies = [p["body"] for p in payloads if isinstance(p.get("body"), dict)]
+
+    sections = []
+    for body in bodies:
+        if body.get(f["sections"]):
+            sections = body[f["sections"]]
+
+    if not sections:
+        logger.warning(f"Aucun collaborateur dans les réponses pour {month_start.strftime('%B %Y')}")
+        return []
+
+    # Événements par section, dédoublonnés par identifiant
+    events_by_section = {}
+    seen_ids = set()
+    for body in bodies:
+        for raw in body.get(f["events"]) or []:
+            event_id = raw.get(f["event_id"])
+            if event_id is not None:
+                if event_id in seen_ids:
+                    continue
+                seen_ids.add(event_id)
+            events_by_section.setdefault(str(raw.get(f["event_section"])), []).append(raw)
+
+    jno_day_indices = _non_working_days_from_payloads(bodies, month_start, nb_days)
+    logger.info(f"Jours non ouvrés : {len(jno_day_indices)} jours")
+
+    grid = MonthPlanningGrid(year, month)
+    for section in sections:
+        name = str(section.get(f["section_label"]) or "").strip()
+        if is_pseudo_row(name):
+            continue
+
+        uid = extract_uid_from_corp_id(section.get(f["section_corp_id"]) or "")
+
+        events = []
+        for raw in events_by_section.get(str(section.get(f["section_key"])), []):
+            evt = _event_to_planning_event(raw, month_start, nb_days, len(events))
+            if evt:
+                events.append(evt)
+
+        grid.add_collaborator(name, uid, events)
+        logger.debug(f"Traité : {name} ({uid})")
+
+    grid.set_non_working_days(jno_day_indices)
+
+    logger.info(f"Lignes extraites : {len(grid)}")
+    return grid.to_records()
+
+
+def scrape_month_network(recorder: PlanningResponseRecorder, year: int, month: int) -> List[Dict]:
+    """
+    Scrape un mois à partir des réponses XHR capturées par le recorder.
+
+    Args:
+        recorder: Recorder attaché à la page, positionnée sur le mois
+        year: Année
+        month: Mois (1-12)
+
+    Returns:
+        Liste des records du mois
+    """
+    payloads = recorder.collect()
+    if not payloads:
+        logger.warning(f"Aucune réponse planning capturée (motif : '{recorder.url_pattern}')")
+
+    if NETWORK_RECORD_FIXTURES:
+        path = save_payloads(payloads, year, month)
+        logger.debug(f"Payloads enregistrés : {path}")
+
+    return parse_planning_payloads(payloads, year, month)
+
+
+def replay_all_months(year: int, fixtures_dir=NETWORK_FIXTURES_DIR, roster=None) -> List[Dict]:
+    """
+    Rejoue hors ligne les payloads enregistrés de tous les mois de l'année.
+
+    Args:
+        year: Année à rejouer
+        fixtures_dir: Dossier des fixtures enregistrées
+        roster: RosterStore comparé à l'effectif de chaque mois rejoué (optionnel)
+
+    Returns:
+        Liste de tous les records (mois sans fixture ignorés)
+    """
+    all_records = []
+
+    for month in range(1, 13):
+        payloads = load_payloads(year, month, fixtures_dir)
+        if payloads is None:
+            logger.warning(f"Pas de fixture pour {month:02d}/{year} dans {fixtures_dir}")
+            continue
+        records = parse_planning_payloads(payloads, year, month)
+        if roster is not None and records:
+            roster.observe_records(year, month, records)
+        all_records.extend(records)
+
+    return all_records
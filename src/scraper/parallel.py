@@ -0,0 +1,102 @@
+"""
+Scraping parallèle des mois sur plusieurs contextes navigateur
+
+Les mois de l'année sont découpés en blocs de mois consécutifs, un bloc par
+worker. Chaque worker ouvre son propre contexte navigateur à partir du même
+SESSION_FILE (une seule session SSO partagée), navigue directement vers le
+premier mois de son bloc puis enchaîne les mois suivants. Les résultats sont
+fusionnés dans l'ordre des mois.
+
+L'API synchrone de Playwright n'étant pas thread-safe, chaque worker (thread)
+démarre sa propre instance Playwright et son propre navigateur.
+
+Le nombre de workers est borné par SCRAPING_CONCURRENCY pour respecter la
+tolérance du serveur DailyRH.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+from playwright.sync_api import sync_playwright
+
+from src.config import SESSION_FILE, HEADLESS_MODE, SCRAPING_CONCURRENCY, MOIS_NOMS
+from src.logging import get_logger
+from src.scraper.scraper import open_dailyrh, scrape_months_on_page, merge_month_results
+from src.scraper.waits import log_wait_summary, reset_wait_timings
+
+logger = get_logger()
+
+
+def split_months(months: List[int], nb_workers: int) -> List[List[int]]:
+    """
+    Découpe une liste de mois en blocs consécutifs de tailles équilibrées.
+
+    Exemple:
+        >>> split_months(list(range(1, 13)), 3)
+        [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]
+    """
+    nb_workers = max(1, min(nb_workers, len(months)))
+    size, extra = divmod(len(months), nb_workers)
+
+    blocks = []
+    start = 0
+    for i in range(nb_workers):
+        end = start + size + (1 if i < extra else 0)
+        blocks.append(months[start:end])
+        start = end
+    return blocks
+
+
+def _scrape_block(year: int, months: List[int], roster=None) -> Dict[int, List[Dict]]:
+    """Worker : scrape un bloc de mois consécutifs dans son propre contexte."""
+    label = f"{MOIS_NOMS[months[0] - 1]}-{MOIS_NOMS[months[-1] - 1]}"
+    logger.info(f"[{label}] Démarrage du worker")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=HEADLESS_MODE)
+        results = {}
+        try:
+            context = browser.new_context(storage_state=SESSION_FILE)
+            page, recorder = open_dailyrh(context)
+            results = scrape_months_on_page(page, year, months, recorder, results=results, roster=roster)
+        except Exception as e:
+            # Les mois déjà extraits sont conservés ; les mois manquants font échouer le scraping
+            logger.error(f"[{label}] Échec du worker : {e}")
+        finally:
+            browser.close()
+
+    logger.info(f"[{label}] {len(results)}/{len(months)} mois extraits")
+    return results
+
+
+def scrape_all_months_parallel(year: int, months: Optional[List[int]] = None,
+                               max_workers: int = SCRAPING_CONCURRENCY, roster=None) -> List[Dict]:
+    """
+    Scrape les mois de l'année en parallèle sur plusieurs contextes navigateur.
+
+    Args:
+        year: Année à scraper
+        months: Mois à scraper (par défaut janvier à décembre)
+        max_workers: Nombre maximum de contextes simultanés
+        roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel,
+                partagé par les workers)
+
+    Returns:
+        Liste de tous les records, dans l'ordre des mois
+
+    Raises:
+        RuntimeError: Si un mois n'a pas pu être extrait (worker en échec)
+    """
+    months = sorted(months or range(1, 13))
+    blocks = split_months(months, max_workers)
+    reset_wait_timings()
+    logger.info(f"Scraping parallèle : {len(blocks)} workers pour {len(months)} mois")
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+        for block_results in executor.map(lambda block: _scrape_block(year, block, roster), blocks):
+            results.update(block_results)
+
+    all_records = merge_month_results(year, months, results)
+    log_wait_summary()
+    return all_records
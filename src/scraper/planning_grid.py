@@ -0,0 +1,230 @@
+"""
+Planning mensuel sous forme de tableaux (NumPy)
+
+Remplace le dictionnaire « un dict par jour et par collaborateur » : le
+planning d'un mois entier est un tableau d'entiers
+
+    types   : (collaborateurs × jours × {am, pm})  code du type de la demi-journée
+    details : (collaborateurs × jours × {am, pm})  indice dans la table des détails
+
+Les détails (« Congés (Validé) », « TT (À valider) »...) sont internés une
+seule fois dans une `DetailTable` ; l'indice 0 est le détail vide.
+
+Les codes sont ordonnés par priorité : PRESENT < TELETRAVAIL < CONGES < JOUR_NON_OUVRE.
+Un événement ne remplace une demi-journée que si son code est strictement
+supérieur ; à priorité égale, le premier événement appliqué l'emporte
+(demi-journées, puis CONGES journée entière, puis TELETRAVAIL journée entière).
+Les jours non ouvrés écrasent tout.
+
+Les records (dicts) ne sont matérialisés qu'à l'export, par `iter_records()`
+/ `to_records()`.
+"""
+
+from datetime import date, timedelta
+import calendar
+from typing import List, Dict, Iterator, Iterable
+
+import numpy as np
+
+from src.utils import date_to_string
+
+# Codes des types, par priorité croissante
+PRESENT = 0
+TELETRAVAIL = 1
+CONGES = 2
+JOUR_NON_OUVRE = 3
+
+TYPE_NAMES = ["PRESENT", "TELETRAVAIL", "CONGES", "JOUR_NON_OUVRE"]
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+# Demi-journées (dernier axe du tableau)
+AM = 0
+PM = 1
+
+
+class DetailTable:
+    """Table des libellés de détail internés (indice 0 = détail vide)."""
+
+    def __init__(self):
+        self.values = [""]
+        self._ids = {"": 0}
+
+    def intern(self, detail: str) -> int:
+        """Retourne l'indice du détail, en l'ajoutant à la table si besoin."""
+        detail_id = self._ids.get(detail)
+        if detail_id is None:
+            detail_id = len(self.values)
+            self._ids[detail] = detail_id
+            self.values.append(detail)
+        return detail_id
+
+    def __getitem__(self, detail_id: int) -> str:
+        return self.values[detail_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class MonthPlanningGrid:
+    """
+    Planning d'un mois pour tous les collaborateurs.
+
+    Les événements sont mis en attente par `add_collaborator()` ; le tableau est
+    résolu en une seule passe vectorisée au premier accès à `types` / `details`.
+
+    Exemple:
+        >>> grid = MonthPlanningGrid(2026, 3)
+        >>> grid.add_collaborator("Dupont Jean", "344256", events)
+        >>> grid.set_non_working_days({0, 6, 7})
+        >>> records = grid.to_records()
+    """
+
+    def __init__(self, year: int, month: int):
+        self.year = year
+        self.month = month
+        self.nb_days = calendar.monthrange(year, month)[1]
+
+        month_start = date(year, month, 1)
+        self.dates = [date_to_string(month_start + timedelta(days=i)) for i in range(self.nb_days)]
+
+        self.collaborators = []   # [(nom, uid)]
+        self.detail_table = DetailTable()
+
+        self._events = []         # (ligne, début, fin, am, pm, code, détail, rang de priorité)
+        self._jno_indices = set()
+        self._resolved = None
+
+    def add_collaborator(self, name: str, uid: str, events: List[Dict]) -> int:
+        """
+        Ajoute un collaborateur et ses événements.
+
+        Args:
+            name: Nom du collaborateur
+            uid: UID du collaborateur
+            events: Événements (format de compute_events_from_geometry())
+
+        Returns:
+            Indice de ligne du collaborateur
+
+        Raises:
+            IndexError: Un événement déborde du mois (le collaborateur n'est pas ajouté)
+        """
+        row = len(self.collaborators)
+        pending = []
+
+        # Rang de priorité à type égal : demi-journées dans l'ordre, puis
+        # CONGES journée entière, puis TELETRAVAIL journée entière
+        half_days = [evt for evt in events if evt['half_day']]
+        full_conges = [evt for evt in events if not evt['half_day'] and evt['type'] == "CONGES"]
+        full_tt = [evt for evt in events if not evt['half_day'] and evt['type'] == "TELETRAVAIL"]
+
+        for evt in half_days + full_conges + full_tt:
+            code = TYPE_CODES.get(evt['type'])
+            if code not in (CONGES, TELETRAVAIL):
+                continue
+
+            start, end = evt['start_idx'], evt['end_idx']
+            if end < start:
+                continue
+            if start < 0 or end >= self.nb_days:
+                raise IndexError(f"événement hors du mois (jours {start + 1} à {end + 1})")
+
+            if evt['half_day']:
+                is_am = evt.get('period', 'am') == "am"
+                am, pm = is_am, not is_am
+            else:
+                am, pm = True, True
+
+            pending.append((row, start, end, am, pm, code, self.detail_table.intern(evt['detail'])))
+
+        rank = len(self._events)
+        self._events.extend(evt + (rank + i,) for i, evt in enumerate(pending))
+        self.collaborators.append((name, uid))
+        self._resolved = None
+        return row
+
+    def set_non_working_days(self, jno_indices: Iterable[int]):
+        """Définit les jours non ouvrés du mois (indices 0-based, priorité absolue)."""
+        self._jno_indices = {d for d in jno_indices if 0 <= d < self.nb_days}
+        self._resolved = None
+
+    def _resolve(self):
+        """Construit les tableaux types / details à partir des événements en attente."""
+        shape = (len(self.collaborators), self.nb_days, 2)
+        types = np.full(shape, PRESENT, dtype=np.uint8)
+        details = np.zeros(shape, dtype=np.int32)
+
+        if self._events:
+            ev = np.array(self._events, dtype=np.int64)
+            ev_row, ev_start, ev_end = ev[:, 0], ev[:, 1], ev[:, 2]
+            ev_halves = ev[:, 3:5].astype(bool)
+            ev_code, ev_detail, ev_rank = ev[:, 5], ev[:, 6], ev[:, 7]
+
+            # Couverture (événements × jours × {am, pm})
+            days = np.arange(self.nb_days)
+            in_range = (days >= ev_start[:, None]) & (days <= ev_end[:, None])
+            covered = in_range[:, :, None] & ev_halves[:, None, :]
+
+            # Score : le code le plus prioritaire l'emporte, puis le premier appliqué
+            nb_events = len(ev)
+            score = ev_code * (nb_events + 1) + (nb_events - ev_rank)
+
+            ev_idx, day_idx, half_idx = np.nonzero(covered)
+            best = np.zeros(shape, dtype=np.int64)
+            np.maximum.at(best, (ev_row[ev_idx], day_idx, half_idx), score[ev_idx])
+
+            # Décodage du score gagnant -> événement (rang = position) -> (type, détail)
+            mask = best > 0
+            winner = nb_events - (best[mask] % (nb_events + 1))
+            types[mask] = ev_code[winner]
+            details[mask] = ev_detail[winner]
+
+        if self._jno_indices:
+            jno = sorted(self._jno_indices)
+            types[:, jno, :] = JOUR_NON_OUVRE
+            details[:, jno, :] = 0
+
+        self._resolved = (types, details)
+
+    @property
+    def types(self) -> np.ndarray:
+        """Codes des types, forme (collaborateurs, jours, 2)."""
+        if self._resolved is None:
+            self._resolve()
+        return self._resolved[0]
+
+    @property
+    def details(self) -> np.ndarray:
+        """Indices des détails, forme (collaborateurs, jours, 2)."""
+        if self._resolved is None:
+            self._resolve()
+        return self._resolved[1]
+
+    def __len__(self) -> int:
+        """Nombre de records (collaborateurs × jours)."""
+        return len(self.collaborators) * self.nb_days
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Génère les records CSV, collaborateur par collaborateur puis jour par jour."""
+        names = np.array(TYPE_NAMES, dtype=object)
+        detail_values = np.array(self.detail_table.values, dtype=object)
+        type_labels = names[self.types].tolist()
+        detail_labels = detail_values[self.details].tolist()
+
+        for c, (name, uid) in enumerate(self.collaborators):
+            row_types = type_labels[c]
+            row_details = detail_labels[c]
+            for d, date_str in enumerate(self.dates):
+                yield {
+                    "collaborateur": name,
+                    "uid": uid,
+                    "date": date_str,
+                    "type_am": row_types[d][AM],
+                    "detail_am": row_details[d][AM],
+                    "type_pm": row_types[d][PM],
+                    "detail_pm": row_details[d][PM]
+                }
+
+    def to_records(self) -> List[Dict]:
+        """Matérialise tous les records du mois."""
+        return list(self.iter_records())
@@ -0,0 +1,83 @@
+"""
+Effectif du mois : nom et identifiant de chaque ligne du planning
+
+L'extraction élément par élément lisait l'identité de chaque ligne en
+plusieurs aller-retours Playwright (inner_text du nom, count() et
+get_attribute du data-corp-id). Ici, un seul `page.evaluate` par mois
+renvoie, dans l'ordre des lignes `tr.dhx_row_item`, le couple
+(nom, data-corp-id) de chaque ligne :
+
+    [["Mes Collègues", null], ["Dupont Jean", "HRF344256-0_HRF460606"], ...]
+
+Les pseudo-lignes ("Mes Collègues", "Signataire...", "Total...") sont
+écartées côté Python et l'UID est extrait du data-corp-id.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence
+
+from src.utils import extract_uid_from_corp_id
+
+
+# Mêmes sélecteurs que l'extraction élément par élément et que SNAPSHOT_JS
+ROSTER_JS = """
+() => Array.from(document.querySelectorAll("tr.dhx_row_item")).map((row) => {
+    const nameCell = row.querySelector("td.dhx_matrix_scell");
+    const corpElem = row.querySelector("[data-corp-id]");
+    return [
+        nameCell ? nameCell.innerText : null,
+        corpElem ? (corpElem.getAttribute("data-corp-id") || "") : null,
+    ];
+})
+"""
+
+
+class RosterEntry(NamedTuple):
+    """Ligne collaborateur du planning."""
+    index: int      # Position parmi les lignes tr.dhx_row_item (rows.nth(index))
+    name: str
+    uid: str
+
+
+def is_pseudo_row(name: str) -> bool:
+    """
+    Indique si une ligne du planning n'est pas un collaborateur
+    (en-tête "Mes Collègues", lignes "Signataire..." et "Total...").
+    """
+    return (
+        name == "Mes Collègues"
+        or (isinstance(name, str) and name.startswith("Signataire"))
+        or (isinstance(name, str) and name.startswith("Total"))
+        or not name
+    )
+
+
+def parse_roster(rows: Sequence[Sequence[Optional[str]]]) -> List[RosterEntry]:
+    """
+    Construit l'effectif à partir des couples (nom, data-corp-id) des lignes.
+
+    Args:
+        rows: Couples (nom ou None, data-corp-id ou None), dans l'ordre des lignes
+
+    Returns:
+        Lignes collaborateurs, pseudo-lignes écartées
+    """
+    roster = []
+    for index, (name, corp_id) in enumerate(rows):
+        name = name.strip() if name is not None else "INCONNU"
+        if is_pseudo_row(name):
+            continue
+        roster.append(RosterEntry(index, name, extract_uid_from_corp_id(corp_id or "")))
+    return roster
+
+
+def take_roster(page) -> List[RosterEntry]:
+    """
+    Lit l'effectif du mois affiché en un seul aller-retour.
+
+    Args:
+        page: Page Playwright positionnée sur le mois (lignes déjà présentes)
+
+    Returns:
+        Lignes collaborateurs, dans l'ordre du planning
+    """
+    return parse_roster(page.evaluate(ROSTER_JS))
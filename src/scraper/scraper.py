@@ -4,19 +4,30 @@ import re
 import math
 import time
 import calendar
-from datetime import date, timedelta
-from typing import List, Dict, Tuple, Set, Optional
+from contextlib import contextmanager
+from datetime import date
+from typing import List, Dict, Tuple, Set, Optional, Iterable
 from playwright.sync_api import Page, sync_playwright
 
 from src.config import (
-    SESSION_FILE, DAILYRH_URL, TARGET_YEAR,
-    HEADLESS_MODE, NAVIGATION_DELAY, INITIAL_LOAD_DELAY, MAX_NAVIGATION_CLICKS
+    SESSION_FILE, DAILYRH_URL,
+    HEADLESS_MODE, INITIAL_LOAD_TIMEOUT, MAX_NAVIGATION_CLICKS,
+    BULK_EXTRACTION, DATA_SOURCE, MOIS_NOMS, DIRECT_NAVIGATION, MONTH_CACHE_ENABLED,
+    RECORD_SNAPSHOTS, SNAPSHOT_DIR, CHECKPOINT_DIR
 )
 from src.utils import (
-    date_to_string, build_detail, extract_uid_from_corp_id,
-    extract_date_from_css_class, parse_month_year_text
+    build_detail, extract_date_from_css_class, parse_month_year_text
 )
 from src.logging import get_logger
+from src.metrics import timer, record_time, increment
+from src.scraper.snapshot import take_month_snapshot, save_snapshot
+from src.scraper.geometry import compute_month_events
+from src.scraper.planning_grid import MonthPlanningGrid
+from src.scraper.waits import watch_planning_requests, wait_for_planning_ready, log_wait_summary, reset_wait_timings
+from src.scraper.cache import MonthCache, take_month_fingerprint
+from src.scraper.checkpoint import save_month_checkpoint
+from src.scraper.tracing import traced, trace_month
+from src.scraper.roster import parse_roster, take_roster
 
 logger = get_logger()
 
@@ -105,11 +116,28 @@ def extract_non_working_days(page: Page, year: int, month: int) -> Set[int]:
     Returns:
         Set d'indices de jours (0-based)
     """
-    jno_dates_set = set()
     all_jno_timespans = page.locator("div.dhx_marked_timespan.grey_cell_weekend")
+    css_classes = [
+        all_jno_timespans.nth(i).get_attribute("class") or ""
+        for i in range(all_jno_timespans.count())
+    ]
+    return non_working_days_from_classes(css_classes, year, month)
+
+
+def non_working_days_from_classes(css_classes: List[str], year: int, month: int) -> Set[int]:
+    """
+    Convertit les classes CSS des timespans non ouvrés en indices de jours.
     
-    for i in range(all_jno_timespans.count()):
-        css_class = all_jno_timespans.nth(i).get_attribute("class") or ""
+    Args:
+        css_classes: Classes CSS des éléments grey_cell_weekend
+        year: Année
+        month: Mois (1-12)
+        
+    Returns:
+        Set d'indices de jours (0-based)
+    """
+    jno_dates_set = set()
+    for css_class in css_classes:
         jno_date = extract_date_from_css_class(css_class)
         if jno_date:
             jno_dates_set.add(jno_date)
@@ -147,8 +175,7 @@ def extract_collaborator_events(row, nb_days: int) -> List[Dict]:
         "div[class*='event']:not(.dhx_marked_timespan)"
     )
 
-    all_events = []
-
+    raw_events = []
     for i in range(events_normal.count()):
         ev = events_normal.nth(i)
         css_class = ev.get_attribute("class") or ""
@@ -157,7 +184,39 @@ def extract_collaborator_events(row, nb_days: int) -> List[Dict]:
         if "grey_cell_weekend" in css_class:
             continue
 
-        event_box = ev.bounding_box()
+        raw_events.append({
+            "class": css_class,
+            "title": title,
+            "box": ev.bounding_box(),
+        })
+
+    return compute_events_from_geometry(day_boxes, raw_events)
+
+
+def compute_events_from_geometry(day_boxes: List[Optional[Dict]], raw_events: List[Dict]) -> List[Dict]:
+    """
+    Calcule les événements d'un collaborateur à partir de la géométrie brute.
+    
+    Logique partagée entre l'extraction élément par élément et l'extraction
+    en masse (snapshot) : chevauchement horizontal avec les cellules jour,
+    puis détection demi-journée / période.
+    
+    Args:
+        day_boxes: Boîtes des cellules jour ({"x", "width"} ou None)
+        raw_events: Événements bruts ({"class", "title", "box"})
+        
+    Returns:
+        Liste d'événements (type, detail, start_idx, end_idx, half_day, period, order)
+    """
+    all_events = []
+
+    for raw in raw_events:
+        css_class = raw["class"]
+
+        if "grey_cell_weekend" in css_class:
+            continue
+
+        event_box = raw["box"]
         if not event_box:
             continue
 
@@ -165,7 +224,7 @@ def extract_collaborator_events(row, nb_days: int) -> List[Dict]:
         if not event_type or event_type == "JOUR_NON_OUVRE":
             continue
 
-        detail = build_detail(title, status)
+        detail = build_detail(raw["title"], status)
 
         impacted_days = []
 
@@ -214,103 +273,45 @@ def extract_collaborator_events(row, nb_days: int) -> List[Dict]:
     return all_events
 
 
-def apply_half_day_events(planning: Dict, events: List[Dict]):
-    """
-    Applique les événements de demi-journée au planning.
+def log_totals_validation(dailyrh_totals: Dict[str, float], records: Iterable[Dict], jno_day_indices: Set[int],
+                          year: int, month: int):
+    """Compare les totaux DailyRH aux records scrapés et journalise les écarts."""
+    logger.info(f"Totaux DailyRH extraits : {len(dailyrh_totals)} jours")
 
-    Args:
-        planning: Dictionnaire de planning à modifier
-        events: Liste d'événements
-    """
-    # Grouper les demi-journées par jour
-    half_days_by_day = {}
-    for evt in events:
-        if evt['half_day']:
-            for day_idx in range(evt['start_idx'], evt['end_idx'] + 1):
-                if day_idx not in half_days_by_day:
-                    half_days_by_day[day_idx] = []
-                half_days_by_day[day_idx].append(evt)
-
-    # Appliquer les demi-journées
-    for day_idx, day_events in half_days_by_day.items():
-        for evt in day_events:
-            period = evt.get('period', 'am')  # Par défaut AM si pas détecté
-            event_type = evt['type']
-            detail = evt['detail']
-
-            if period == "am":
-                current = planning[day_idx]["type_am"]
-                if (event_type == "CONGES" and current in ["PRESENT", "TELETRAVAIL"]) or \
-                   (event_type == "TELETRAVAIL" and current == "PRESENT"):
-                    planning[day_idx]["type_am"] = event_type
-                    planning[day_idx]["detail_am"] = detail
-            else:  # period == "pm"
-                current = planning[day_idx]["type_pm"]
-                if (event_type == "CONGES" and current in ["PRESENT", "TELETRAVAIL"]) or \
-                   (event_type == "TELETRAVAIL" and current == "PRESENT"):
-                    planning[day_idx]["type_pm"] = event_type
-                    planning[day_idx]["detail_pm"] = detail
-
-
-def apply_full_day_events(planning: Dict, events: List[Dict]):
-    """
-    Applique les événements de journée entière au planning.
-    
-    Args:
-        planning: Dictionnaire de planning à modifier
-        events: Liste d'événements
-    """
-    # D'abord les CONGES
-    for evt in events:
-        if evt['half_day'] or evt['type'] != 'CONGES':
-            continue
-        detail = evt['detail']
-        for day_idx in range(evt['start_idx'], evt['end_idx'] + 1):
-            current_am = planning[day_idx]["type_am"]
-            current_pm = planning[day_idx]["type_pm"]
-            if current_am in ["PRESENT", "TELETRAVAIL"]:
-                planning[day_idx]["type_am"] = "CONGES"
-                planning[day_idx]["detail_am"] = detail
-            if current_pm in ["PRESENT", "TELETRAVAIL"]:
-                planning[day_idx]["type_pm"] = "CONGES"
-                planning[day_idx]["detail_pm"] = detail
-    
-    # Ensuite TELETRAVAIL
-    for evt in events:
-        if evt['half_day'] or evt['type'] != 'TELETRAVAIL':
-            continue
-        detail = evt['detail']
-        for day_idx in range(evt['start_idx'], evt['end_idx'] + 1):
-            current_am = planning[day_idx]["type_am"]
-            current_pm = planning[day_idx]["type_pm"]
-            if current_am == "PRESENT":
-                planning[day_idx]["type_am"] = "TELETRAVAIL"
-                planning[day_idx]["detail_am"] = detail
-            if current_pm == "PRESENT":
-                planning[day_idx]["type_pm"] = "TELETRAVAIL"
-                planning[day_idx]["detail_pm"] = detail
+    validation = validate_totals(dailyrh_totals, records, jno_day_indices, year, month)
+    increment("scrape.validation_mismatches", validation['errors_count'], month=month)
+
+    if validation['errors_count'] == 0:
+        logger.info(f"✅ Validation OK : aucun écart détecté")
+    else:
+        logger.warning(f"⚠️ Validation : {validation['errors_count']} écarts détectés")
+        for error in validation['errors'][:10]:
+            logger.warning(
+                f"  Jour {error['day']} : "
+                f"DailyRH={error['dailyrh_count']:.1f}, Scrapé={error['scraped_count']:.1f} "
+                f"(écart: {error['difference']:+.1f})"
+            )
+        if validation['errors_count'] > 10:
+            logger.warning(f"  ... et {validation['errors_count'] - 10} autres écarts")
 
 
-def apply_non_working_days(planning: Dict, jno_indices: Set[int]):
+def scrape_month(page: Page, year: int, month: int, bulk: bool = BULK_EXTRACTION) -> List[Dict]:
     """
-    Applique les jours non ouvrés (priorité absolue).
+    Scrape les données d'un mois donné (version robuste).
     
     Args:
-        planning: Dictionnaire de planning à modifier
-        jno_indices: Set d'indices de jours non ouvrés
+        page: Page Playwright positionnée sur le mois
+        year: Année
+        month: Mois (1-12)
+        bulk: True = un seul page.evaluate par mois (snapshot),
+              False = extraction élément par élément
+        
+    Returns:
+        Liste des records du mois
     """
-    for day_idx in jno_indices:
-        if day_idx in planning:
-            planning[day_idx]["type_am"] = "JOUR_NON_OUVRE"
-            planning[day_idx]["detail_am"] = ""
-            planning[day_idx]["type_pm"] = "JOUR_NON_OUVRE"
-            planning[day_idx]["detail_pm"] = ""
-
+    if bulk:
+        return records_from_snapshot(take_month_snapshot(page), year, month)
 
-def scrape_month(page: Page, year: int, month: int) -> List[Dict]:
-    """
-    Scrape les données d'un mois donné (version robuste).
-    """
     month_start = date(year, month, 1)
     _, last_day = calendar.monthrange(year, month)
     month_end = date(year, month, last_day)
@@ -321,57 +322,25 @@ def scrape_month(page: Page, year: int, month: int) -> List[Dict]:
     # Attendre que les lignes soient présentes
     page.wait_for_selector("tr.dhx_row_item", timeout=15000)
 
-    rows = page.locator("tr.dhx_row_item")
-    row_count = rows.count()
+    # Effectif (index de ligne, nom, UID) en une seule requête, pseudo-lignes écartées
+    roster = take_roster(page)
 
-    if row_count == 0:
+    if not roster:
         logger.warning(f"Aucune ligne détectée pour {month_start.strftime('%B %Y')}")
         return []
 
-    logger.info(f"Nombre de collaborateurs : {row_count}")
+    logger.info(f"Nombre de collaborateurs : {len(roster)}")
 
     # Extraire les jours non ouvrés
     jno_day_indices = extract_non_working_days(page, year, month)
     logger.info(f"Jours non ouvrés : {len(jno_day_indices)} jours")
 
-    records = []
-
-    for r in range(row_count):
-        row = rows.nth(r)
-
-        name_cell = row.locator("td.dhx_matrix_scell").first
-        name = name_cell.inner_text().strip() if name_cell.count() > 0 else "INCONNU"
-
-
-        if (
-                name == "Mes Collègues"
-                or (isinstance(name, str) and name.startswith("Signataire"))
-                or (isinstance(name, str) and name.startswith("Total"))
-                or not name
-        ):
-            continue
+    rows = page.locator("tr.dhx_row_item")
+    grid = MonthPlanningGrid(year, month)
 
-        # Extraction UID
-        uid = ""
-        try:
-            corp_id_elem = row.locator("[data-corp-id]").first
-            if corp_id_elem.count() > 0:
-                corp_id_full = corp_id_elem.get_attribute("data-corp-id") or ""
-                uid = extract_uid_from_corp_id(corp_id_full)
-        except Exception as e:
-            logger.warning(f"Impossible d'extraire l'UID pour {name}: {e}")
-
-        # Initialisation planning
-        planning = {}
-        for i in range(nb_days):
-            d = month_start + timedelta(days=i)
-            planning[i] = {
-                "date": date_to_string(d),
-                "type_am": "PRESENT",
-                "type_pm": "PRESENT",
-                "detail_am": "",
-                "detail_pm": ""
-            }
+    for index, name, uid in roster:
+        row_started = time.perf_counter()
+        row = rows.nth(index)
 
         # Vérifier que la matrice est bien rendue
         matrix_div = row.locator(".dhx_matrix_line").first
@@ -386,54 +355,159 @@ def scrape_month(page: Page, year: int, month: int) -> List[Dict]:
 
         # Application logique métier
         try:
-            apply_half_day_events(planning, events)
-            apply_full_day_events(planning, events)
-            apply_non_working_days(planning, jno_day_indices)
+            grid.add_collaborator(name, uid, events)
         except Exception as e:
             logger.error(f"Erreur application planning pour {name}: {e}")
             continue
 
+        increment("scrape.events", len(events), month=month)
+        record_time("scrape.row", time.perf_counter() - row_started, month=month)
         logger.debug(f"Traité : {name} ({uid})")
 
-        # Génération des records
-        for i in range(nb_days):
-            info = planning[i]
-            records.append({
-                "collaborateur": name,
-                "uid": uid,
-                "date": info["date"],
-                "type_am": info["type_am"],
-                "detail_am": info["detail_am"],
-                "type_pm": info["type_pm"],
-                "detail_pm": info["detail_pm"]
-            })
+    grid.set_non_working_days(jno_day_indices)
 
-    logger.info(f"Lignes extraites : {len(records)}")
+    logger.info(f"Lignes extraites : {len(grid)}")
 
     # ← NOUVELLE APPROCHE : Extraction des totaux depuis les cellules
     try:
         dailyrh_totals = extract_dailyrh_totals(page, year, month, nb_days)
-        logger.info(f"Totaux DailyRH extraits : {len(dailyrh_totals)} jours")
+        log_totals_validation(dailyrh_totals, grid.iter_records(), jno_day_indices, year, month)
+    except Exception as e:
+        logger.error(f"Erreur lors de la validation des totaux : {e}")
 
-        validation = validate_totals(dailyrh_totals, records, jno_day_indices, year, month)
+    # Génération des records
+    return grid.to_records()
 
-        if validation['errors_count'] == 0:
-            logger.info(f"✅ Validation OK : aucun écart détecté")
-        else:
-            logger.warning(f"⚠️ Validation : {validation['errors_count']} écarts détectés")
-            for error in validation['errors'][:10]:
-                logger.warning(
-                    f"  Jour {error['day']} : "
-                    f"DailyRH={error['dailyrh_count']:.1f}, Scrapé={error['scraped_count']:.1f} "
-                    f"(écart: {error['difference']:+.1f})"
-                )
-            if validation['errors_count'] > 10:
-                logger.warning(f"  ... et {validation['errors_count'] - 10} autres écarts")
+
+def scrape_month_snapshot(snapshot: Dict, year: int, month: int) -> List[Dict]:
+    """
+    Applique toute la logique d'extraction à un instantané du mois, hors ligne.
+    
+    Produit exactement les mêmes records que l'extraction élément par élément,
+    sans aucun appel Playwright supplémentaire.
+    
+    Args:
+        snapshot: Instantané retourné par take_month_snapshot()
+        year: Année
+        month: Mois (1-12)
+        
+    Returns:
+        Liste des records du mois
+    """
+    month_start = date(year, month, 1)
+    _, last_day = calendar.monthrange(year, month)
+    month_end = date(year, month, last_day)
+    nb_days = (month_end - month_start).days + 1
+
+    logger.info(f"Traitement du mois : {month_start.strftime('%B %Y')}")
+
+    rows = snapshot.get("rows") or []
+
+    if not rows:
+        logger.warning(f"Aucune ligne détectée pour {month_start.strftime('%B %Y')}")
+        return []
+
+    logger.info(f"Nombre de collaborateurs : {len(rows)}")
+
+    # Extraire les jours non ouvrés
+    jno_day_indices = non_working_days_from_classes(snapshot.get("jno") or [], year, month)
+    logger.info(f"Jours non ouvrés : {len(jno_day_indices)} jours")
+
+    # Lignes collaborateurs exploitables
+    collaborators = []
+    for index, name, uid in parse_roster([(row["name"], row["corp_id"]) for row in rows]):
+        row = rows[index]
+
+        if row["events"] is None:
+            logger.error(f"Erreur extraction événements pour {name}: matrice non rendue")
+            continue
+
+        collaborators.append((name, uid, row))
+
+    # Affectation des événements aux jours : un seul passage vectorisé pour tout le mois
+    month_events = compute_month_events([(row["cells"][:nb_days], row["events"]) for _, _, row in collaborators])
+
+    grid = MonthPlanningGrid(year, month)
+
+    for (name, uid, row), events in zip(collaborators, month_events):
+        if events is None:
+            logger.error(f"Erreur extraction événements pour {name}: cellule jour de largeur nulle")
+            continue
+
+        try:
+            grid.add_collaborator(name, uid, events)
+        except Exception as e:
+            logger.error(f"Erreur application planning pour {name}: {e}")
+            continue
+
+        increment("scrape.events", len(events), month=month)
+        logger.debug(f"Traité : {name} ({uid})")
+
+    grid.set_non_working_days(jno_day_indices)
+
+    logger.info(f"Lignes extraites : {len(grid)}")
+
+    try:
+        dailyrh_totals = totals_from_cells(snapshot.get("totals") or [], year, month)
+        log_totals_validation(dailyrh_totals, grid.iter_records(), jno_day_indices, year, month)
     except Exception as e:
         logger.error(f"Erreur lors de la validation des totaux : {e}")
 
+    return grid.to_records()
+
+def records_from_snapshot(snapshot: Dict, year: int, month: int) -> List[Dict]:
+    """
+    Enregistre l'instantané du mois (RECORD_SNAPSHOTS) puis en extrait les records.
+    
+    Partagé par les moteurs synchrone et asynchrone.
+    """
+    if RECORD_SNAPSHOTS:
+        save_snapshot(snapshot, SNAPSHOT_DIR / f"snapshot_{year}_{month:02d}.json")
+    return scrape_month_snapshot(snapshot, year, month)
+
+
+def read_cached_month(cache: MonthCache, year: int, month: int, fingerprint: str) -> Optional[List[Dict]]:
+    """
+    Records du mois relus depuis le cache si son empreinte n'a pas changé.
+    
+    Partagé par les moteurs synchrone et asynchrone.
+    
+    Returns:
+        Records du cache, ou None s'il faut extraire le mois
+    """
+    records = cache.load(year, month, fingerprint)
+    if records is not None:
+        logger.info(f"{MOIS_NOMS[month - 1]} {year} inchangé : {len(records)} lignes relues depuis le cache")
+    return records
+
+
+def scrape_month_cached(page: Page, year: int, month: int, cache: Optional[MonthCache]) -> List[Dict]:
+    """
+    Scrape un mois en sautant l'extraction si son contenu n'a pas changé.
+    
+    Args:
+        page: Page Playwright positionnée sur le mois
+        year: Année
+        month: Mois (1-12)
+        cache: Cache des mois (None = pas de cache)
+        
+    Returns:
+        Liste des records du mois
+    """
+    if cache is None:
+        return scrape_month(page, year, month)
+    
+    fingerprint = take_month_fingerprint(page)
+    records = read_cached_month(cache, year, month, fingerprint)
+    if records is not None:
+        return records
+    
+    records = scrape_month(page, year, month)
+    if records:
+        cache.save(year, month, fingerprint, records)
     return records
 
+
 def get_current_month_text(page: Page) -> str:
     """
     Récupère le texte du mois affiché.
@@ -458,25 +532,99 @@ def get_current_month_text(page: Page) -> str:
         raise RuntimeError(f"Impossible de trouver le texte du mois (#date_now) : {e}")
 
 
-def navigate_to_january(page: Page, year: int):
+# Saut direct via l'API du scheduler DHTMLX (False si le scheduler n'est pas exposé)
+JUMP_TO_MONTH_JS = """
+([year, month]) => {
+    const scheduler = window.scheduler;
+    if (!scheduler || typeof scheduler.setCurrentView !== "function") {
+        return false;
+    }
+    scheduler.setCurrentView(new Date(year, month - 1, 1));
+    return true;
+}
+"""
+
+
+def is_month_displayed(page: Page, year: int, month: int) -> bool:
     """
-    Navigue vers janvier de l'année cible.
+    Indique si le planning affiche déjà le mois demandé.
+    
+    Args:
+        page: Page Playwright
+        year: Année
+        month: Mois (1-12)
+    """
+    return parse_month_year_text(get_current_month_text(page)) == (month, year)
+
+
+def jump_to_month(page: Page, year: int, month: int, current_text: str) -> bool:
+    """
+    Saute directement au mois cible via scheduler.setCurrentView().
     
     Args:
         page: Page Playwright
         year: Année cible
+        month: Mois cible (1-12)
+        current_text: Texte actuel de #date_now
+        
+    Returns:
+        True si le mois cible est affiché, False s'il faut revenir aux clics
     """
-    target_month = 1
+    try:
+        if not page.evaluate(JUMP_TO_MONTH_JS, [year, month]):
+            logger.debug("Scheduler DHTMLX non exposé, navigation par clics")
+            return False
+        
+        wait_for_planning_ready(page, current_text, label="saut direct")
+        new_month, new_year = parse_month_year_text(get_current_month_text(page))
+    except Exception as e:
+        logger.warning(f"Échec du saut direct vers {month:02d}/{year} : {e}")
+        return False
+    
+    if (new_month, new_year) != (month, year):
+        logger.warning(f"Saut direct incohérent ({new_month}/{new_year}), navigation par clics")
+        return False
+    
+    return True
+
+
+def navigate_to_month(page: Page, year: int, month: int):
+    """
+    Navigue vers un mois donné de l'année cible.
+    
+    Tente d'abord un saut direct (DIRECT_NAVIGATION), puis se rabat sur
+    les clics mois précédent / mois suivant.
+    
+    Args:
+        page: Page Playwright
+        year: Année cible
+        month: Mois cible (1-12)
+    """
+    target_month = month
     
     current_text = get_current_month_text(page)
     current_month, current_year = parse_month_year_text(current_text)
     
-    logger.info(f"Navigation vers janvier {year}")
+    logger.info(f"Navigation vers {MOIS_NOMS[target_month - 1].lower()} {year}")
     logger.info(f"Position actuelle : {current_text}")
     
     if current_month is None or current_year is None:
         raise RuntimeError(f"Impossible de parser le mois actuel : {current_text}")
     
+    if (current_month, current_year) == (target_month, year):
+        return
+    
+    if DIRECT_NAVIGATION:
+        if jump_to_month(page, year, target_month, current_text):
+            logger.info("Navigation réussie par saut direct")
+            return
+        
+        # Le saut a pu déplacer le planning : relire la position avant les clics
+        current_text = get_current_month_text(page)
+        current_month, current_year = parse_month_year_text(current_text)
+        if current_month is None or current_year is None:
+            raise RuntimeError(f"Impossible de parser le mois actuel : {current_text}")
+    
     clicks = 0
     
     while (current_month != target_month or current_year != year) and clicks < MAX_NAVIGATION_CLICKS:
@@ -488,18 +636,31 @@ def navigate_to_january(page: Page, year: int):
             next_button = page.locator("div.dhx_cal_next_button.next-month").first
             next_button.click()
         
-        time.sleep(NAVIGATION_DELAY)
+        wait_for_planning_ready(page, current_text)
         
         current_text = get_current_month_text(page)
         current_month, current_year = parse_month_year_text(current_text)
         clicks += 1
     
     if clicks >= MAX_NAVIGATION_CLICKS:
-        raise RuntimeError(f"Impossible d'atteindre janvier {year} après {clicks} clics")
+        raise RuntimeError(
+            f"Impossible d'atteindre {MOIS_NOMS[target_month - 1].lower()} {year} après {clicks} clics"
+        )
     
     logger.info(f"Navigation réussie en {clicks} clics")
 
 
+def navigate_to_january(page: Page, year: int):
+    """
+    Navigue vers janvier de l'année cible.
+    
+    Args:
+        page: Page Playwright
+        year: Année cible
+    """
+    navigate_to_month(page, year, 1)
+
+
 def go_to_next_month(page: Page):
     """
     Avance d'un mois.
@@ -507,69 +668,253 @@ def go_to_next_month(page: Page):
     Args:
         page: Page Playwright
     """
+    previous_text = get_current_month_text(page)
     next_button = page.locator("div.dhx_cal_next_button.next-month").first
     next_button.click()
-    time.sleep(NAVIGATION_DELAY)
+    wait_for_planning_ready(page, previous_text)
 
 
-def scrape_all_months(year: int) -> List[Dict]:
+def open_dailyrh(context, url: str = DAILYRH_URL):
+    """
+    Ouvre DailyRH dans un contexte navigateur et attend le chargement initial.
+    
+    Args:
+        context: Contexte Playwright créé depuis SESSION_FILE
+        url: Page du planning (DAILYRH_URL, ou page locale pour les benchmarks)
+        
+    La page est enveloppée dans le proxy qui compte (et trace, si le traçage
+    est activé) les appels Playwright (voir src/scraper/tracing.py).
+    
+    Returns:
+        Tuple (page, recorder) ; recorder vaut None hors source "network"
+    """
+    page = traced(context.new_page())
+    
+    recorder = None
+    if DATA_SOURCE == "network":
+        from src.scraper.network_source import PlanningResponseRecorder
+        recorder = PlanningResponseRecorder(page)
+    
+    watch_planning_requests(page)
+    
+    logger.info("Chargement de DailyRH...")
+    page.goto(url)
+    page.wait_for_load_state("networkidle")
+    
+    logger.info(f"Attente du chargement complet (max {INITIAL_LOAD_TIMEOUT}s)...")
+    elapsed = wait_for_planning_ready(page, label="chargement initial", timeout=INITIAL_LOAD_TIMEOUT)
+    logger.info(f"Planning prêt en {elapsed:.1f}s")
+    
+    return page, recorder
+
+
+class MonthLoop:
+    """
+    Logique commune, hors I/O, de la boucle des mois des moteurs synchrone
+    (`scrape_months_on_page`) et asynchrone (`_async_scrape_block`).
+    
+    Le moteur n'effectue que les appels Playwright ; la boucle décide de la
+    navigation (clic "mois suivant" ou navigation vers le mois), mesure et
+    trace chaque mois, journalise les erreurs, écrit les checkpoints et
+    compare l'effectif au registre.
+    
+    Exemple:
+        >>> loop = MonthLoop(2026, [5, 6], results={})
+        >>> for month in loop.months:
+        ...     with loop.month(month):
+        ...         step = loop.navigation(month)   # "next", "jump" ou None
+        ...         ...                             # navigation, extraction
+        ...         loop.month_done(month, records)
+    """
+    
+    def __init__(self, year: int, months: List[int], checkpoint_dir=CHECKPOINT_DIR,
+                 results: Optional[Dict[int, List[Dict]]] = None, roster=None):
+        """
+        Args:
+            year: Année à scraper
+            months: Mois à scraper, dans l'ordre croissant
+            checkpoint_dir: Répertoire des checkpoints mensuels
+            results: Dictionnaire complété au fil des mois
+            roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel)
+        """
+        self.year = year
+        self.months = months
+        self.checkpoint_dir = checkpoint_dir
+        self.results = {} if results is None else results
+        self.roster = roster
+        self.current_month = None
+    
+    @contextmanager
+    def month(self, month: int):
+        """Mesure (scrape.month) et trace les appels Playwright du mois."""
+        with timer("scrape.month", month=month), trace_month(month):
+            yield
+    
+    def navigation(self, month: int) -> Optional[str]:
+        """
+        Navigation nécessaire pour afficher le mois.
+        
+        Returns:
+            "next" (mois suivant du mois affiché), "jump" (navigation vers le
+            mois) ou None (mois déjà affiché)
+        """
+        previous, self.current_month = self.current_month, month
+        if previous == month:
+            return None
+        if previous is not None and month == previous + 1:
+            return "next"
+        return "jump"
+    
+    def navigation_failed(self, month: int, error: Exception):
+        """
+        Échec de navigation : relevé si aucun mois n'a encore été atteint,
+        sinon journalisé (l'appelant arrête alors la boucle).
+        """
+        if month == self.months[0]:
+            raise error
+        logger.error(f"Impossible d'avancer au mois suivant, arrêt du script : {error}")
+    
+    def month_failed(self, month: int, error: Exception):
+        """Échec d'extraction d'un mois : journalisé, le mois suivant est tenté."""
+        logger.error(f"Erreur pour {calendar.month_name[month]} {self.year} : {error}")
+    
+    def month_done(self, month: int, records: List[Dict]):
+        """Mois extrait : conservé, écrit en checkpoint et comparé au registre de l'effectif."""
+        self.results[month] = records
+        if records:
+            save_month_checkpoint(self.year, month, records, self.checkpoint_dir)
+            if self.roster is not None:
+                self.roster.observe_records(self.year, month, records)
+
+
+def merge_month_results(year: int, months: List[int], results: Dict[int, List[Dict]]) -> List[Dict]:
+    """
+    Fusionne les résultats des blocs de mois (moteurs parallèle et asynchrone).
+    
+    Returns:
+        Liste de tous les records, dans l'ordre des mois
+        
+    Raises:
+        RuntimeError: Si un mois n'a pas pu être extrait (bloc en échec)
+    """
+    missing = [MOIS_NOMS[m - 1] for m in months if m not in results]
+    if missing:
+        raise RuntimeError(f"Mois non extraits : {', '.join(missing)} {year} "
+                           f"(mois terminés conservés en checkpoint, relancer avec --resume)")
+    
+    all_records = []
+    for month in months:
+        all_records.extend(results[month])
+    return all_records
+
+
+def scrape_months_on_page(page: Page, year: int, months: List[int], recorder=None,
+                          use_cache: bool = MONTH_CACHE_ENABLED, checkpoint_dir=CHECKPOINT_DIR,
+                          results: Optional[Dict[int, List[Dict]]] = None, roster=None) -> Dict[int, List[Dict]]:
+    """
+    Scrape une liste de mois sur une page déjà ouverte.
+    
+    Les mois consécutifs sont atteints par un clic "mois suivant", les autres
+    par navigation directe vers le mois.
+    
+    Args:
+        page: Page Playwright sur DailyRH
+        year: Année à scraper
+        months: Mois à scraper, dans l'ordre croissant (ex: [5, 6, 7, 8])
+        recorder: PlanningResponseRecorder si source "network"
+        use_cache: Relire les mois inchangés depuis le cache (MONTH_CACHE_ENABLED)
+        checkpoint_dir: Répertoire des checkpoints mensuels
+        results: Dictionnaire complété au fil des mois (reste lisible si une
+                 exception interrompt le scraping)
+        roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel)
+        
+    Returns:
+        Dictionnaire {mois: records} (mois en erreur absents). Chaque mois
+        terminé est aussi écrit immédiatement en checkpoint.
+    """
+    loop = MonthLoop(year, months, checkpoint_dir, results, roster)
+    cache = MonthCache() if use_cache else None
+    
+    for month in months:
+        with loop.month(month):
+            step = loop.navigation(month)
+            try:
+                # Seules les réponses du mois affiché sont converties ; si le mois est
+                # déjà affiché, ses réponses (chargement initial) doivent être conservées
+                if recorder and (step == "next" or (step == "jump" and not is_month_displayed(page, year, month))):
+                    recorder.reset()
+                if step == "next":
+                    go_to_next_month(page)
+                elif step == "jump":
+                    navigate_to_month(page, year, month)
+            except Exception as e:
+                loop.navigation_failed(month, e)
+                break
+            
+            try:
+                if recorder:
+                    from src.scraper.network_source import scrape_month_network
+                    records = scrape_month_network(recorder, year, month)
+                else:
+                    records = scrape_month_cached(page, year, month, cache)
+            except Exception as e:
+                loop.month_failed(month, e)
+                continue
+            
+            loop.month_done(month, records)
+    
+    return loop.results
+
+
+def scrape_all_months(year: int, months: Optional[List[int]] = None, url: str = DAILYRH_URL,
+                      session_file=SESSION_FILE, use_cache: bool = MONTH_CACHE_ENABLED,
+                      checkpoint_dir=CHECKPOINT_DIR, headless: bool = HEADLESS_MODE, roster=None) -> List[Dict]:
     """
     Scrape tous les mois de l'année.
     
+    Les paramètres url, session_file, use_cache, checkpoint_dir et headless permettent de
+    viser une page locale sans toucher aux fichiers du scraping réel
+    (voir benchmarks/run_benchmarks.py).
+    
     Args:
         year: Année à scraper
+        months: Mois à scraper (par défaut janvier à décembre)
+        url: Page du planning
+        session_file: Session SSO (None = contexte vierge)
+        use_cache: Relire les mois inchangés depuis le cache
+        checkpoint_dir: Répertoire des checkpoints mensuels
+        headless: Navigateur sans interface
+        roster: RosterStore comparé à l'effectif de chaque mois extrait (optionnel)
         
     Returns:
         Liste de tous les records
     """
+    months = months or list(range(1, 13))
     all_records = []
+    reset_wait_timings()
     
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS_MODE)
-        context = browser.new_context(storage_state=SESSION_FILE)
-        page = context.new_page()
-        
-        logger.info("Chargement de DailyRH...")
-        page.goto(DAILYRH_URL)
-        page.wait_for_load_state("networkidle")
+        browser = p.chromium.launch(headless=headless)
+        context = browser.new_context(storage_state=session_file)
+        page, recorder = open_dailyrh(context, url)
         
-        logger.info(f"Attente du chargement complet ({INITIAL_LOAD_DELAY}s)...")
-        time.sleep(INITIAL_LOAD_DELAY)
-        
-        # Navigation vers janvier
         try:
-            navigate_to_january(page, year)
+            results = scrape_months_on_page(page, year, months, recorder, use_cache, checkpoint_dir, roster=roster)
         except Exception as e:
-            logger.error(f"Impossible de naviguer vers janvier : {e}")
+            logger.error(f"Impossible de naviguer vers {MOIS_NOMS[months[0] - 1].lower()} : {e}")
             browser.close()
             raise
         
-        # Scraper chaque mois
-        for month in range(1, 13):
-            try:
-                month_records = scrape_month(page, year, month)
-                all_records.extend(month_records)
-                
-                if month < 12:
-                    go_to_next_month(page)
-            
-            except Exception as e:
-                logger.error(f"Erreur pour {calendar.month_name[month]} {year} : {e}")
-                
-                if month < 12:
-                    try:
-                        go_to_next_month(page)
-                    except:
-                        logger.error("Impossible d'avancer au mois suivant, arrêt du script")
-                        break
-                continue
+        for month in months:
+            all_records.extend(results.get(month, []))
         
         browser.close()
     
+    log_wait_summary()
     return all_records
 
 
-def validate_totals(dailyrh_totals: Dict[str, float], scraped_data: List[Dict], jno_indices: Set[int], year: int,
+def validate_totals(dailyrh_totals: Dict[str, float], scraped_data: Iterable[Dict], jno_indices: Set[int], year: int,
                        month: int) -> Dict:
     """
     Compare les totaux DailyRH (chiffres bruts) avec les données scrapées.
@@ -625,15 +970,45 @@ def extract_dailyrh_totals(page: Page, year: int, month: int, nb_days: int) -> D
     Returns:
         Dictionnaire {date_string: nombre_événements}
     """
-    totals = {}
-
     # Sélectionner toutes les cellules de total
     total_cells = page.locator("td.teamTotal_cell")
 
+    cells = []
     for i in range(total_cells.count()):
         cell = total_cells.nth(i)
         css_class = cell.get_attribute("class") or ""
 
+        # Le texte n'est lu que pour les cellules du mois en cours
+        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', css_class)
+        if not date_match or not date_match.group(1).replace('-', '/').startswith(f"{year}/{month:02d}"):
+            continue
+
+        try:
+            text = cell.inner_text()
+        except:
+            text = None
+        cells.append({"class": css_class, "text": text})
+
+    return totals_from_cells(cells, year, month)
+
+
+def totals_from_cells(cells: List[Dict], year: int, month: int) -> Dict[str, float]:
+    """
+    Convertit les cellules teamTotal_cell brutes en totaux par date.
+
+    Args:
+        cells: Cellules brutes ({"class", "text"})
+        year: Année
+        month: Mois (1-12)
+
+    Returns:
+        Dictionnaire {date_string: nombre_événements}
+    """
+    totals = {}
+
+    for cell in cells:
+        css_class = cell["class"]
+
         # Extraire la date depuis la classe (format : 2026-02-01)
         date_match = re.search(r'(\d{4}-\d{2}-\d{2})', css_class)
         if not date_match:
@@ -647,7 +1022,7 @@ def extract_dailyrh_totals(page: Page, year: int, month: int, nb_days: int) -> D
 
         # Extraire le nombre depuis le <div> intérieur
         try:
-            text = cell.inner_text().strip()
+            text = cell["text"].strip()
             # Remplacer la virgule par un point pour les décimales
             count = float(text.replace(',', '.')) if text else 0.0
             totals[date_str] = count
@@ -0,0 +1,132 @@
+"""
+Module de capture instantanée (snapshot) d'un mois DailyRH
+
+Au lieu d'interroger le DOM élément par élément (plusieurs aller-retours
+Playwright par cellule, par événement et par collaborateur), ce module
+exécute UN SEUL `page.evaluate` par mois. Le script JavaScript parcourt
+toutes les lignes `tr.dhx_row_item` et renvoie un instantané JSON compact :
+
+    {
+        "date_text": "janvier 2026",
+        "rows": [
+            {
+                "name": "Dupont Jean",
+                "corp_id": "HRF344256-0_HRF460606",
+                "cells": [{"x": 210.0, "width": 38.0}, ...],
+                "events": [{"class": "...", "title": "...", "box": {...}}, ...]
+            },
+            ...
+        ],
+        "jno": ["dhx_marked_timespan grey_cell_weekend 2026/01/03", ...],
+        "totals": [{"class": "teamTotal_cell 2026-01-05", "text": "3,5"}, ...]
+    }
+
+Toute la logique métier (chevauchements, demi-journées, priorités) est
+ensuite appliquée hors ligne sur cet instantané, côté Python.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+from playwright.sync_api import Page
+
+
+
+# Les sélecteurs sont strictement ceux utilisés par l'extraction élément par élément
+SNAPSHOT_JS = """
+() => {
+    const box = (el) => {
+        const r = el.getBoundingClientRect();
+        if (!r.width && !r.height) {
+            return null;
+        }
+        return {x: r.x, width: r.width};
+    };
+
+    const dateElem = document.querySelector("#date_now");
+
+    const rows = Array.from(document.querySelectorAll("tr.dhx_row_item")).map((row) => {
+        const nameCell = row.querySelector("td.dhx_matrix_scell");
+        const corpElem = row.querySelector("[data-corp-id]");
+        const matrixDiv = row.querySelector(".dhx_matrix_line");
+
+        let events = null;
+        if (matrixDiv) {
+            events = Array.from(matrixDiv.querySelectorAll(
+                "div[class*='cell']:not(.dhx_marked_timespan), " +
+                "div[class*='event']:not(.dhx_marked_timespan)"
+            )).map((ev) => ({
+                class: ev.getAttribute("class") || "",
+                title: ev.getAttribute("title") || "",
+                box: box(ev),
+            }));
+        }
+
+        return {
+            name: nameCell ? nameCell.innerText : null,
+            corp_id: corpElem ? (corpElem.getAttribute("data-corp-id") || "") : null,
+            cells: Array.from(row.querySelectorAll("td.dhx_matrix_cell")).map(box),
+            events: events,
+        };
+    });
+
+    const jno = Array.from(
+        document.querySelectorAll("div.dhx_marked_timespan.grey_cell_weekend")
+    ).map((el) => el.getAttribute("class") || "");
+
+    const totals = Array.from(document.querySelectorAll("td.teamTotal_cell")).map((cell) => ({
+        class: cell.getAttribute("class") || "",
+        text: cell.innerText,
+    }));
+
+    return {
+        date_text: dateElem ? dateElem.textContent : null,
+        rows: rows,
+        jno: jno,
+        totals: totals,
+    };
+}
+"""
+
+
+def take_month_snapshot(page: Page) -> Dict:
+    """
+    Capture l'état complet du mois affiché en un seul aller-retour.
+
+    Args:
+        page: Page Playwright positionnée sur le mois à extraire
+
+    Returns:
+        Instantané JSON du mois (voir docstring du module)
+    """
+    page.wait_for_selector("tr.dhx_row_item", timeout=15000)
+    return page.evaluate(SNAPSHOT_JS)
+
+
+def save_snapshot(snapshot: Dict, path) -> None:
+    """
+    Enregistre un instantané sur disque (rejeu hors ligne, diagnostic).
+
+    Args:
+        snapshot: Instantané retourné par take_month_snapshot()
+        path: Chemin du fichier JSON
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+
+
+def load_snapshot(path) -> Dict:
+    """
+    Charge un instantané précédemment enregistré.
+
+    Args:
+        path: Chemin du fichier JSON
+
+    Returns:
+        Instantané du mois
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,284 @@
+"""
+Comptage et traçage des appels Playwright
+
+Le coût du scraping est dominé par le nombre d'allers-retours vers le
+navigateur (count(), get_attribute, inner_text, bounding_box, evaluate,
+wait_for...). Les pages ouvertes par les moteurs de scraping (synchrone,
+parallèle et asynchrone) sont enveloppées dans un proxy (`traced()`) :
+
+- chaque aller-retour sur la page et sur les Locator qui en dérivent
+  incrémente le compteur "playwright.calls" (METRICS_ENABLED) ; les méthodes
+  qui ne font que construire un Locator (locator(), nth(), filter()...) ne
+  sont pas comptées ;
+- lorsque le traçage est activé (PLAYWRIGHT_TRACING ou
+  `python scripts/main.py --trace`), chaque appel est en plus chronométré,
+  par site d'appel et par mois.
+
+Deux sorties sont produites en fin d'exécution :
+
+- un profil "folded stacks" (OUTPUT_TRACE), une ligne par pile d'appels :
+      03-Mars;scrape_months_on_page;...;extract_collaborator_events;Locator.bounding_box@scraper.py:172 52310
+  (durée cumulée en microsecondes), lisible par flamegraph.pl ou speedscope ;
+  le même profil pondéré par le nombre d'appels (.calls.folded) ;
+- un rapport JSON (.json) : nombre d'appels et durée par mois, site d'appel
+  et méthode.
+
+Utilisation :
+    from src.scraper.tracing import traced, trace_month
+
+    page = traced(context.new_page())   # page inchangée si mesures et traçage sont désactivés
+    with trace_month(3):
+        scrape_month(page, 2026, 3)
+"""
+
+import os
+import sys
+import json
+import time
+import inspect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from playwright import sync_api, async_api
+
+from src.config import PLAYWRIGHT_TRACING, METRICS_ENABLED, MOIS_NOMS
+from src.logging import get_logger
+from src.metrics import increment
+
+logger = get_logger()
+
+_TRACED_TYPES = tuple(
+    getattr(api, name)
+    for api in (sync_api, async_api)
+    for name in ("Page", "Frame", "Locator", "FrameLocator", "ElementHandle")
+)
+
+# Méthodes sans aller-retour vers le navigateur (construction de Locator, écouteurs)
+_LOCAL_METHODS = frozenset({
+    "locator", "nth", "filter", "and_", "or_", "frame_locator", "content_frame", "owner",
+    "on", "once", "remove_listener", "is_closed", "set_default_timeout",
+    "set_default_navigation_timeout",
+})
+
+# Seuls les cadres du projet figurent dans les piles (pas Playwright ni threading)
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+_THIS_FILE = str(Path(__file__).resolve())
+
+_enabled = PLAYWRIGHT_TRACING
+_lock = threading.Lock()
+_month: ContextVar = ContextVar("trace_month", default=None)   # Propre à chaque thread / tâche asyncio
+_calls: Dict[Tuple[str, str, str], List[float]] = {}   # (mois, site, méthode) -> [nombre, total]
+_stacks: Dict[str, List[float]] = {}                   # pile repliée -> [nombre, total]
+
+
+def enable_tracing(enabled: bool = True):
+    """Active (ou désactive) le traçage des pages ouvertes ensuite."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_tracing_enabled() -> bool:
+    return _enabled
+
+
+def traced(target):
+    """
+    Enveloppe une page (ou un Locator), sync ou async, dans le proxy de comptage
+    et de traçage (inchangée si les mesures et le traçage sont désactivés).
+    """
+    if not (_enabled or METRICS_ENABLED) or isinstance(target, TracedHandle):
+        return target
+    return TracedHandle(target)
+
+
+@contextmanager
+def trace_month(month: int):
+    """Attribue au mois donné les appels du bloc (propre au thread ou à la tâche asyncio courante)."""
+    token = _month.set(month)
+    try:
+        yield
+    finally:
+        _month.reset(token)
+
+
+def _month_label() -> str:
+    month = _month.get()
+    return f"{month:02d}-{MOIS_NOMS[month - 1]}" if month else "hors-mois"
+
+
+def _wrap(value):
+    if isinstance(value, _TRACED_TYPES):
+        return TracedHandle(value)
+    if isinstance(value, list) and value and isinstance(value[0], _TRACED_TYPES):
+        return [TracedHandle(v) for v in value]
+    return value
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, TracedHandle) else value
+
+
+def _record(frame, method: str, seconds: float):
+    """Agrège un appel tracé : site (cadre le plus proche du projet) et pile des cadres du projet."""
+    names = []
+    site = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE:
+            if site is None:
+                site = f"{os.path.basename(filename)}:{frame.f_lineno}"
+            names.append(frame.f_code.co_name)
+        frame = frame.f_back
+
+    site = site or "?"
+    month = _month_label()
+    leaf = f"{method}@{site}"
+    stack = ";".join([month, *reversed(names), leaf])
+
+    with _lock:
+        for table, key in ((_calls, (month, site, method)), (_stacks, stack)):
+            agg = table.get(key)
+            if agg is None:
+                table[key] = [1, seconds]
+            else:
+                agg[0] += 1
+                agg[1] += seconds
+
+
+async def _await_traced(awaitable, caller, method: str, started: float):
+    """Attend un appel asynchrone et le chronomètre jusqu'à sa résolution."""
+    try:
+        return _wrap(await awaitable)
+    finally:
+        if _enabled:
+            _record(caller, method, time.perf_counter() - started)
+
+
+class TracedHandle:
+    """
+    Proxy d'une Page / d'un Locator Playwright (API synchrone ou asynchrone).
+
+    Les allers-retours sont comptés et, si le traçage est activé, chronométrés ;
+    les Page, Locator, Frame et ElementHandle retournés (locator(), nth(),
+    .first...) sont à leur tour enveloppés, de sorte que toute la chaîne
+    d'appels est couverte.
+    """
+
+    __slots__ = ("_target", "__weakref__")
+
+    def __init__(self, target):
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if not callable(value):
+            return _wrap(value)
+
+        method = f"{type(self._target).__name__}.{name}"
+        counted = name not in _LOCAL_METHODS and not name.startswith("get_by_")
+
+        def call(*args, **kwargs):
+            if counted:
+                increment("playwright.calls")
+            caller = sys._getframe(1)
+            args = [_unwrap(a) for a in args]
+            started = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except Exception:
+                if _enabled:
+                    _record(caller, method, time.perf_counter() - started)
+                raise
+            if inspect.isawaitable(result):
+                return _await_traced(result, caller, method, started)
+            if _enabled:
+                _record(caller, method, time.perf_counter() - started)
+            return _wrap(result)
+
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __repr__(self):
+        return f"<traced {self._target!r}>"
+
+
+def reset_trace():
+    """Efface les appels tracés."""
+    with _lock:
+        _calls.clear()
+        _stacks.clear()
+
+
+def get_trace() -> List[Dict]:
+    """
+    Appels tracés, du site le plus coûteux au moins coûteux.
+
+    Returns:
+        [{month, site, method, count, total_s}]
+    """
+    with _lock:
+        calls = [
+            {"month": month, "site": site, "method": method, "count": count, "total_s": round(total, 4)}
+            for (month, site, method), (count, total) in _calls.items()
+        ]
+    return sorted(calls, key=lambda c: c["total_s"], reverse=True)
+
+
+def log_trace_summary(top: int = 15):
+    """Journalise les sites d'appel les plus coûteux (tous mois confondus)."""
+    by_site = {}
+    for c in get_trace():
+        agg = by_site.setdefault((c["site"], c["method"]), [0, 0.0])
+        agg[0] += c["count"]
+        agg[1] += c["total_s"]
+    if not by_site:
+        return
+
+    total_calls = sum(count for count, _ in by_site.values())
+    total_s = sum(total for _, total in by_site.values())
+    logger.info(f"Appels Playwright tracés : {total_calls} appels, {total_s:.1f}s")
+    logger.info(f"  {'méthode':<28} {'site':<22} {'appels':>8} {'total (s)':>10} {'moy. (ms)':>10}")
+    ranked = sorted(by_site.items(), key=lambda item: item[1][1], reverse=True)
+    for (site, method), (count, total) in ranked[:top]:
+        logger.info(f"  {method:<28} {site:<22} {count:>8} {total:>10.2f} {total / count * 1000:>10.1f}")
+
+
+def write_trace(path) -> Path:
+    """
+    Écrit le profil "folded stacks" (durées en µs), sa variante pondérée par le
+    nombre d'appels (.calls.folded) et le rapport JSON (.json).
+
+    Args:
+        path: Chemin du profil (ex: output/trace_playwright.folded)
+
+    Returns:
+        Chemin du profil écrit
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        stacks = sorted(_stacks.items())
+
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, (_, total) in stacks:
+            f.write(f"{stack} {max(1, round(total * 1e6))}\n")
+    with open(path.with_suffix(".calls.folded"), "w", encoding="utf-8") as f:
+        for stack, (count, _) in stacks:
+            f.write(f"{stack} {count}\n")
+
+    calls = get_trace()
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "total_calls": sum(c["count"] for c in calls),
+        "total_s": round(sum(c["total_s"] for c in calls), 4),
+        "calls": calls,
+    }
+    with open(path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    return path
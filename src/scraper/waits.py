@@ -0,0 +1,199 @@
+"""
+Attentes événementielles du planning DailyRH
+
+Remplace les pauses fixes (NAVIGATION_DELAY après chaque clic, INITIAL_LOAD_DELAY
+au chargement) par un détecteur de disponibilité qui attend exactement :
+1. que le texte de `#date_now` change (nouveau mois affiché)
+2. que l'ensemble des lignes `tr.dhx_row_item` soit présent et stable
+3. qu'aucune requête XHR du planning (PLANNING_API_URL_PATTERN) ne soit en cours
+
+Chaque étape est bornée par un délai maximal (NAVIGATION_TIMEOUT) : en cas de
+dépassement, un avertissement est journalisé et le scraping continue.
+
+La durée réelle de chaque attente est enregistrée (`get_wait_timings()`) ;
+chaque scraping repart d'une liste vide (`reset_wait_timings()`).
+"""
+
+import time
+import asyncio
+import weakref
+from typing import Dict, List, Optional
+
+from src.config import PLANNING_API_URL_PATTERN, NAVIGATION_TIMEOUT, PLANNING_SETTLE_MS
+from src.logging import get_logger
+from src.metrics import record_time, increment
+
+logger = get_logger()
+
+
+# Vrai quand #date_now affiche un texte non vide différent du précédent
+MONTH_CHANGED_JS = """
+(previous) => {
+    const el = document.querySelector("#date_now");
+    const text = el ? (el.textContent || "").trim() : "";
+    return text !== "" && text !== previous;
+}
+"""
+
+# Vrai quand la signature des lignes du planning n'a pas bougé depuis settleMs
+ROWS_SETTLED_JS = """
+(settleMs) => {
+    const rows = document.querySelectorAll("tr.dhx_row_item");
+    if (!rows.length) {
+        return false;
+    }
+    const dateElem = document.querySelector("#date_now");
+    const signature = [
+        rows.length,
+        document.querySelectorAll(".dhx_matrix_line div").length,
+        dateElem ? dateElem.textContent : "",
+    ].join("|");
+    const now = performance.now();
+    const state = window.__dailyrhSettle;
+    if (!state || state.signature !== signature) {
+        window.__dailyrhSettle = {signature: signature, since: now};
+        return false;
+    }
+    return now - state.since >= settleMs;
+}
+"""
+
+RESET_SETTLE_JS = "() => { delete window.__dailyrhSettle; }"
+
+
+_wait_timings: List[Dict] = []
+_trackers = weakref.WeakKeyDictionary()
+
+
+class PlanningRequestTracker:
+    """
+    Compte les requêtes XHR du planning en cours sur une page.
+
+    Doit être attaché avant la navigation (voir watch_planning_requests()).
+    """
+
+    def __init__(self, page, url_pattern: str = PLANNING_API_URL_PATTERN):
+        self.url_pattern = url_pattern
+        self.pending = 0
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    def _is_planning(self, request) -> bool:
+        return self.url_pattern in request.url and request.resource_type in ("xhr", "fetch")
+
+    def _on_request(self, request):
+        if self._is_planning(request):
+            self.pending += 1
+
+    def _on_done(self, request):
+        if self._is_planning(request):
+            self.pending = max(0, self.pending - 1)
+
+
+def watch_planning_requests(page) -> PlanningRequestTracker:
+    """Attache (une seule fois) le suivi des requêtes du planning à une page."""
+    if page not in _trackers:
+        _trackers[page] = PlanningRequestTracker(page)
+    return _trackers[page]
+
+
+def _record_wait(label: str, started: float, timed_out: bool) -> float:
+    elapsed = time.perf_counter() - started
+    _wait_timings.append({"label": label, "seconds": round(elapsed, 3), "timed_out": timed_out})
+    record_time("navigation.wait", elapsed, label=label)
+    if timed_out:
+        increment("navigation.timeouts")
+        logger.warning(f"Attente '{label}' : délai maximal atteint ({elapsed:.2f}s)")
+    else:
+        logger.debug(f"Attente '{label}' : page prête en {elapsed:.2f}s")
+    return elapsed
+
+
+def wait_for_planning_ready(page, previous_text: Optional[str] = None, label: str = "navigation",
+                            timeout: float = NAVIGATION_TIMEOUT) -> float:
+    """
+    Attend que le planning soit prêt après un chargement ou un changement de mois.
+
+    Args:
+        page: Page Playwright
+        previous_text: Texte de #date_now avant le clic (None = pas de changement attendu)
+        label: Libellé de l'attente (pour les mesures)
+        timeout: Délai maximal total en secondes
+
+    Returns:
+        Durée réelle de l'attente en secondes
+    """
+    started = time.perf_counter()
+    deadline = started + timeout
+
+    def remaining_ms() -> float:
+        return max(1.0, (deadline - time.perf_counter()) * 1000)
+
+    try:
+        if previous_text is not None:
+            page.wait_for_function(MONTH_CHANGED_JS, arg=previous_text, timeout=remaining_ms())
+
+        page.evaluate(RESET_SETTLE_JS)
+        page.wait_for_function(ROWS_SETTLED_JS, arg=PLANNING_SETTLE_MS, timeout=remaining_ms(), polling=50)
+
+        tracker = _trackers.get(page)
+        while tracker and tracker.pending > 0:
+            if time.perf_counter() >= deadline:
+                raise TimeoutError(f"{tracker.pending} requête(s) planning en cours")
+            page.wait_for_timeout(50)
+    except Exception as e:
+        logger.debug(f"Attente '{label}' interrompue : {e}")
+        return _record_wait(label, started, timed_out=True)
+
+    return _record_wait(label, started, timed_out=False)
+
+
+async def async_wait_for_planning_ready(page, previous_text: Optional[str] = None, label: str = "navigation",
+                                        timeout: float = NAVIGATION_TIMEOUT) -> float:
+    """Version asynchrone de wait_for_planning_ready() (playwright.async_api)."""
+    started = time.perf_counter()
+    deadline = started + timeout
+
+    def remaining_ms() -> float:
+        return max(1.0, (deadline - time.perf_counter()) * 1000)
+
+    try:
+        if previous_text is not None:
+            await page.wait_for_function(MONTH_CHANGED_JS, arg=previous_text, timeout=remaining_ms())
+
+        await page.evaluate(RESET_SETTLE_JS)
+        await page.wait_for_function(ROWS_SETTLED_JS, arg=PLANNING_SETTLE_MS, timeout=remaining_ms(), polling=50)
+
+        tracker = _trackers.get(page)
+        while tracker and tracker.pending > 0:
+            if time.perf_counter() >= deadline:
+                raise TimeoutError(f"{tracker.pending} requête(s) planning en cours")
+            await asyncio.sleep(0.05)
+    except Exception as e:
+        logger.debug(f"Attente '{label}' interrompue : {e}")
+        return _record_wait(label, started, timed_out=True)
+
+    return _record_wait(label, started, timed_out=False)
+
+
+def reset_wait_timings():
+    """Efface les durées d'attente mesurées (appelé au début de chaque scraping)."""
+    _wait_timings.clear()
+
+
+def get_wait_timings() -> List[Dict]:
+    """Retourne les durées mesurées de toutes les attentes depuis le dernier reset_wait_timings()."""
+    return list(_wait_timings)
+
+
+def log_wait_summary():
+    """Journalise un résumé des attentes (nombre, total, maximum, dépassements)."""
+    if not _wait_timings:
+        return
+    durations = [w["seconds"] for w in _wait_timings]
+    timeouts = sum(1 for w in _wait_timings if w["timed_out"])
+    logger.info(
+        f"Attentes de page : {len(durations)} attentes, total {sum(durations):.1f}s, "
+        f"max {max(durations):.2f}s, {timeouts} délai(s) maximal(aux) atteint(s)"
+    )